@@ -1,137 +1,288 @@
-from utils import *
-import pandas as pd
+import os
 import streamlit as st
 from dotenv import load_dotenv
-import os
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain.chains.combine_documents import create_stuff_documents_chain
-from langchain.chains import create_retrieval_chain
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from metrics import inc, timer, write_run, serve
+from retrieval_service import get_retriever, RetrieverSlot, RetrievalClient
+from request_cache import SingleFlight
+
+# Heavy modules (pandas, NLTK, sentence-transformers/torch, FAISS, LangChain) are imported inside
+# the functions that use them, so Streamlit can paint the page before any of them is loaded.
 
 # Load environment variables
 load_dotenv()
 
-# Cached data loading
+RETRIEVED_DOCUMENTS = 6
+# Estimated tokens of retrieved context sent to the LLM per analysis
+CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', 900))
+# When set (e.g. http://127.0.0.1:8600 or unix:///tmp/retrieval.sock), retrieval is served by
+# retrieval_service.py and this process loads neither the embedding model nor the indexes
+RETRIEVAL_SERVICE_URL = os.getenv('RETRIEVAL_SERVICE_URL')
+# Analyses of a comparison sent to the LLM at the same time
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', 8))
+
+def get_remote_retriever():
+    """Thin retriever querying the shared retrieval service"""
+    from hybrid_retrieval import RemoteRetriever
+    
+    return RemoteRetriever(client=RetrievalClient(RETRIEVAL_SERVICE_URL), k=RETRIEVED_DOCUMENTS)
+
+ANALYSIS_PROMPT = """
+        As a senior market intelligence analyst specializing in GenAI partnerships, provide insights on:
+        {base_prompt}
+
+        Company: {company}
+        Region: {region}
+
+        Context from company data:
+        {context}
+
+        Structure your response with:
+        1. Executive Summary
+        2. Key Findings
+        3. Strategic Recommendations
+        4. Actionable Next Steps
+        """
+
+def build_analysis_chain(retriever, llm, packer):
+    """Retrieval chain behind "Generate analysis": packed retrieved context stuffed into ANALYSIS_PROMPT"""
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.runnables import RunnableLambda
+    from langchain.chains.combine_documents import create_stuff_documents_chain
+    from langchain.chains import create_retrieval_chain
+    
+    prompt_template = ChatPromptTemplate.from_template(ANALYSIS_PROMPT)
+    packed_retriever = RunnableLambda(lambda inputs: inputs["input"]) | retriever | RunnableLambda(packer.pack)
+    document_chain = create_stuff_documents_chain(llm, prompt_template)
+    return create_retrieval_chain(packed_retriever, document_chain)
+
+@st.cache_resource(show_spinner=False)
+def start_warm_up():
+    """Starts loading the retriever in a background thread, once per server process"""
+    if RETRIEVAL_SERVICE_URL:
+        return RetrieverSlot(get_remote_retriever, follow_index=False)
+    return RetrieverSlot(lambda: get_retriever(RETRIEVED_DOCUMENTS))
+
 @st.cache_resource(show_spinner=False)
-def load_and_preprocess_data():
-    jobs_df = pd.read_csv('data/jobs_data.csv')
-    articles_df = pd.read_csv('data/genai_company_articles.csv')
-    news_df = pd.read_csv('data/google_news.csv')
+def get_llm():
+    """Groq chat model, built once per server process and shared by all sessions"""
+    from langchain_groq import ChatGroq
     
-    jobs_df = clean_company_name(jobs_df)
-    jobs_df = preprocess_text(jobs_df, "Content")
-    articles_df = preprocess_text(articles_df, "Content")
-    news_df = impute_missing_content(news_df)
-    news_df = preprocess_text(news_df, 'Content')
+    return ChatGroq(
+        temperature=0.7,
+        model_name="llama-3.3-70b-versatile",
+        groq_api_key=os.getenv('GROQ_API_KEY'),
+        timeout=30  # Increase timeout if needed
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_analysis_flight():
+    """Identical analyses requested at the same time by different sessions share one LLM call"""
+    return SingleFlight(name="analysis")
+
+def analysis_query(company, region):
+    """Retrieval query of an analysis; it is the same for every analysis type"""
+    return f"{company} {region} Generative AI"
+
+def run_analysis(retriever, company, region, base_prompt, llm=None):
+    """
+    Runs the analysis chain for one request.
+    
+    Returns:
+        tuple: (chain response, context packing stats, PromptTokenCounter)
+    """
+    from context_packing import ContextPacker, PromptTokenCounter
+    
+    # Retrieved records are stripped, deduplicated and trimmed to the token budget
+    packer = ContextPacker(token_budget=CONTEXT_TOKEN_BUDGET)
+    retrieval_chain = build_analysis_chain(retriever, llm or get_llm(), packer)
+    token_counter = PromptTokenCounter()
     
-    return jobs_df, articles_df, news_df
+    with timer("analysis_seconds"):
+        response = retrieval_chain.invoke({
+            "input": analysis_query(company, region),  # This should be a string query
+            "company": company,
+            "region": region,
+            "base_prompt": base_prompt
+        }, config={"callbacks": [token_counter]})
+    inc("analyses")
+    return response, packer.stats, token_counter
+
+def run_shared_analysis(retriever, company, region, analysis_type, base_prompt, llm=None, flight=None):
+    """
+    Runs an analysis, sharing the LLM call with identical analyses running in other sessions.
+    
+    Returns:
+        tuple: ((chain response, context packing stats, PromptTokenCounter), shared)
+    """
+    # The index version is part of the key, so a request after a swap never gets the old answer
+    key = (company, region, analysis_type, getattr(retriever, "version", None))
+    return (flight or get_analysis_flight()).do(
+        key, lambda: run_analysis(retriever, company, region, base_prompt, llm))
+
+def prefetch_rankings(retriever, queries):
+    """
+    Ranks the queries of a comparison with one embedding call and one FAISS search, so the
+    retrievals of its chains are ranking-cache hits. A RemoteRetriever has no batch call;
+    the retrieval service micro-batches the chains' concurrent queries instead.
+    """
+    if hasattr(retriever, "ranked_batch"):
+        with timer("retrieval_batch_seconds"):
+            retriever.ranked_batch(list(dict.fromkeys(queries)))
+
+def iter_comparison(retriever, sections, llm=None, concurrency=LLM_CONCURRENCY):
+    """
+    Runs the analyses of a comparison concurrently, at most `concurrency` LLM calls at a time.
+    
+    Parameters:
+        retriever: Retriever shared by the analyses.
+        sections (list): (company, region, analysis type, base prompt) per analysis.
+        llm: Chat model (the shared Groq model if None).
+        concurrency (int): Analyses running at the same time.
+    
+    Yields:
+        tuple: (position in `sections`, future of run_shared_analysis's result), as they complete.
+    """
+    prefetch_rankings(retriever, [analysis_query(company, region) for company, region, _, _ in sections])
+    # Resolved here: the cached resources are looked up from the script thread, not the workers
+    llm = llm or get_llm()
+    flight = get_analysis_flight()
+    
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="comparison")
+    try:
+        futures = {executor.submit(run_shared_analysis, retriever, *section, llm=llm, flight=flight): i
+                   for i, section in enumerate(sections)}
+        for future in as_completed(futures):
+            yield futures[future], future
+    finally:
+        # A rerun of the page abandons the comparison: analyses not started yet are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
 
-# Cached vector store creation
 @st.cache_resource(show_spinner=False)
-def get_vector_store():
-    jobs_df, articles_df, news_df = load_and_preprocess_data()
+def start_metrics_endpoint():
+    """Serves the dashboard's metrics in the Prometheus format when METRICS_PORT is set"""
+    if os.getenv('METRICS_PORT'):
+        serve(int(os.getenv('METRICS_PORT')))
+
+def wait_for_retriever(future):
+    """Blocks until the background warm-up is done; a failed warm-up is retried on the next run"""
+    return future.result()
+
+def show_analysis(title, response, stats, token_counter, shared):
+    """Renders one analysis with its token counts and supporting data points"""
+    st.subheader(title)
+    st.markdown(response["answer"])
     
-    news_data = news_df.to_dict(orient='records')
-    jobs_data = jobs_df.to_dict(orient='records')
-    articles_data = articles_df.to_dict(orient='records')
+    st.caption(f"Prompt tokens: {token_counter.prompt_tokens} | context {stats['context_tokens']} "
+               f"of {stats['raw_tokens']} retrieved tokens from {stats['documents_packed']}/{stats['documents_in']} documents"
+               + (" | shared with a concurrent identical request" if shared else ""))
     
-    documents = [str(item)[:1000] for item in news_data + jobs_data + articles_data]
+    with st.expander("Show supporting data points"):
+        st.json(response["context"])
+
+def show_comparison(retriever, companies, region, analyses):
+    """Runs every selected company x analysis concurrently and renders each section as it completes"""
+    sections = [(company, region, analysis, base_prompt)
+                for analysis, base_prompt in analyses.items() for company in companies]
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    status_text.text(f"Running {len(sections)} analyses, {min(LLM_CONCURRENCY, len(sections))} at a time...")
     
-    embeddings = HuggingFaceEmbeddings(
-        model_name="all-MiniLM-L6-v2",
-        model_kwargs={'device': 'cpu'}
-    )
+    # Placeholders keep the sections in selection order whatever order they complete in
+    placeholders = []
+    for company, region, analysis, _ in sections:
+        placeholders.append(st.empty())
+        placeholders[-1].caption(f"{analysis} - {company} ({region}): waiting...")
+    
+    failed = 0
+    for done, (i, future) in enumerate(iter_comparison(retriever, sections), start=1):
+        company, region, analysis, _ = sections[i]
+        title = f"{analysis} - {company} ({region})"
+        with placeholders[i].container():
+            try:
+                (response, stats, token_counter), shared = future.result()
+            except Exception as e:
+                failed += 1
+                st.subheader(title)
+                st.error(f"Analysis failed: {e}")
+            else:
+                show_analysis(title, response, stats, token_counter, shared)
+        progress_bar.progress(done / len(sections))
     
-    return FAISS.from_texts(documents, embeddings)
+    status_text.text("Comparison complete!" if not failed else f"Comparison complete, {failed} analyses failed")
 
 def main():
     st.title("GenAI Market Intelligence Dashboard")
     st.subheader("Understanding GenAI initiatives and partnership opportunities for Dell")
     
-    # Initialize components
-    with st.spinner("Loading AI components..."):
-        vector_store = get_vector_store()
-        retriever = vector_store.as_retriever(search_kwargs={"k":3})  # Reduce from 5 to 3
-        
-        llm = ChatGroq(
-            temperature=0.7,
-            model_name="llama-3.3-70b-versatile",
-            groq_api_key=os.getenv('GROQ_API_KEY'),
-            timeout=30  # Increase timeout if needed
-        )
+    # Data, embedding model and index load in a background thread while the controls render
+    retriever_future = start_warm_up().current()
+    start_metrics_endpoint()
     
     # UI Elements
     companies = ['Tata Consultancy Services', 'Infosys', 'HCLTech', 'Wipro', 
                 'Cognizant', 'Tech Mahindra', 'LTIMindtree']
-    selected_company = st.selectbox("Select a company for insights:", companies, key='company_select')
-    
-    regions = ["India", "Australia", "Global"]
-    selected_region = st.selectbox("Filter by region:", regions, key='region_select')
-    
     analysis_types = {
         "Competitor Landscape Analysis": "...",
         "Market Trend Forecasting": "...",
         "Synergy Identification for Dell": "...",
         "Partnership Opportunity Scoring": "..."
     }
-    selected_analysis = st.selectbox("Select analysis type:", list(analysis_types.keys()), key='analysis_select')
+    regions = ["India", "Australia", "Global"]
+    comparison_mode = st.checkbox("Comparison mode (several companies and analyses at once)", key='comparison_mode')
+    
+    if comparison_mode:
+        selected_companies = st.multiselect("Companies to compare:", companies, default=companies, key='companies_select')
+        selected_region = st.selectbox("Filter by region:", regions, key='region_select')
+        selected_analyses = st.multiselect("Analysis types:", list(analysis_types.keys()),
+                                           default=list(analysis_types.keys())[:1], key='analyses_select')
+    else:
+        selected_company = st.selectbox("Select a company for insights:", companies, key='company_select')
+        selected_region = st.selectbox("Filter by region:", regions, key='region_select')
+        selected_analysis = st.selectbox("Select analysis type:", list(analysis_types.keys()), key='analysis_select')
+    
+    if not retriever_future.done():
+        st.caption("Loading AI components in the background...")
     
-    if st.button("Generate analysis", key='analyze_btn'):
+    if comparison_mode:
+        if st.button("Generate comparison", key='compare_btn', disabled=not (selected_companies and selected_analyses)):
+            started = time.time()
+            with st.spinner("Loading AI components..."):
+                retriever = wait_for_retriever(retriever_future)
+            show_comparison(retriever, selected_companies, selected_region,
+                            {analysis: analysis_types[analysis] for analysis in selected_analyses})
+            # One line per comparison; counters and histograms are cumulative for the server process
+            write_run("dashboard_comparison", started)
+    
+    elif st.button("Generate analysis", key='analyze_btn'):
+        started = time.time()
         progress_bar = st.progress(0)
         status_text = st.empty()
         
+        status_text.text("Loading AI components...")
+        retriever = wait_for_retriever(retriever_future)
+        
         status_text.text("Preparing analysis...")
         progress_bar.progress(20)
         
         # Create dynamic prompt based on selection
         base_prompt = analysis_types[selected_analysis]
 
-        prompt_template = ChatPromptTemplate.from_template("""
-        As a senior market intelligence analyst specializing in GenAI partnerships, provide insights on:
-        {base_prompt}
-
-        Company: {company}
-        Region: {region}
-
-        Context from company data:
-        {context}
-
-        Structure your response with:
-        1. Executive Summary
-        2. Key Findings
-        3. Strategic Recommendations
-        4. Actionable Next Steps
-        """)
-        
-        status_text.text("Creating analysis chains...")
-        progress_bar.progress(40)
-        
-        # Create chains
-        document_chain = create_stuff_documents_chain(llm, prompt_template)
-        retrieval_chain = create_retrieval_chain(retriever, document_chain)
-        
         status_text.text(f"Analyzing {selected_company}...")
         progress_bar.progress(60)
         
-        # Correct way to invoke the retrieval chain
-        response = retrieval_chain.invoke({
-            "input": f"{selected_company} {selected_region} Generative AI",  # This should be a string query
-            "company": selected_company,
-            "region": selected_region,
-            "base_prompt": base_prompt
-        })
+        (response, stats, token_counter), shared = run_shared_analysis(
+            retriever, selected_company, selected_region, selected_analysis, base_prompt)
         
         progress_bar.progress(100)
         status_text.text("Analysis complete!")
         
         # Display results
-        st.subheader(f"{selected_analysis} - {selected_company} ({selected_region})")
-        st.markdown(response["answer"])
-        
-        with st.expander("Show supporting data points"):
-            st.json(response["context"])
+        show_analysis(f"{selected_analysis} - {selected_company} ({selected_region})",
+                      response, stats, token_counter, shared)
+        # One line per analysis; counters and histograms are cumulative for the server process
+        write_run("dashboard_analysis", started)
 
 if __name__ == "__main__":
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
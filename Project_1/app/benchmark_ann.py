@@ -0,0 +1,78 @@
+"""
+ANN index benchmark: recall@k against the exact (flat) index, per-query latency and index
+memory for each FAISS index type `indexing.py` can build, over the staged document vectors.
+
+Daily news and more companies grow the corpus; use --synthetic N (clustered random vectors
+of the same dimension) to see where each type starts to pay off before the corpus gets there.
+
+    python benchmark_ann.py --k 6
+    python benchmark_ann.py --synthetic 200000 --types flat hnsw ivf_sq8 ivf_pq
+"""
+import os
+import time
+import argparse
+
+import numpy as np
+
+from indexing import STAGING_DIR, INDEX_TYPES, build_faiss_index, choose_index_type
+
+
+def synthetic_vectors(n, d=384, clusters=200, seed=0):
+    """Clustered unit-length vectors, a rough stand-in for sentence embeddings"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, d)).astype(np.float32)
+    vectors = centers[rng.integers(clusters, size=n)] + 0.6 * rng.normal(size=(n, d)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def index_bytes(index):
+    """Serialized size of an index, close to what it takes in RAM"""
+    import faiss
+
+    return faiss.serialize_index(index).nbytes
+
+
+def measure(index, queries, truth, k):
+    """Mean recall@k against the exact neighbours, and p50/p99 single-query latency in ms"""
+    latencies, hits = [], 0
+    for query, exact in zip(queries, truth):
+        start = time.perf_counter()
+        _, ids = index.search(query[None, :], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(set(ids[0].tolist()) & set(exact.tolist()))
+    latencies.sort()
+    return hits / (len(queries) * k), latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare FAISS index types on recall, latency and memory.")
+    parser.add_argument("--k", type=int, default=6, help="Neighbours per query")
+    parser.add_argument("--queries", type=int, default=200, help="Corpus vectors used as queries")
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    parser.add_argument("--synthetic", type=int, default=None, help="Benchmark N synthetic vectors instead of the staged ones")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        vectors = synthetic_vectors(args.synthetic)
+    else:
+        path = os.path.join(STAGING_DIR, 'vectors.npy')
+        if not os.path.exists(path):
+            raise SystemExit(f"No staged vectors at {path}; run `python refresh.py --skip-scrapers` or pass --synthetic N")
+        vectors = np.load(path).astype(np.float32)
+
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)]
+    queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)  # Near, not identical to, stored vectors
+
+    exact = build_faiss_index(vectors, 'flat')
+    _, truth = exact.search(queries, args.k)
+
+    print(f"{len(vectors)} vectors of {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}; "
+          f"auto picks {choose_index_type(len(vectors))}")
+    print(f"{'type':9s} {'build s':>8s} {'recall':>7s} {'p50 ms':>8s} {'p99 ms':>8s} {'memory MB':>10s}")
+    for index_type in args.types:
+        start = time.perf_counter()
+        index = build_faiss_index(vectors, index_type)
+        build = time.perf_counter() - start
+        recall, p50, p99 = measure(index, queries, truth, args.k)
+        print(f"{index_type:9s} {build:8.2f} {recall:7.3f} {p50:8.3f} {p99:8.3f} {index_bytes(index) / 1e6:10.1f}")
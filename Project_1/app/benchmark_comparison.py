@@ -0,0 +1,103 @@
+"""
+Comparison mode wall time: every company x analysis type run one click at a time against
+the dashboard's fan-out (`app.iter_comparison`: one batched retrieval for all companies,
+then concurrent chains). The LLM is a stub that waits `--llm-latency` seconds per call;
+the index is built over the shipped CSVs (`--documents` records).
+
+    python benchmark_comparison.py --llm-latency 1.0 --concurrency 8 28
+"""
+import os
+import time
+import argparse
+
+from app import run_analysis, iter_comparison
+
+COMPANIES = ['Tata Consultancy Services', 'Infosys', 'HCLTech', 'Wipro', 'Cognizant', 'Tech Mahindra', 'LTIMindtree']
+ANALYSES = ["Competitor Landscape Analysis", "Market Trend Forecasting",
+            "Synergy Identification for Dell", "Partnership Opportunity Scoring"]
+SHIPPED_FILES = ['data/jobs_data.csv', 'data/genai_company_articles.csv']
+
+
+def text_cleaner():
+    """The pipeline's cleaner, or a lowercasing stand-in when NLTK is missing"""
+    try:
+        from utils import get_text_cleaner
+        return get_text_cleaner(), True
+    except ImportError:
+        return (lambda text: text.lower() if isinstance(text, str) else ""), False
+
+
+def embedding_model():
+    """The pipeline's embedding model, or deterministic random vectors when it is not installed"""
+    try:
+        from indexing import get_embeddings
+        return get_embeddings(), True
+    except ImportError:
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        return DeterministicFakeEmbedding(size=384), False
+
+
+def build_index(documents):
+    """FAISS store and BM25 index over the first records of the shipped CSVs"""
+    import pandas as pd
+    from bm25 import BM25Index
+    from langchain_community.vectorstores import FAISS
+    from indexing import iter_records, record_text
+
+    clean, nltk_cleaner = text_cleaner()
+    embeddings, real_embeddings = embedding_model()
+    records = list(iter_records([pd.read_csv(path) for path in SHIPPED_FILES]))[:documents]
+    texts = [record_text(item) for item in records]
+    vector_store = FAISS.from_embeddings(list(zip(texts, embeddings.embed_documents(texts))), embeddings,
+                                         metadatas=[{"doc_id": i} for i in range(len(texts))])
+    bm25 = BM25Index.from_texts([clean(item.get("Content")) for item in records])
+    return vector_store, bm25, clean, nltk_cleaner and real_embeddings
+
+
+def new_retriever(vector_store, bm25, clean):
+    """A retriever with empty query caches, so every run pays for its own retrieval"""
+    from hybrid_retrieval import HybridRetriever
+
+    return HybridRetriever(vector_store=vector_store, bm25=bm25, clean_query=clean, k=6)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark serial analyses against the comparison fan-out.")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Seconds the stub LLM waits per call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 28], help="Concurrent analyses to try")
+    parser.add_argument("--documents", type=int, default=2000, help="Records indexed")
+    parser.add_argument("--region", default="India")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    vector_store, bm25, clean, realistic = build_index(args.documents)
+    llm = FakeListChatModel(responses=["1. Executive Summary\n..."], sleep=args.llm_latency)
+    sections = [(company, args.region, analysis, analysis) for analysis in ANALYSES for company in COMPANIES]
+
+    rows = []
+    retriever = new_retriever(vector_store, bm25, clean)
+    start = time.perf_counter()
+    slowest = 0.0
+    for company, region, _, base_prompt in sections:
+        call_start = time.perf_counter()
+        run_analysis(retriever, company, region, base_prompt, llm=llm)
+        slowest = max(slowest, time.perf_counter() - call_start)
+    rows.append(("one click per section", time.perf_counter() - start))
+
+    for concurrency in args.concurrency:
+        retriever = new_retriever(vector_store, bm25, clean)
+        start = time.perf_counter()
+        for _, future in iter_comparison(retriever, sections, llm=llm, concurrency=concurrency):
+            future.result()
+        rows.append((f"comparison, {concurrency} at a time", time.perf_counter() - start))
+
+    print(f"{len(sections)} analyses ({len(COMPANIES)} companies x {len(ANALYSES)} types), "
+          f"stub LLM {args.llm_latency:.2f} s per call, {len(vector_store.index_to_docstore_id)} documents")
+    if not realistic:
+        print("NLTK or the embedding model is not installed: stand-ins are used for retrieval")
+    print(f"slowest single analysis: {slowest:.2f} s")
+    print(f"{'run':28s} {'seconds':>8s} {'speed-up':>9s}")
+    for name, seconds in rows:
+        print(f"{name:28s} {seconds:8.2f} {rows[0][1] / seconds:8.1f}x")
@@ -0,0 +1,51 @@
+"""
+Sitemap discovery over several weekly runs of a fixture company website that keeps
+growing (`fixture_server.SitemapSite`): each week adds new pages and updates a few old
+ones. For every run it reports the HTTP requests made for discovery, the GenAI pages the
+site lists, the pages scheduled for fetching and the requests a crawl refetching every
+listed GenAI page would make instead.
+
+    python benchmark_discovery.py --sitemaps 20 --per-sitemap 500 --weeks 4
+"""
+import os
+import random
+import tempfile
+import argparse
+
+from fixture_server import FixtureServer, SitemapSite
+from url_discovery import UrlDiscovery, keyword_filter
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark change-aware sitemap discovery.")
+    parser.add_argument("--sitemaps", type=int, default=20, help="Sitemaps of the site at the start")
+    parser.add_argument("--per-sitemap", type=int, default=500, help="Pages per sitemap")
+    parser.add_argument("--weeks", type=int, default=4, help="Runs after the first one")
+    parser.add_argument("--new-pages", type=int, default=200, help="Pages published per week")
+    parser.add_argument("--updated-pages", type=int, default=50, help="Existing pages changed per week")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    rng = random.Random(0)
+    site = SitemapSite(sitemaps=args.sitemaps, per_sitemap=args.per_sitemap)
+    matches = keyword_filter()
+
+    print(f"{'run':>4s} {'requests':>9s} {'GenAI pages':>12s} {'scheduled':>10s} {'refetch all':>12s}")
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.add_route("/robots.txt", site)
+        server.add_route("/sitemap", site)
+        state = os.path.join(tmp, "discovery.json")
+        for week in range(args.weeks + 1):
+            if week:
+                site.publish(args.new_pages)
+                site.update(rng.sample(range(len(site.lastmods) - args.new_pages), args.updated_pages))
+            before = server.requests
+            discovery = UrlDiscovery(state)
+            due = discovery.discover({"Fixture": server.url("/")})["Fixture"]
+            requests_made = server.requests - before
+            listed = sum(matches(site.page_path(n)) and "/private/" not in site.page_path(n)
+                         for n in range(len(site.lastmods)))
+            discovery.mark_fetched(due)
+            discovery.save()
+            sitemaps = -(-len(site.lastmods) // args.per_sitemap)
+            print(f"{week:4d} {requests_made:9d} {listed:12d} {len(due):10d} {sitemaps + 2 + listed:12d}")
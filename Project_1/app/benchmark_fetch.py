@@ -0,0 +1,102 @@
+"""
+Compares full downloads (`requests.get` + `response.apparent_encoding`, as the scrapers did)
+with streamed fetches (`http_fetch.fetch_html`) on the local fixture server, over a mix of
+normal article pages, pages declaring their charset only in a <meta> tag, very large pages
+and PDF/video links. Reports bytes downloaded, CPU time and wall time per page.
+
+    python benchmark_fetch.py --pages 30 --max-bytes 2000000
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import subprocess
+
+import requests
+
+from http_fetch import fetch_html
+
+
+class Server:
+    """The fixture server in its own process, so its CPU time is not counted as the client's"""
+
+    def __init__(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.process = subprocess.Popen([sys.executable, "fixture_server.py", "--port", str(self.port)],
+                                        stdout=subprocess.DEVNULL)
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait()
+
+
+def page_mix(server, pages):
+    """URLs of the benchmark: mostly ordinary pages, some huge pages and binary downloads"""
+    urls = []
+    for n in range(pages):
+        kind = n % 10
+        if kind < 5:
+            urls.append(server.url(f"/pages/site{n}/article?kb=60"))
+        elif kind < 7:
+            urls.append(server.url(f"/pages/site{n}/article?kb=60&meta_charset=1"))
+        elif kind < 8:
+            urls.append(server.url(f"/pages/site{n}/archive?kb=6000"))
+        elif kind < 9:
+            urls.append(server.url(f"/files/report{n}.pdf?kb=5000"))
+        else:
+            urls.append(server.url(f"/files/keynote{n}.mp4?kb=8000"))
+    return urls
+
+
+def full_download(session, url, max_bytes):
+    response = session.get(url, timeout=30)
+    response.encoding = response.apparent_encoding
+    text = response.text
+    return len(response.content), len(text)
+
+
+def streamed(session, url, max_bytes):
+    page = fetch_html(url, session=session, timeout=30, max_bytes=max_bytes)
+    return page.bytes_read, len(page.text or "")
+
+
+def measure(fetch, urls, max_bytes):
+    session = requests.Session()
+    downloaded = 0
+    wall, cpu = time.perf_counter(), time.process_time()
+    for url in urls:
+        size, _ = fetch(session, url, max_bytes)
+        downloaded += size
+    return downloaded, time.process_time() - cpu, time.perf_counter() - wall
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark full vs streamed page downloads.")
+    parser.add_argument("--pages", type=int, default=30, help="URLs fetched per method")
+    parser.add_argument("--max-bytes", type=int, default=2_000_000, help="Byte cap of the streamed fetch")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    with Server() as server:
+        urls = page_mix(server, args.pages)
+        print(f"{len(urls)} URLs: ordinary and <meta charset> pages, 6 MB pages, 5 MB PDFs, 8 MB videos")
+        print(f"{'method':10s} {'MB read':>9s} {'CPU s':>8s} {'wall s':>8s} {'ms/page':>8s}")
+        for name, fetch in [("full", full_download), ("streamed", streamed)]:
+            downloaded, cpu, wall = measure(fetch, urls, args.max_bytes)
+            print(f"{name:10s} {downloaded / 1e6:9.1f} {cpu:8.2f} {wall:8.2f} {wall / len(urls) * 1000:8.1f}")
@@ -0,0 +1,92 @@
+"""
+Weekly Google News run, full depth vs incremental, on the fixture server's `/news` results.
+
+Week 0 crawls every query at full depth and records its links as watermarks. In week 1,
+`--fresh` new articles have been published per query and push the older ones down the
+results; the full-depth run walks all pages and fetches every article again, while the
+incremental run (google_news_scraper.unseen_links) fetches only unseen links and stops
+paging at the first mostly-known page.
+
+Result pages are fetched over HTTP and parsed here instead of through Selenium; the
+projected time adds the scraper's own waits (3-8 s per browser step, 2 s per article).
+
+    python benchmark_incremental_news.py --queries 42 --pages 10 --fresh 6
+"""
+import os
+import time
+import tempfile
+import argparse
+
+import requests
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+
+from crawl_state import LinkWatermarks
+from fixture_server import FixtureServer
+from google_news_scraper import unseen_links
+from http_fetch import fetch_html
+
+# Average waits of google_news_scraper: random.uniform(3, 8) per browser step, REQUEST_DELAY per article
+BROWSER_STEP_SECONDS = 5.5
+ARTICLE_DELAY_SECONDS = 2
+
+
+def crawl(server, session, query, pages, fresh, watermarks):
+    """Walks the results of one query; returns (result pages, articles fetched, links found)"""
+    seen_pages, fetched, links = 0, 0, []
+    for page in range(pages):
+        response = session.get(server.url(f"/news?q={query}&start={page * 10}&fresh={fresh}"), timeout=10)
+        soup = BeautifulSoup(response.text, "html.parser")
+        page_links = [urljoin(response.url, card.a["href"]) for card in soup.select("div.SoaBEf")]
+        seen_pages += 1
+        unseen, stop = unseen_links(watermarks, query, page_links)
+        for link in unseen:
+            fetch_html(link, session=session, timeout=10)
+            fetched += 1
+        links.extend(page_links)
+        if page_links and stop:
+            break
+    return seen_pages, fetched, links
+
+
+def week(server, queries, pages, fresh, watermarks):
+    """One run over every query; watermarks=None crawls at full depth"""
+    session = requests.Session()
+    totals = {"pages": 0, "articles": 0}
+    found = {}
+    start = time.perf_counter()
+    for query in queries:
+        seen_pages, fetched, found[query] = crawl(server, session, query, pages, fresh, watermarks)
+        totals["pages"] += seen_pages
+        totals["articles"] += fetched
+    totals["wall"] = time.perf_counter() - start
+    # Search, News tab and one Next click per page
+    browser_steps = len(queries) * 2 + totals["pages"]
+    totals["projected"] = (totals["wall"] + browser_steps * BROWSER_STEP_SECONDS
+                           + totals["articles"] * ARTICLE_DELAY_SECONDS)
+    return totals, found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incremental Google News crawling.")
+    parser.add_argument("--queries", type=int, default=42, help="Search queries per run (the scraper runs 42)")
+    parser.add_argument("--pages", type=int, default=10, help="Result pages per query at most")
+    parser.add_argument("--fresh", type=int, default=6, help="New articles per query since week 0")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    queries = [f"company {n} generative ai" for n in range(args.queries)]
+
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as tmp:
+        watermarks = LinkWatermarks(os.path.join(tmp, "watermarks.json"))
+        _, found = week(server, queries, args.pages, 0, None)
+        for query, links in found.items():
+            watermarks.add(query, links)
+
+        print(f"{args.queries} queries, up to {args.pages} pages each, {args.fresh} new articles per query")
+        print(f"{'week 1 run':14s} {'pages':>7s} {'articles':>9s} {'wall s':>8s} {'projected':>10s}")
+        for name, marks in [("full depth", None), ("incremental", watermarks)]:
+            totals, _ = week(server, queries, args.pages, args.fresh, marks)
+            projected = totals["projected"]
+            duration = f"{projected / 3600:.1f} h" if projected >= 3600 else f"{projected / 60:.1f} min"
+            print(f"{name:14s} {totals['pages']:7d} {totals['articles']:9d} {totals['wall']:8.2f} {duration:>10s}")
@@ -0,0 +1,156 @@
+"""
+Memory-footprint report for the dashboard's data on the shipped CSVs, previous vs compact
+representation:
+
+  legacy   object-dtype string columns, to_dict(orient='records') lists, str(record) texts
+           and an InMemoryDocstore of Document objects keyed by uuid, all kept by the process
+  compact  categorical and Arrow-backed string columns (utils.compact_dataframe), records
+           generated row by row, and a CompactDocstore of plain texts as the only thing a
+           process serving the index keeps
+
+Resident set size (RSS) is measured in fresh processes: once while building (frames and
+documents) and once after loading just the pickled docstore, as a dashboard or retrieval
+service process does.
+
+    python benchmark_memory.py
+"""
+import os
+import sys
+import json
+import pickle
+import argparse
+import tempfile
+import subprocess
+
+SHIPPED_FILES = ['data/jobs_data.csv', 'data/genai_company_articles.csv']
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is not available)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def text_cleaner():
+    """The pipeline's cleaner, or a lowercasing stand-in of similar size when NLTK is missing"""
+    try:
+        from utils import get_text_cleaner
+        return get_text_cleaner(), True
+    except ImportError:
+        return (lambda text: text.lower() if isinstance(text, str) else ""), False
+
+
+def import_libraries():
+    import pandas  # noqa: F401
+    from langchain_core.documents import Document  # noqa: F401
+    try:
+        import pyarrow  # noqa: F401  (pandas 3 loads it for any string column; count it in both variants)
+    except ImportError:
+        pass
+
+
+def build(variant, docstore_path):
+    """Loads the CSVs and builds the documents; pickles the docstore to `docstore_path`"""
+    import gc
+    import uuid
+    import pandas as pd
+    from langchain_core.documents import Document
+    from utils import compact_dataframe
+    from indexing import CompactDocstore, iter_records, record_text
+
+    import_libraries()
+    report = {"rss_mb": {"imports": rss_mb()}}
+    clean, report["nltk_cleaner"] = text_cleaner()
+
+    # pandas < 3 loads text as object columns; force that for the previous representation
+    frames = [pd.read_csv(path, dtype=object if variant == "legacy" else None) for path in SHIPPED_FILES]
+    for df in frames:
+        df['Cleaned Content'] = df['Content'].apply(clean)
+    if variant == "compact":
+        frames = [compact_dataframe(df) for df in frames]
+    report["frames_mb"] = sum(df.memory_usage(deep=True).sum() for df in frames) / 1e6
+    report["rss_mb"]["frames"] = rss_mb()
+
+    if variant == "legacy":
+        records = [item for df in frames for item in df.to_dict(orient='records')]
+        texts = [str(item)[:1000] for item in records]
+        ids = [str(uuid.uuid4()) for _ in texts]
+        docstore = ({ids[i]: Document(page_content=text, metadata={"doc_id": i}) for i, text in enumerate(texts)},
+                    dict(enumerate(ids)))
+        held = (frames, records, texts, docstore)
+    else:
+        texts = [record_text(item) for item in iter_records(frames)]
+        docstore = (CompactDocstore(texts), list(range(len(texts))))
+        del frames, texts
+        held = docstore
+
+    gc.collect()
+    report["rss_mb"]["built"] = rss_mb()
+    report["documents"] = len(docstore[1])
+    with open(docstore_path, 'wb') as f:
+        pickle.dump(docstore, f)
+    del held
+    return report
+
+
+def load(docstore_path):
+    """RSS added by loading a pickled docstore, as a process serving the index does"""
+    import gc
+    import indexing  # noqa: F401  (defines CompactDocstore)
+
+    import_libraries()
+    before = rss_mb()
+    with open(docstore_path, 'rb') as f:
+        docstore = pickle.load(f)
+    gc.collect()
+    return {"docstore_mb": rss_mb() - before, "entries": len(docstore[1])}
+
+
+def child(*args):
+    output = subprocess.run([sys.executable, __file__, *args], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the memory footprint of the data representations.")
+    parser.add_argument("--build", nargs=2, metavar=("VARIANT", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--load", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if args.build:
+        print(json.dumps(build(*args.build)))
+        sys.exit(0)
+    if args.load:
+        print(json.dumps(load(args.load)))
+        sys.exit(0)
+
+    reports = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for variant in ["legacy", "compact"]:
+            path = os.path.join(tmp, f"{variant}.pkl")
+            reports[variant] = child("--build", variant, path)
+            reports[variant].update(child("--load", path))
+
+    legacy, compact = reports["legacy"], reports["compact"]
+    print(f"{legacy['documents']} documents from {', '.join(SHIPPED_FILES)}")
+    if not legacy["nltk_cleaner"]:
+        print("NLTK is not installed: 'Cleaned Content' approximated by lowercased text")
+    rows = [
+        ("DataFrames (deep)", legacy["frames_mb"], compact["frames_mb"]),
+        ("RSS after imports", legacy["rss_mb"]["imports"], compact["rss_mb"]["imports"]),
+        ("RSS with frames", legacy["rss_mb"]["frames"], compact["rss_mb"]["frames"]),
+        ("RSS after building", legacy["rss_mb"]["built"], compact["rss_mb"]["built"]),
+        ("Docstore loaded (RSS)", legacy["docstore_mb"], compact["docstore_mb"]),
+    ]
+    print(f"{'MB':24s} {'legacy':>9s} {'compact':>9s}")
+    for label, before, after in rows:
+        print(f"{label:24s} {before:9.1f} {after:9.1f}")
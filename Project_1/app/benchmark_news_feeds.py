@@ -0,0 +1,63 @@
+"""
+Feed ingestion on the fixture server's `/rss/search` feeds, with a per-response latency
+standing in for real network round trips:
+
+  summaries  the default: feeds only, one worker vs a pool
+  articles   `fetch_content=True` with the real default delay (1 s). Fixture links, like
+             Google News links (news.google.com), are all on one host, so article fetches
+             are spaced by the delay whatever the number of workers
+
+The Selenium scraper's time for the same queries is projected from its waits (3-8 s per
+browser step, 2 s per article) for comparison.
+
+    python benchmark_news_feeds.py --latency 0.05 --workers 16 --items 2
+"""
+import os
+import time
+import tempfile
+import argparse
+
+from fixture_server import FixtureServer
+from news_feed_ingester import ingest_feeds
+
+COMPANIES = ['Tata Consultancy Services', 'Infosys', 'Wipro', 'LTIMindtree', 'HCLTech', 'Tech Mahindra', 'Dell']
+LOCATIONS = ["India", "Australia"]
+KEYWORDS = ['initiatives', 'investment', 'strategy']
+
+
+def ingest(server, name, tmp, fmt, items, **kwargs):
+    feed_url = server.url(f"/rss/search?q={{query}}&format={fmt}&items={items}")
+    prefix = os.path.join(tmp, name)
+    start = time.perf_counter()
+    count = ingest_feeds(COMPANIES, LOCATIONS, KEYWORDS, output_file=prefix + ".csv", feed_url=feed_url,
+                         watermarks_path=prefix + "-watermarks.json", archive_path=prefix + "-archive.jsonl", **kwargs)
+    return count, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark feed-based news ingestion.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every fixture response")
+    parser.add_argument("--workers", type=int, default=16, help="Pool size of the concurrent runs")
+    parser.add_argument("--items", type=int, default=2, help="Entries per feed")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds between article fetches to one host")
+    parser.add_argument("--format", choices=["rss", "atom"], default="rss")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    queries = len(COMPANIES) * len(LOCATIONS) * len(KEYWORDS)
+
+    runs = [("summaries, 1 worker", dict(workers=1)),
+            (f"summaries, {args.workers} workers", dict(workers=args.workers)),
+            (f"articles, {args.workers} workers", dict(workers=args.workers, fetch_content=True, delay=args.delay))]
+    with FixtureServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        results = [(name, *ingest(server, f"run{n}", tmp, args.format, args.items, **kwargs))
+                   for n, (name, kwargs) in enumerate(runs)]
+
+    print(f"{queries} {args.format} feeds of {args.items} entries, {args.latency * 1000:.0f} ms per response, "
+          f"{args.delay:.1f} s between article fetches to one host")
+    print(f"{'run':26s} {'articles':>9s} {'seconds':>9s}")
+    for name, count, seconds in results:
+        print(f"{name:26s} {count:9d} {seconds:9.1f}")
+    # Search, News tab and one page of results per query, then every article of that page
+    selenium = queries * 3 * 5.5 + results[0][1] * (2 + args.latency)
+    print(f"{'selenium (projected)':26s} {results[0][1]:9d} {selenium:9.0f}")
@@ -0,0 +1,117 @@
+"""
+PDF extraction on a generated text PDF (or given files), whole-file vs streamed:
+
+  whole     the notebook's approach: PdfReader on the path (the file is read into memory),
+            every page's text appended to one string per document
+  streamed  pdf_ingestion.iter_pdf_chunks: the file memory-mapped, page ranges extracted by
+            a process pool (or in this process with 1 worker), chunks consumed as they arrive
+
+Each run is a fresh process; peak RSS is reported for it and, for the pool, for its workers.
+
+    python benchmark_pdf.py --pages 2000 --workers 4
+    python benchmark_pdf.py ../../Project_2/data/*.pdf
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+WORDS = ("enterprise generative ai platform agents copilots governance cloud model data "
+         "clients partners revenue investment strategy deployment engineering").split()
+
+
+def write_pdf(path, pages, lines=45):
+    """Writes a text-only PDF of `pages` pages, one object at a time"""
+    offsets = []
+
+    def obj(f, body):
+        offsets.append(f.tell())
+        f.write(f"{len(offsets)} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    with open(path, 'wb') as f:
+        f.write(b"%PDF-1.4\n")
+        # 1: catalog, 2: page tree, 3: font, then a page and its content stream per page
+        kids = " ".join(f"{4 + 2 * n} 0 R" for n in range(pages))
+        obj(f, b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(f, f"<< /Type /Pages /Count {pages} /Kids [{kids}] >>".encode())
+        obj(f, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        for n in range(pages):
+            text = []
+            for line in range(lines):
+                words = " ".join(WORDS[(n * 7 + line * 3 + i) % len(WORDS)] for i in range(12))
+                text.append(f"({words}.) Tj T*" if line % 9 else f"(Page {n + 1} section {line // 9 + 1}) Tj T*")
+            stream = ("BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(text) + " ET").encode()
+            obj(f, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * n} 0 R "
+                   f"/Resources << /Font << /F1 3 0 R >> >> >>".encode())
+            obj(f, f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+        xref = f.tell()
+        f.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+        f.write(b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets))
+        f.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+
+def peak_rss_mb(who):
+    import resource
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def measure(mode, workers, paths):
+    """Extracts the files one way; reports seconds, characters, chunks and peak RSS"""
+    import resource
+
+    start = time.perf_counter()
+    chars, chunks = 0, 0
+    if mode == "whole":
+        from pypdf import PdfReader
+        for path in paths:
+            reader = PdfReader(path)
+            text = ""
+            for page in reader.pages:
+                text += page.extract_text() or ""
+            chars += len(text.strip())
+            chunks += 1
+    else:
+        from pdf_ingestion import iter_pdf_chunks
+        for chunk in iter_pdf_chunks(paths, workers=workers):
+            chars += len(chunk["Content"])
+            chunks += 1
+    return {"seconds": time.perf_counter() - start, "chars": chars, "chunks": chunks,
+            "rss_mb": peak_rss_mb(resource.RUSAGE_SELF), "workers_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN)}
+
+
+def child(*args):
+    output = subprocess.run([sys.executable, __file__, *args], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark whole-file vs memory-mapped parallel PDF extraction.")
+    parser.add_argument("paths", nargs="*", help="PDF files (default: a generated one)")
+    parser.add_argument("--pages", type=int, default=1000, help="Pages of the generated PDF")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes of the parallel run")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "WORKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if args.measure:
+        print(json.dumps(measure(args.measure[0], int(args.measure[1]), args.paths)))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.abspath(path) for path in args.paths]
+        if not paths:
+            paths = [os.path.join(tmp, "generated.pdf")]
+            write_pdf(paths[0], args.pages)
+        size = sum(os.path.getsize(path) for path in paths) / 1e6
+        runs = [("whole file", "whole", 1), ("streamed, 1 process", "streamed", 1),
+                (f"streamed, {args.workers} processes", "streamed", args.workers)]
+        results = [(name, child(*paths, "--measure", mode, str(workers))) for name, mode, workers in runs]
+
+    print(f"{len(paths)} file(s), {size:.1f} MB")
+    print(f"{'run':24s} {'seconds':>8s} {'chars':>10s} {'chunks':>7s} {'peak MB':>8s} {'worker MB':>10s}")
+    for name, r in results:
+        print(f"{name:24s} {r['seconds']:8.2f} {r['chars']:10d} {r['chunks']:7d} {r['rss_mb']:8.1f} {r['workers_rss_mb']:10.1f}")
@@ -0,0 +1,287 @@
+"""
+Offline end-to-end benchmark of the pipeline against the local fixture server.
+
+Every stage runs on fixture data with configurable latency and error injection:
+fetch + parse of articles, SerpAPI-like job searches, Google News-like and Seek-like
+result pages, then preprocess, embed, index build, hybrid retrieval and the analysis
+chain with a stub LLM. Results go to a JSON file that a later run can be compared to:
+
+    python benchmark_pipeline.py --label baseline
+    python benchmark_pipeline.py --label candidate --compare data/benchmarks/baseline.json
+
+Stages whose dependencies are not installed are recorded as skipped, not faked.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+
+from fixture_server import FixtureServer, recorded_pages
+from metrics import METRICS
+
+RESULTS_DIR = "data/benchmarks"
+COMPANIES = ['Tata Consultancy Services', 'Infosys', 'HCLTech', 'Wipro', 'Cognizant', 'Tech Mahindra', 'LTIMindtree']
+QUERIES = [f"{company} {region} Generative AI" for company in COMPANIES for region in ["India", "Australia"]]
+
+
+class StageSkipped(Exception):
+    """A stage cannot run here (missing dependency or missing input from an earlier stage)"""
+
+
+def parse_news_page(html, base_url):
+    """Cards of a Google News result page, read with the Google News scraper's selectors"""
+    soup = BeautifulSoup(html, "html.parser")
+    rows = []
+    for card in soup.select("div.SoaBEf"):
+        link = card.find("a")
+        headline = card.select_one("div.n0jPhd")
+        source = card.select_one("div.MgUUmf")
+        rows.append({"Headline": headline.get_text(strip=True) if headline else "N/A",
+                     "Source": source.get_text(strip=True) if source else "N/A",
+                     "Link": urljoin(base_url, link.get("href")) if link else "N/A"})
+    next_link = soup.find("a", string="Next")
+    return rows, urljoin(base_url, next_link["href"]) if next_link else None
+
+
+def crawl_result_pages(start_url, parse, max_pages):
+    """Follows 'Next' links from a result page, returning all parsed rows"""
+    rows, url = [], start_url
+    for _ in range(max_pages):
+        try:
+            response = requests.get(url, timeout=10)
+        except requests.exceptions.RequestException:
+            break
+        if response.status_code != 200:
+            break
+        page_rows, url = parse(response.text, response.url)
+        rows.extend(page_rows)
+        if not url:
+            break
+    return rows
+
+
+class PipelineBenchmark:
+    """
+    Runs the pipeline stages in order on fixture data, sharing their outputs through `self.state`.
+
+    Parameters:
+        server (FixtureServer): Running fixture server.
+        args (argparse.Namespace): Benchmark settings (sizes, workers, stub LLM latency).
+    """
+
+    def __init__(self, server, args):
+        self.server = server
+        self.args = args
+        self.state = {}
+        self.results = {}
+
+    def article_urls(self):
+        if self.args.recorded:
+            return [self.server.url(f"/recorded/{name}") for name in sorted(os.listdir(self.args.recorded))]
+        return [self.server.url(f"/pages/site{n % self.args.domains}/{n}?kb={self.args.page_kb}",
+                                host=f"127.0.0.{n % self.args.domains + 2}")
+                for n in range(self.args.articles)]
+
+    def stage_fetch_articles(self):
+        from webpage_scraper import scrape_ai_articles
+        articles = scrape_ai_articles("Fixture", self.article_urls())
+        self.state["articles"] = articles
+        return len(articles)
+
+    def stage_fetch_jobs(self):
+        from serpapi_client import SerpApiClient
+        from google_jobs_scraper import jobs_query, parse_jobs
+        client = SerpApiClient("benchmark", base_url=self.server.url("/search.json"), cache_dir=None,
+                               max_workers=self.args.workers, max_pages=3)
+        results = client.search_many([jobs_query("Generative AI", "India", company) for company in COMPANIES])
+        jobs = [job for page in results for job in parse_jobs(page)]
+        self.state["jobs"] = jobs
+        return len(jobs)
+
+    def stage_news_pages(self):
+        with ThreadPoolExecutor(max_workers=self.args.workers) as executor:
+            pages = executor.map(lambda company: crawl_result_pages(
+                self.server.url(f"/news?q={company} Generative AI"), parse_news_page, self.args.result_pages), COMPANIES)
+            news = [row for rows in pages for row in rows]
+        self.state["news"] = news
+        return len(news)
+
+    def stage_seek_pages(self):
+        from seek_jobs_scraper import SeekHttpFetcher
+        fetcher = SeekHttpFetcher(self.server.url("/seek?keywords={keywords}&page={page}"), workers=self.args.workers,
+                                  max_pages=self.args.result_pages, delay=0)
+        seek = [row for rows in fetcher.fetch(COMPANIES).values() for row in rows]
+        self.state["seek"] = seek
+        return len(seek)
+
+    def stage_preprocess(self):
+        import pandas as pd
+        from utils import preprocess_text
+        records = self.state.get("articles", []) + self.state.get("jobs", []) + self.state.get("seek", [])
+        if not records:
+            raise StageSkipped("no fetched records")
+        df = preprocess_text(pd.DataFrame(records), "Content")
+        self.state["records"] = df.to_dict(orient="records")
+        return len(df)
+
+    def stage_embed(self):
+        from indexing import get_embeddings
+        records = self.state.get("records")
+        if not records:
+            raise StageSkipped("no preprocessed records")
+        self.state["documents"] = [str(item)[:1000] for item in records]
+        self.state["embeddings"] = get_embeddings()
+        self.state["embeddings"].embed_documents(self.state["documents"][:1])  # Model warm-up, not timed twice below
+        start = time.perf_counter()
+        self.state["vectors"] = self.state["embeddings"].embed_documents(self.state["documents"])
+        self.state["embed_only_seconds"] = time.perf_counter() - start
+        return len(self.state["vectors"])
+
+    def stage_index_build(self):
+        from bm25 import BM25Index
+        from langchain_community.vectorstores import FAISS
+        if "vectors" not in self.state:
+            raise StageSkipped("no embeddings")
+        documents = self.state["documents"]
+        self.state["vector_store"] = FAISS.from_embeddings(
+            list(zip(documents, self.state["vectors"])), self.state["embeddings"],
+            metadatas=[{"doc_id": i} for i in range(len(documents))])
+        self.state["bm25"] = BM25Index.from_texts([item.get("Cleaned Content") for item in self.state["records"]])
+        return len(documents)
+
+    def stage_retrieval(self):
+        from utils import get_text_cleaner
+        from hybrid_retrieval import HybridRetriever
+        from request_cache import LRUCache
+        if "vector_store" not in self.state:
+            raise StageSkipped("no index")
+        # No query caching, so repeats measure the full embed + search cost
+        retriever = HybridRetriever(vector_store=self.state["vector_store"], bm25=self.state["bm25"],
+                                    clean_query=get_text_cleaner(), k=6,
+                                    embedding_cache=LRUCache(0), ranking_cache=LRUCache(0))
+        self.state["retriever"] = retriever
+        latencies = []
+        for query in QUERIES * self.args.repeats:
+            start = time.perf_counter()
+            retriever.invoke(query)
+            latencies.append(time.perf_counter() - start)
+        self.state["retrieval_latencies"] = latencies
+        return len(latencies)
+
+    def stage_llm_stub(self):
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+        from app import build_analysis_chain, CONTEXT_TOKEN_BUDGET
+        from context_packing import ContextPacker
+        if "retriever" not in self.state:
+            raise StageSkipped("no retriever")
+        llm = FakeListChatModel(responses=["1. Executive Summary\n..."], sleep=self.args.llm_latency)
+        chain = build_analysis_chain(self.state["retriever"], llm, ContextPacker(token_budget=CONTEXT_TOKEN_BUDGET))
+        for query in QUERIES:
+            chain.invoke({"input": query, "company": query.split(" ")[0], "region": "India",
+                          "base_prompt": "Competitor Landscape Analysis"})
+        return len(QUERIES)
+
+    STAGES = ["fetch_articles", "fetch_jobs", "news_pages", "seek_pages", "preprocess",
+              "embed", "index_build", "retrieval", "llm_stub"]
+
+    def run(self):
+        for name in self.STAGES:
+            requests_before = self.server.requests
+            start = time.perf_counter()
+            try:
+                items = getattr(self, f"stage_{name}")()
+            except (ImportError, StageSkipped) as e:
+                self.results[name] = {"skipped": str(e)}
+                print(f"  {name:15s} skipped ({e})")
+                continue
+            seconds = time.perf_counter() - start
+            result = {"seconds": round(seconds, 4), "items": items,
+                      "items_per_second": round(items / seconds, 2) if seconds else None,
+                      "http_requests": self.server.requests - requests_before}
+            if name == "embed":
+                result["embed_only_seconds"] = round(self.state["embed_only_seconds"], 4)
+            if name == "retrieval":
+                latencies = sorted(self.state["retrieval_latencies"])
+                result["p50_ms"] = round(latencies[len(latencies) // 2] * 1000, 3)
+                result["p99_ms"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3)
+            self.results[name] = result
+            print(f"  {name:15s} {seconds:8.3f} s  {items:6d} items")
+        return self.results
+
+
+def compare(current, baseline, tolerance):
+    """
+    Prints stage times against a baseline results file.
+
+    Returns:
+        list: Names of stages slower than the baseline by more than `tolerance` (a fraction).
+    """
+    regressions = []
+    print(f"\nCompared with '{baseline['label']}' (tolerance {tolerance:.0%}):")
+    for name, result in current["stages"].items():
+        before = baseline["stages"].get(name, {})
+        if "seconds" not in result or "seconds" not in before:
+            print(f"  {name:15s} not comparable")
+            continue
+        change = result["seconds"] / before["seconds"] - 1 if before["seconds"] else 0.0
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:15s} {before['seconds']:8.3f} s -> {result['seconds']:8.3f} s  ({change:+.1%}){flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark on a local fixture server.")
+    parser.add_argument("--label", default=time.strftime("%Y%m%d-%H%M%S"), help="Name of this run's results file")
+    parser.add_argument("--articles", type=int, default=60, help="Synthetic article pages to fetch")
+    parser.add_argument("--domains", type=int, default=4, help="Distinct fake domains the articles are spread over")
+    parser.add_argument("--page-kb", type=int, default=20, help="Approximate size of each article page")
+    parser.add_argument("--result-pages", type=int, default=3, help="Google News / Seek result pages per company")
+    parser.add_argument("--recorded", default=None, help="Directory of saved pages to fetch instead of synthetic ones")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent SerpAPI / result page requests")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency per response in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses replaced by 503")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the stub LLM waits per call")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the retrieval queries")
+    parser.add_argument("--compare", default=None, help="Baseline results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown per stage before failing")
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=args.latency, error_rate=args.error_rate, seed=0)
+    if args.recorded:
+        server.add_route("/recorded/", recorded_pages(args.recorded))
+
+    METRICS.reset()
+    print(f"Pipeline benchmark '{args.label}'")
+    with server:
+        stages = PipelineBenchmark(server, args).run()
+
+    results = {
+        "label": args.label,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("label", "compare")},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "stages": stages,
+        "metrics": METRICS.snapshot(),
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{args.label}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("Warning: baseline was run with different settings")
+        sys.exit(1 if compare(results, baseline, args.tolerance) else 0)
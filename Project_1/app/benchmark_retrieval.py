@@ -0,0 +1,88 @@
+"""
+Retrieval benchmark for the dashboard: latency and recall@k of dense (FAISS),
+BM25 and hybrid (reciprocal rank fusion) retrieval over the saved indexes.
+
+Exact-term queries name an identifier; a document counts as relevant when its
+text contains that identifier, so they measure what dense search alone misses.
+
+    python benchmark_retrieval.py --k 3 --query "ISO20022 payments"
+"""
+import re
+import time
+import argparse
+
+from request_cache import LRUCache
+from retrieval_service import get_retriever
+
+# (query, identifier every relevant document must contain)
+EXACT_TERM_QUERIES = [
+    ("WisdomNext platform", "WisdomNext"),
+    ("ISO20022 payments migration", "ISO20022"),
+    ("Infosys Topaz generative AI", "Topaz"),
+    ("Wipro ai360 investment", "ai360"),
+    ("TCS ignio automation", "ignio"),
+    ("HCLTech AI Force", "AI Force"),
+]
+
+
+def relevant_ids(retriever, term):
+    """Documents whose stored text contains the term, case-insensitively"""
+    pattern = re.compile(re.escape(term), re.IGNORECASE)
+    return {doc_id for doc_id in range(retriever.vector_store.index.ntotal)
+            if pattern.search(retriever.document(doc_id).page_content)}
+
+
+def methods(retriever):
+    """Ranking functions returning doc ids, best first"""
+    def dense(query):
+        return retriever.dense_ranking(query)[:retriever.k]
+
+    def bm25(query):
+        tokens = retriever.clean_query(query).split()
+        return [doc_id for doc_id, _ in retriever.bm25.search(tokens, retriever.k)]
+
+    return {"dense": dense, "bm25": bm25, "hybrid": retriever.ranked_ids}
+
+
+def run(retriever, queries, repeats):
+    """Mean latency (ms) and mean recall@k per method over the queries that have relevant documents"""
+    results = {}
+    for name, rank in methods(retriever).items():
+        latencies, recalls = [], []
+        for query, relevant in queries:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                ranked = rank(query)
+            latencies.append((time.perf_counter() - start) / repeats * 1000)
+            recalls.append(len(set(ranked) & relevant) / min(len(relevant), retriever.k))
+        results[name] = (sum(latencies) / len(latencies), sum(recalls) / len(recalls))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dense, BM25 and hybrid retrieval.")
+    parser.add_argument("--k", type=int, default=3, help="Documents retrieved per query")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per query")
+    parser.add_argument("--query", nargs=2, action="append", metavar=("QUERY", "TERM"),
+                        help="Extra exact-term query and the identifier relevant documents contain")
+    args = parser.parse_args()
+
+    retriever = get_retriever(k=args.k)
+    # No query caching, so repeats measure the full embed + search cost
+    retriever.embedding_cache = LRUCache(0)
+    retriever.ranking_cache = LRUCache(0)
+    retriever.dense_ranking("warm-up")
+
+    queries = []
+    for query, term in EXACT_TERM_QUERIES + [tuple(q) for q in args.query or []]:
+        relevant = relevant_ids(retriever, term)
+        if relevant:
+            queries.append((query, relevant))
+        else:
+            print(f"Skipping '{query}': no document mentions {term}")
+    if not queries:
+        raise SystemExit("No benchmark query has relevant documents in this corpus")
+
+    print(f"{len(queries)} exact-term queries over {retriever.vector_store.index.ntotal} documents, k={args.k}")
+    for name, (latency, recall) in run(retriever, queries, args.repeats).items():
+        print(f"{name:7s} {latency:8.2f} ms/query   recall@{args.k} {recall:.3f}")
@@ -0,0 +1,75 @@
+"""
+Load test for retrieval_service.py: N concurrent client threads (like N dashboard sessions)
+send queries to a running service and report throughput and p50/p99 latency per concurrency.
+
+    python retrieval_service.py --port 8600 &
+    python benchmark_retrieval_service.py --url http://127.0.0.1:8600 --concurrency 1 4 16 32
+
+Run the service once with --max-batch 1 and once with the default to see what micro-batching buys.
+"""
+import time
+import argparse
+import threading
+import statistics
+
+from retrieval_service import RetrievalClient
+
+QUERIES = [
+    "generative AI partnerships with cloud providers",
+    "Infosys Topaz GenAI platform",
+    "TCS WisdomNext launch",
+    "machine learning engineer jobs in Sydney",
+    "Wipro ai360 investment",
+    "HCLTech AI Force",
+    "LLM fine-tuning roles India",
+    "Cognizant Neuro AI",
+]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def load(client, concurrency, requests_per_client, k):
+    """Latencies of all requests sent by `concurrency` threads at once, and the wall time"""
+    latencies = []
+    lock = threading.Lock()
+
+    def session(offset):
+        own = []
+        for i in range(requests_per_client):
+            start = time.perf_counter()
+            client.search(QUERIES[(offset + i) % len(QUERIES)], k)
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the shared retrieval service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8600", help="Service URL (http:// or unix://)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client thread")
+    parser.add_argument("--k", type=int, default=6)
+    args = parser.parse_args()
+
+    client = RetrievalClient(args.url)
+    while not client.health()["ready"]:
+        print("Waiting for the service to load the index...")
+        time.sleep(2)
+    client.search(QUERIES[0], args.k)  # Warm-up
+
+    print(f"{'clients':>8s} {'req/s':>9s} {'p50 ms':>9s} {'p99 ms':>9s} {'mean ms':>9s}")
+    for concurrency in args.concurrency:
+        latencies, wall = load(client, concurrency, args.requests, args.k)
+        print(f"{concurrency:8d} {len(latencies) / wall:9.1f} {percentile(latencies, 0.5) * 1000:9.1f} "
+              f"{percentile(latencies, 0.99) * 1000:9.1f} {statistics.mean(latencies) * 1000:9.1f}")
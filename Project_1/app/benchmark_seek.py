@@ -0,0 +1,71 @@
+"""
+Seek listing throughput: HTTP fetches (one worker, then a pool) against the browser path's
+page-by-page crawl, on the fixture server's `/seek` pages or on saved result pages.
+
+The browser path is replayed over HTTP, one company and one "Next" click at a time, and its
+projected time adds the scraper's waits (3 s on start, 5 s per search and per click).
+Saved pages are read from `--recorded DIR` as `<keywords>-<page>.html`, with keywords
+URL-encoded as in a search URL (e.g. `Tech+Mahindra-2.html`).
+
+    python benchmark_seek.py --latency 0.2 --workers 8
+    python benchmark_seek.py --recorded data/recorded/seek
+"""
+import os
+import time
+import argparse
+
+from fixture_server import FixtureServer, recorded_pages
+from seek_jobs_scraper import SeekHttpFetcher
+
+COMPANIES = ["Tata Consultancy Services", "Infosys", "Tech Mahindra", "HCLTech", "Wipro", "LTIMindtree", "Cognizant"]
+START_WAIT, PAGE_WAIT = 3, 5
+
+
+def browser_replay(search_url, max_pages):
+    """Pages in the order the Selenium path loads them: company by company, following Next"""
+    fetcher = SeekHttpFetcher(search_url, workers=1, delay=0)
+    jobs, pages = 0, 0
+    for company in COMPANIES:
+        for number in range(1, max_pages + 1):
+            rows, count = fetcher.fetch_page(company, number)
+            jobs += len(rows)
+            pages += 1
+            if not rows or number >= (count or max_pages):
+                break
+    return jobs, pages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTTP vs browser-style Seek listing fetches.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds added to every fixture response")
+    parser.add_argument("--workers", type=int, default=8, help="Pool size of the concurrent run")
+    parser.add_argument("--max-pages", type=int, default=3, help="Result pages per company at most")
+    parser.add_argument("--embedded", action="store_true", help="Serve jobs as embedded JSON instead of cards")
+    parser.add_argument("--recorded", default=None, help="Directory of saved result pages to replay")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    server = FixtureServer(latency=args.latency)
+    if args.recorded:
+        server.add_route("/recorded/", recorded_pages(args.recorded))
+        path = "/recorded/{keywords}-{page}.html"
+    else:
+        path = f"/seek?keywords={{keywords}}&page={{page}}&pages={args.max_pages}&embedded={int(args.embedded)}"
+
+    with server:
+        search_url = server.url(path)
+        rows = []
+        start = time.perf_counter()
+        jobs, pages = browser_replay(search_url, args.max_pages)
+        elapsed = time.perf_counter() - start
+        rows.append(("browser path (projected)", jobs, elapsed + START_WAIT + pages * PAGE_WAIT))
+        for workers in (1, args.workers):
+            fetcher = SeekHttpFetcher(search_url, workers=workers, max_pages=args.max_pages, delay=0)
+            start = time.perf_counter()
+            jobs = sum(len(rows) for rows in fetcher.fetch(COMPANIES).values())
+            rows.append((f"http, {workers} worker(s)", jobs, time.perf_counter() - start))
+
+    print(f"{len(COMPANIES)} companies, up to {args.max_pages} pages, {args.latency * 1000:.0f} ms per response")
+    print(f"{'run':26s} {'jobs':>6s} {'seconds':>9s} {'jobs/s':>8s}")
+    for name, jobs, seconds in rows:
+        print(f"{name:26s} {jobs:6d} {seconds:9.2f} {jobs / seconds:8.1f}")
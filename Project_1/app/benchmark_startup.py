@@ -0,0 +1,59 @@
+"""
+Startup benchmark for the dashboard: measures what `import app` costs with
+`python -X importtime` and fails when it goes over budget or pulls in a heavy
+module that should only be loaded in the background.
+
+    python benchmark_startup.py --budget-ms 1500
+"""
+import re
+import sys
+import argparse
+import subprocess
+
+# Modules that must not be imported before the first paint
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "faiss", "nltk",
+                 "langchain", "langchain_core", "langchain_community", "langchain_huggingface", "langchain_groq"]
+
+
+def import_profile(module="app"):
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: Top-level module name -> cumulative import time in microseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)", line)
+        if match:
+            cumulative, name = int(match.group(2)), match.group(4)
+            profile[name] = max(profile.get(name, 0), cumulative)
+    return profile
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the dashboard's import-time budget.")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Maximum cumulative import time of app.py")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    profile = import_profile(args.module)
+    total_ms = profile.get(args.module, 0) / 1000
+    top_level = {name: us for name, us in profile.items() if "." not in name and name != args.module}
+
+    print(f"import {args.module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    heavy = [name for name in HEAVY_MODULES if name in profile]
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time over budget by {total_ms - args.budget_ms:.0f} ms")
+    sys.exit(1 if heavy or total_ms > args.budget_ms else 0)
@@ -0,0 +1,125 @@
+import re
+import math
+import pickle
+from collections import Counter
+
+# Query terms that look like product names or identifiers ("WisdomNext", "ISO20022", "GPT-4", "SAP")
+IDENTIFIER_PATTERN = re.compile(r"^(?=.*[A-Za-z])(?:.*\d.*|.*[a-z][A-Z].*|[A-Z]{3,}\W*)$")
+
+
+class BM25Index:
+    """
+    Inverted-index BM25 retriever over pre-tokenized (cleaned, lemmatized) documents.
+
+    Postings map each term to {doc_id: term frequency}, so a query only touches the
+    documents that contain at least one of its terms.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.doc_lengths = []
+        self.avg_length = 0.0
+
+    @classmethod
+    def from_texts(cls, texts, k1=1.5, b=0.75):
+        """
+        Builds the index from cleaned texts (whitespace-separated tokens).
+
+        Parameters:
+            texts (list): Cleaned document texts, e.g. the output of `utils.preprocess_text`.
+
+        Returns:
+            BM25Index: The built index; document ids are positions in `texts`.
+        """
+        index = cls(k1, b)
+        for doc_id, text in enumerate(texts):
+            tokens = text.split() if isinstance(text, str) else []
+            index.doc_lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                index.postings.setdefault(term, {})[doc_id] = count
+        index.avg_length = sum(index.doc_lengths) / max(len(index.doc_lengths), 1)
+        return index
+
+    def idf(self, term):
+        n = len(self.doc_lengths)
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, tokens, k=10, candidates=None):
+        """
+        Scores documents for a tokenized query.
+
+        Parameters:
+            tokens (list): Cleaned query tokens.
+            k (int): Number of results to return.
+            candidates (set): Optional document ids to restrict the search to.
+
+        Returns:
+            list: (doc_id, score) pairs, best first.
+        """
+        scores = {}
+        for term in set(tokens):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in postings.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def exact_term_candidates(self, raw_query, tokens, max_df_ratio=0.05):
+        """
+        Cheap lexical prefilter for exact-term queries.
+
+        If the raw query contains identifier-like terms (product names, standards such as
+        "WisdomNext" or "ISO20022") that are rare in the index (in at most `max_df_ratio` of
+        the documents), returns the ids of the documents containing all of them; otherwise None.
+        """
+        identifiers = {re.sub(r'[^a-z0-9]', '', word.lower()) for word in raw_query.split()
+                       if IDENTIFIER_PATTERN.match(word)}
+        max_df = max(1, int(max_df_ratio * len(self.doc_lengths)))
+        terms = [term for term in tokens
+                 if term in identifiers and 0 < len(self.postings.get(term, ())) <= max_df]
+        if not terms:
+            return None
+
+        candidates = set(self.postings[terms[0]])
+        for term in terms[1:]:
+            candidates &= set(self.postings[term])
+        return candidates
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self.__dict__, f)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path, "rb") as f:
+            index.__dict__.update(pickle.load(f))
+        return index
+
+
+def reciprocal_rank_fusion(rankings, k=60, with_scores=False):
+    """
+    Fuses several ranked lists of document ids with reciprocal rank fusion.
+
+    Parameters:
+        rankings (list): Lists of doc ids, best first.
+        k (int): RRF damping constant.
+        with_scores (bool): Return (doc_id, fused score) pairs instead of bare ids.
+
+    Returns:
+        list: Doc ids ordered by fused score.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [(doc_id, scores[doc_id]) for doc_id in ranked] if with_scores else ranked
@@ -0,0 +1,163 @@
+import re
+import ast
+import time
+from langchain_core.documents import Document
+from langchain_core.callbacks import BaseCallbackHandler
+from dedup import shingles
+from metrics import inc, observe
+
+# Fields of the scraped records that carry no meaning for the LLM
+SCAFFOLD_FIELDS = {"Link", "URL", "Url", "Cleaned Content"}
+HEADER_FIELDS = ["Company", "Company Name", "Title", "Job Title", "Location", "Date", "Source"]
+BODY_FIELDS = ["Content", "Description", "Snippet"]
+
+# Keys of a record dict repr, e.g. "{'Job Title': ..., 'Content': ...}" (possibly truncated)
+KEY_PATTERN = re.compile(r"(?:^\{|, )'([A-Za-z][\w ]*)': ")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text):
+    """Rough token count for Llama-style tokenizers (about 4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def parse_record(text):
+    """
+    Recovers the fields of a record stored as a (possibly truncated) dict repr.
+
+    Parameters:
+        text (str): Document text, e.g. "{'Company': 'Infosys', 'Content': '...', 'Link': '...'}"
+
+    Returns:
+        dict: Field -> value string, without empty or NaN values. Text that is not a record
+        repr is returned as {'Content': text}.
+    """
+    matches = list(KEY_PATTERN.finditer(text))
+    if not matches:
+        return {"Content": text}
+
+    fields = {}
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        raw = text[match.end():next_match.start() if next_match else len(text)].rstrip('}').strip()
+        try:
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            value = raw.strip('"\'')  # Cut off by the 1000 character limit
+        value = str(value).strip()
+        if value and value.lower() != 'nan':
+            fields[match.group(1)] = value
+    return fields
+
+
+def strip_scaffolding(text):
+    """
+    Turns a record into compact prompt text: one header line and the body.
+
+    Returns:
+        tuple: (header, body) strings.
+    """
+    fields = parse_record(text)
+    header = " | ".join(fields[key] for key in HEADER_FIELDS if key in fields)
+    body = " ".join(fields[key] for key in BODY_FIELDS if key in fields)
+    if not body:
+        body = " ".join(value for key, value in fields.items()
+                        if key not in SCAFFOLD_FIELDS and key not in HEADER_FIELDS)
+    return header, body
+
+
+class ContextPacker:
+    """
+    Assembles retrieved documents into a compact, token-budgeted context for the LLM.
+
+    Documents are taken in relevance order (the `score` metadata set by the retriever, or
+    retrieval order). Record scaffolding (keys, links, NaN and cleaned-text fields) is
+    stripped, sentences largely covered by already packed text are dropped, and packing
+    stops when the token budget is reached, cutting the last document at a sentence.
+
+    Parameters:
+        token_budget (int): Maximum estimated tokens of packed context.
+        overlap_threshold (float): Share of a sentence's shingles already seen above which it is dropped.
+        shingle_size (int): Words per shingle for the overlap test.
+    """
+
+    def __init__(self, token_budget=900, overlap_threshold=0.7, shingle_size=3):
+        self.token_budget = token_budget
+        self.overlap_threshold = overlap_threshold
+        self.shingle_size = shingle_size
+        self.stats = {}
+
+    def pack(self, documents):
+        """
+        Packs documents into the budget.
+
+        Parameters:
+            documents (list): Retrieved langchain Documents.
+
+        Returns:
+            list: Packed Documents (same metadata), best first; `self.stats` holds the token counts.
+        """
+        ranked = sorted(documents, key=lambda doc: doc.metadata.get("score", 0.0), reverse=True)
+        seen = set()
+        packed = []
+        used = 0
+        dropped_sentences = 0
+
+        for doc in ranked:
+            header, body = strip_scaffolding(doc.page_content)
+            lines = []
+            for sentence in SENTENCE_PATTERN.split(body):
+                sentence_shingles = shingles(sentence, self.shingle_size)
+                if not sentence_shingles:
+                    continue
+                if len(sentence_shingles & seen) / len(sentence_shingles) >= self.overlap_threshold:
+                    dropped_sentences += 1
+                    continue
+                cost = estimate_tokens(sentence) + 1
+                if not lines and header:
+                    cost += estimate_tokens(header) + 1
+                if used + cost > self.token_budget:
+                    break
+                if not lines and header:
+                    lines.append(header)
+                lines.append(sentence)
+                seen |= sentence_shingles
+                used += cost
+
+            if lines:
+                packed.append(Document(page_content="\n".join(lines), metadata=doc.metadata))
+            if used >= self.token_budget:
+                break
+
+        self.stats = {
+            "documents_in": len(documents),
+            "documents_packed": len(packed),
+            "raw_tokens": sum(estimate_tokens(doc.page_content) for doc in documents),
+            "context_tokens": sum(estimate_tokens(doc.page_content) for doc in packed),
+            "dropped_sentences": dropped_sentences,
+        }
+        inc("context_tokens", self.stats["context_tokens"])
+        return packed
+
+
+class PromptTokenCounter(BaseCallbackHandler):
+    """Records the LLM call time and the prompt/completion token usage reported by the provider"""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.started = None
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.started = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.started = time.perf_counter()
+
+    def on_llm_end(self, response, **kwargs):
+        if self.started is not None:
+            observe("llm_seconds", time.perf_counter() - self.started)
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+        inc("prompt_tokens", usage.get("prompt_tokens", 0))
+        inc("completion_tokens", usage.get("completion_tokens", 0))
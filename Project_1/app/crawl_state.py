@@ -0,0 +1,153 @@
+import os
+import json
+import threading
+from record_sink import JsonlSink
+
+
+def task_key(*parts):
+    """Builds a journal key for a crawl task, e.g. task_key(query, "page", 3)."""
+    return " | ".join(str(part) for part in parts)
+
+
+class CrawlJournal:
+    """
+    Append-only journal of completed crawl tasks and the records they produced.
+
+    Every completed task (a query page, a URL, ...) is written as one JSON line
+    together with its records, so results reach the disk as soon as they are scraped.
+    A run started with `resume=True` reloads the journal and skips every task it
+    already contains; otherwise the journal is cleared and the crawl starts over.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = set()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+        elif os.path.exists(path):
+            os.remove(path)
+
+        self._sink = JsonlSink(path, mode="a")
+
+    def _load(self):
+        """Reads completed task keys, cutting off a half-written last line left by a crash."""
+        good_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.completed.add(entry["task"])
+                good_end += len(line)
+
+        if good_end != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_end)
+
+        print(f"Resuming crawl: {len(self.completed)} tasks already completed in {self.path}")
+
+    def is_done(self, task):
+        """Returns True if the task was completed by this or a previous run."""
+        return task in self.completed
+
+    def mark_done(self, task, records=(), status=None):
+        """
+        Records a task as completed and appends its records to the journal.
+
+        Parameters:
+            task (str): Unique key of the task.
+            records (list): Records (dicts) scraped by the task.
+            status (str): Why a task produced no records (e.g. "failed"), kept in its journal line.
+
+        Returns:
+            int: Byte offset of the task's line in the journal.
+        """
+        entry = {"task": task, "records": list(records)}
+        if status:
+            entry["status"] = status
+        with self._lock:
+            offset = self._sink.write(entry)
+            self.completed.add(task)
+        return offset
+
+    def entries(self):
+        """Yields (byte offset, task, records) for every journal line, reading one line at a time."""
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                entry = json.loads(line)
+                yield offset, entry["task"], entry["records"]
+                offset += len(line)
+
+    def records(self):
+        """Yields every record stored in the journal, in completion order."""
+        for _, _, records in self.entries():
+            yield from records
+
+    def latest_records(self):
+        """
+        Yields the records of the journal, keeping only the latest entry of a task done more than
+        once; an empty entry (a failed refetch) does not replace an earlier one with records.
+        """
+        latest = {}
+        for offset, task, records in self.entries():
+            if records or task not in latest:
+                latest[task] = offset
+        for offset, task, records in self.entries():
+            if latest[task] == offset:
+                yield from records
+
+    def close(self):
+        self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LinkWatermarks:
+    """
+    Links already collected for each query, kept across runs in a JSON file.
+
+    Search results come newest first, so an incremental crawl fetches only links not seen
+    before and stops paging a query once a result page is mostly known links. Links are
+    added only after the records they belong to are safely stored, and written by `save`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.links = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.links = {query: set(links) for query, links in json.load(f).items()}
+
+    def is_known(self, query, link):
+        """Returns True if the link was collected for the query by an earlier run."""
+        return link in self.links.get(query, ())
+
+    def known_share(self, query, links):
+        """Share of `links` collected by earlier runs (1.0 for an empty page)."""
+        if not links:
+            return 1.0
+        known = self.links.get(query, ())
+        return sum(link in known for link in links) / len(links)
+
+    def add(self, query, links):
+        with self._lock:
+            self.links.setdefault(query, set()).update(links)
+
+    def save(self):
+        """Writes the watermarks atomically."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            data = {query: sorted(links) for query, links in self.links.items()}
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(self.path + ".tmp", self.path)
@@ -0,0 +1,254 @@
+import re
+import zlib
+import argparse
+import numpy as np
+import pandas as pd
+
+# Hashing constants for the MinHash permutations
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingles(text, k=5):
+    """
+    Splits a text into overlapping word k-grams (shingles).
+
+    Parameters:
+        text (str): The text to shingle.
+        k (int): Number of words per shingle.
+
+    Returns:
+        set: A set of shingle strings. Texts shorter than k words give a single shingle.
+    """
+    if not isinstance(text, str):
+        return set()
+
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return set()
+    if len(words) <= k:
+        return {' '.join(words)}
+
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def choose_bands(num_perm, threshold):
+    """
+    Picks the LSH band/row split whose collision threshold (1/b)^(1/r) sits closest
+    to, but not above, the requested Jaccard threshold.
+
+    Parameters:
+        num_perm (int): Signature length.
+        threshold (float): Target Jaccard similarity.
+
+    Returns:
+        tuple: (bands, rows) with bands * rows == num_perm.
+    """
+    best = (num_perm, 1)
+    best_gap = float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        approx = (1.0 / bands) ** (1.0 / rows)
+        if approx <= threshold and threshold - approx < best_gap:
+            best, best_gap = (bands, rows), threshold - approx
+
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index for finding near-duplicate texts in sub-quadratic time.
+
+    Each text is fingerprinted with a MinHash signature; signatures are split into
+    bands and only texts sharing a band bucket are compared, so the cost grows with
+    the number of documents rather than the number of document pairs.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=5, seed=42):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 29, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 29, size=num_perm, dtype=np.uint64)
+
+        self.signatures = []
+        self.buckets = [{} for _ in range(self.bands)]
+
+    def signature(self, text, tokens=None):
+        """Computes the MinHash signature of a text (all-max for empty texts)."""
+        tokens = shingles(text, self.shingle_size) if tokens is None else tokens
+        if not tokens:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in tokens), dtype=np.uint64, count=len(tokens))
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def add(self, text):
+        """
+        Adds a text to the index.
+
+        Returns:
+            int: The position of the text in the index.
+        """
+        doc_id = len(self.signatures)
+        tokens = shingles(text, self.shingle_size)
+        sig = self.signature(text, tokens)
+        self.signatures.append(sig)
+
+        # Empty texts are never treated as duplicates of each other
+        if not tokens:
+            return doc_id
+
+        for band in range(self.bands):
+            key = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            self.buckets[band].setdefault(key, []).append(doc_id)
+
+        return doc_id
+
+    def match(self, text):
+        """
+        Adds a text and looks up the earliest indexed text it nearly duplicates,
+        so duplicates can be dropped while records are streamed.
+
+        Returns:
+            tuple: (position of the text, position of its earliest near-duplicate or None)
+        """
+        doc_id = self.add(text)
+        sig = self.signatures[doc_id]
+
+        candidates = set()
+        for band in range(self.bands):
+            key = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            candidates.update(other for other in self.buckets[band].get(key, []) if other < doc_id)
+
+        matches = [other for other in sorted(candidates) if self.similarity(doc_id, other) >= self.threshold]
+        return doc_id, (matches[0] if matches else None)
+
+    def similarity(self, i, j):
+        """Estimated Jaccard similarity between two indexed texts."""
+        return float(np.mean(self.signatures[i] == self.signatures[j]))
+
+    def clusters(self):
+        """
+        Groups indexed texts into near-duplicate clusters.
+
+        Returns:
+            list: Lists of document positions, one per cluster of two or more texts,
+                  each sorted so the first entry is the earliest occurrence.
+        """
+        parent = list(range(len(self.signatures)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        checked = set()
+        for band in self.buckets:
+            for members in band.values():
+                if len(members) < 2:
+                    continue
+                head = members[0]
+                for other in members[1:]:
+                    if (head, other) in checked:
+                        continue
+                    checked.add((head, other))
+                    if self.similarity(head, other) >= self.threshold:
+                        root_a, root_b = find(head), find(other)
+                        if root_a != root_b:
+                            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        groups = {}
+        for doc_id in range(len(parent)):
+            groups.setdefault(find(doc_id), []).append(doc_id)
+
+        return [members for members in groups.values() if len(members) > 1]
+
+
+def find_near_duplicates(texts, threshold=0.8, num_perm=128, shingle_size=5):
+    """
+    Finds clusters of near-duplicate texts.
+
+    Parameters:
+        texts (iterable): Texts to compare.
+        threshold (float): Minimum estimated Jaccard similarity for two texts to be duplicates.
+        num_perm (int): MinHash signature length.
+        shingle_size (int): Words per shingle.
+
+    Returns:
+        list: Clusters of positions into `texts` (only clusters with two or more members).
+    """
+    index = NearDuplicateIndex(threshold=threshold, num_perm=num_perm, shingle_size=shingle_size)
+    for text in texts:
+        index.add(text)
+    return index.clusters()
+
+
+def drop_near_duplicates(df, column='Content', threshold=0.8, num_perm=128, shingle_size=5):
+    """
+    Collapses near-duplicate rows of a DataFrame, keeping the first row of each cluster.
+
+    Parameters:
+        df (pd.DataFrame): Data to deduplicate.
+        column (str): Text column to fingerprint.
+        threshold (float): Minimum estimated Jaccard similarity.
+        num_perm (int): MinHash signature length.
+        shingle_size (int): Words per shingle.
+
+    Returns:
+        tuple: (deduplicated DataFrame, list of clusters as lists of original index labels)
+    """
+    if df.empty:
+        return df, []
+
+    positions = find_near_duplicates(df[column].tolist(), threshold, num_perm, shingle_size)
+    drop = [pos for cluster in positions for pos in cluster[1:]]
+    clusters = [[df.index[pos] for pos in cluster] for cluster in positions]
+
+    deduped = df.drop(index=df.index[drop]).reset_index(drop=True)
+    return deduped, clusters
+
+
+def report_clusters(df, clusters, label_column=None, max_clusters=20):
+    """
+    Prints a short summary of the near-duplicate clusters found in a DataFrame.
+
+    Parameters:
+        df (pd.DataFrame): The original (not deduplicated) data the clusters refer to.
+        clusters (list): Clusters as returned by `drop_near_duplicates`.
+        label_column (str): Column used to describe each member, e.g. "Link" or "Headline".
+        max_clusters (int): Number of clusters to list in detail.
+    """
+    removed = sum(len(cluster) - 1 for cluster in clusters)
+    print(f"Found {len(clusters)} near-duplicate clusters; {removed} of {len(df)} rows collapsed.")
+
+    for n, cluster in enumerate(sorted(clusters, key=len, reverse=True)[:max_clusters], 1):
+        print(f"  Cluster {n} ({len(cluster)} rows):")
+        for label in cluster:
+            description = df.loc[label, label_column] if label_column else label
+            print(f"    - {description}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report near-duplicate rows in a scraped CSV file.")
+    parser.add_argument("csv_file", help="CSV file to scan, e.g. data/google_news.csv")
+    parser.add_argument("--column", default="Content", help="Text column to fingerprint")
+    parser.add_argument("--label", default="Link", help="Column used to describe cluster members")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Jaccard similarity threshold")
+    parser.add_argument("--output", help="Optional path to save the deduplicated CSV")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv_file)
+    deduped, clusters = drop_near_duplicates(df, args.column, args.threshold)
+    report_clusters(df, clusters, args.label if args.label in df.columns else None)
+
+    if args.output:
+        deduped.to_csv(args.output, index=False)
+        print(f"Saved {len(deduped)} rows to {args.output}")
@@ -0,0 +1,388 @@
+import os
+import time
+import json
+import random
+import zlib
+import gzip
+import threading
+from html import escape
+from urllib.parse import urlparse, parse_qs, quote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WORDS = ("generative ai enterprise platform model data cloud partner customer insight "
+         "automation agent copilot workflow industry solution innovation infrastructure "
+         "training inference responsible scale engineering services transformation").split()
+
+
+def synthetic_page(path, query):
+    """
+    Builds a deterministic HTML page for `/pages/<site>/<page>` paths.
+    The `kb` query parameter sets the approximate body size (default 20 KB); `meta_charset=1`
+    declares the charset in a <meta> tag instead of the Content-Type header.
+
+    Returns:
+        tuple: (status code, content type, body)
+    """
+    parts = [part for part in path.split('/') if part]
+    site = parts[1] if len(parts) > 1 else "fixture"
+    rng = random.Random(zlib.crc32(path.encode('utf-8')))
+    size = int(query.get('kb', ['20'])[0]) * 1024
+
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = ' '.join(rng.choice(WORDS) for _ in range(60))
+        paragraphs.append(f"<p>{paragraph}.</p>")
+        length += len(paragraph)
+
+    meta_charset = query.get('meta_charset', ['0'])[0] == '1'
+    charset_tag = '<meta charset="utf-8">' if meta_charset else ''
+    body = (f"<html><head>{charset_tag}"
+            f"<title>{site.capitalize()} | {path}</title>"
+            f"<meta property=\"og:site_name\" content=\"{site.capitalize()}\"></head>"
+            f"<body><nav><a href=\"/\">Home</a></nav><main>{''.join(paragraphs)}</main></body></html>")
+    return 200, "text/html" if meta_charset else "text/html; charset=utf-8", body
+
+
+def binary_file(path, query):
+    """
+    Serves `/files/<name>.<ext>` as an opaque download (PDF, video, archive) of `kb` KB
+    (default 5 MB), like the documents and media linked from company pages.
+    """
+    content_types = {"pdf": "application/pdf", "mp4": "video/mp4", "zip": "application/zip"}
+    extension = path.rsplit('.', 1)[-1].lower()
+    size = int(query.get('kb', ['5000'])[0]) * 1024
+    rng = random.Random(zlib.crc32(path.encode('utf-8')))
+    return 200, content_types.get(extension, "application/octet-stream"), rng.randbytes(size)
+
+
+def serpapi_jobs(path, query, pages=3, per_page=10):
+    """
+    Mimics SerpAPI's Google Jobs JSON for `/search.json`: `per_page` jobs per page and a
+    `serpapi_pagination.next_page_token` until `pages` pages have been served.
+
+    Returns:
+        tuple: (status code, content type, body)
+    """
+    q = query.get('q', [''])[0]
+    page = int(query.get('next_page_token', ['page-0'])[0].split('-')[-1])
+    jobs = [{
+        "title": f"GenAI Engineer {page * per_page + n}",
+        "company_name": q.split(' ')[1] if ' ' in q else q,
+        "location": q.split(' ')[-1],
+        "description": f"Job {page * per_page + n} for query '{q}'. " + ' '.join(WORDS),
+        "apply_options": [{"link": f"https://jobs.example.com/{zlib.crc32(q.encode('utf-8'))}/{page}/{n}"}],
+        "detected_extensions": {"posted_at": f"{n + 1} days ago"}
+    } for n in range(per_page)]
+
+    results = {"search_parameters": {"engine": "google_jobs", "q": q}, "jobs_results": jobs}
+    if page + 1 < pages:
+        results["serpapi_pagination"] = {"next_page_token": f"page-{page + 1}"}
+    return 200, "application/json", json.dumps(results)
+
+
+def google_news_results(path, query, per_page=10):
+    """
+    Mimics a Google News result page for `/news?q=...&start=...`, with the markup the
+    Google News scraper reads (div.SoaBEf cards, n0jPhd headlines, MgUUmf sources). Article
+    links point back to `/pages/news/...` on the same server. `fresh=N` simulates N articles
+    published since the last crawl: they take the top of the results and push the rest down.
+
+    Returns:
+        tuple: (status code, content type, body)
+    """
+    q = query.get('q', [''])[0]
+    start = int(query.get('start', ['0'])[0])
+    fresh = int(query.get('fresh', ['0'])[0])
+    slug = zlib.crc32(q.encode('utf-8'))
+    cards = ''.join(
+        f'<div class="SoaBEf"><a href="/pages/news{slug}/{start + n - fresh}">'
+        f'<div class="n0jPhd">{q} headline {start + n - fresh}</div>'
+        f'<div class="MgUUmf">Source {n % 4}</div></a></div>'
+        for n in range(per_page))
+    body = f"<html><body><div id=\"search\">{cards}</div><a href=\"/news?q={quote(q)}&start={start + per_page}\">Next</a></body></html>"
+    return 200, "text/html; charset=utf-8", body
+
+
+def news_feed(path, query, items=20):
+    """
+    Mimics a Google News search feed for `/rss/search?q=...`: RSS 2.0 by default, Atom with
+    `format=atom`. It has `items` entries (default 20), with the CDATA descriptions and
+    <source> elements of the real feed; their relative links point to `/pages/news/...`.
+
+    Returns:
+        tuple: (status code, content type, body)
+    """
+    q = query.get('q', [''])[0]
+    count = int(query.get('items', [str(items)])[0])
+    slug = zlib.crc32(q.encode('utf-8'))
+    if query.get('format', ['rss'])[0] == 'atom':
+        entries = ''.join(
+            f'<entry><title>{escape(q)} headline {n}</title><link href="/pages/news{slug}/{n}"/>'
+            f'<author><name>Source {n % 4}</name></author>'
+            f'<summary>{escape(" ".join(WORDS[n % 10:n % 10 + 12]))}</summary></entry>'
+            for n in range(count))
+        body = f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>{escape(q)}</title>{entries}</feed>'
+        return 200, "application/atom+xml; charset=utf-8", body
+    items_xml = ''.join(
+        f'<item><title>{escape(q)} headline {n} - Source {n % 4}</title><link>/pages/news{slug}/{n}</link>'
+        f'<description><![CDATA[<a href="/pages/news{slug}/{n}">{escape(q)} headline {n}</a>'
+        f'&nbsp;&nbsp;<font color="#6f6f6f">Source {n % 4}</font>]]></description>'
+        f'<source url="https://source{n % 4}.example.com">Source {n % 4}</source></item>'
+        for n in range(count))
+    body = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{escape(q)}</title>{items_xml}</channel></rss>'
+    return 200, "application/rss+xml; charset=UTF-8", body
+
+
+def seek_results(path, query, pages=3, per_page=20):
+    """
+    Mimics a Seek search result page for `/seek?keywords=...&page=...`, with the
+    data-automation attributes the Seek scraper reads and numbered page links. With
+    `embedded=1` the jobs come as `window.SEEK_REDUX_DATA` JSON instead of cards, as on
+    pages rendered client-side.
+
+    Returns:
+        tuple: (status code, content type, body)
+    """
+    keywords = query.get('keywords', [''])[0]
+    page = int(query.get('page', ['1'])[0])
+    pages = int(query.get('pages', [str(pages)])[0])
+    if page > pages:
+        return 200, "text/html; charset=utf-8", "<html><body><p>No matching search results</p></body></html>"
+    if query.get('embedded', ['0'])[0] == '1':
+        jobs = [{"id": f"{page}-{n}", "title": f"GenAI Consultant {page}-{n}", "advertiser": {"description": keywords},
+                 "teaser": f"Work on {' '.join(WORDS[n % 10:n % 10 + 8])}.", "location": "Sydney NSW"}
+                for n in range(per_page)]
+        data = {"results": {"results": {"jobs": jobs, "totalCount": pages * per_page}}}
+        body = (f"<html><head><script>window.SEEK_REDUX_DATA = {json.dumps(data)};\n</script></head>"
+                f"<body><div id=\"app\"></div></body></html>")
+        return 200, "text/html; charset=utf-8", body
+    cards = ''.join(
+        f'<article data-automation="normalJob">'
+        f'<a data-automation="jobTitle" href="/pages/seek/{page}-{n}">GenAI Consultant {page}-{n}</a>'
+        f'<a data-automation="jobCompany">{keywords}</a>'
+        f'<span data-automation="jobShortDescription">Work on {" ".join(WORDS[n % 10:n % 10 + 8])}.</span>'
+        f'</article>'
+        for n in range(per_page))
+    next_class = "disabled" if page >= pages else ""
+    numbers = ''.join(f'<a data-automation="page-{n}" href="/seek?keywords={quote(keywords)}&page={n}">{n}</a>'
+                      for n in range(1, pages + 1))
+    body = (f"<html><body>{cards}<nav>{numbers}<a data-automation=\"pageNext\" class=\"{next_class}\" "
+            f"href=\"/seek?keywords={quote(keywords)}&page={page + 1}\">Next</a></nav></body></html>")
+    return 200, "text/html; charset=utf-8", body
+
+
+class SitemapSite:
+    """
+    Route handler for a company website with a robots.txt, a sitemap index and gzipped
+    sitemaps of `per_sitemap` pages each; every `genai_every`-th page has a GenAI slug and
+    a few of those sit under the robots-disallowed /pages/private/.
+    `publish` and `update` change the site between crawls, moving the lastmods with them.
+
+        site = SitemapSite()
+        server.add_route("/robots.txt", site)
+        server.add_route("/sitemap", site)
+    """
+
+    TOPICS = ["generative-ai", "genai-platform", "llm-agents", "careers", "investor-relations", "sustainability"]
+
+    def __init__(self, sitemaps=20, per_sitemap=500, genai_every=3):
+        self.per_sitemap = per_sitemap
+        self.genai_every = genai_every
+        self.day = 0
+        self.lastmods = [0] * (sitemaps * per_sitemap)
+        self._lock = threading.Lock()
+
+    def page_path(self, n):
+        if n % self.genai_every:
+            return f"/pages/corp/{self.TOPICS[3 + n % 3]}-{n}"
+        folder = "private" if n % 97 == 0 else "corp"
+        return f"/pages/{folder}/{self.TOPICS[n % 3]}-{n}"
+
+    def publish(self, count):
+        """Adds `count` pages, dated one day after the previous change"""
+        with self._lock:
+            self.day += 1
+            self.lastmods.extend([self.day] * count)
+
+    def update(self, pages):
+        """Marks the given page numbers as modified"""
+        with self._lock:
+            self.day += 1
+            for n in pages:
+                self.lastmods[n] = self.day
+
+    @staticmethod
+    def date(day):
+        return "2025-01-01T00:00:00+00:00" if day == 0 else f"2025-02-{day:02d}T00:00:00+00:00"
+
+    def __call__(self, path, query):
+        with self._lock:
+            lastmods = list(self.lastmods)
+        chunks = range(0, len(lastmods), self.per_sitemap)
+        if path == "/robots.txt":
+            body = "User-agent: *\nDisallow: /pages/private/\nSitemap: /sitemap_index.xml\n"
+            return 200, "text/plain", body
+        if path == "/sitemap_index.xml":
+            entries = ''.join(f'<sitemap><loc>/sitemaps/pages-{k // self.per_sitemap}.xml.gz</loc>'
+                              f'<lastmod>{self.date(max(lastmods[k:k + self.per_sitemap]))}</lastmod></sitemap>'
+                              for k in chunks)
+            body = f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'
+            return 200, "application/xml", body
+        if path.startswith("/sitemaps/pages-"):
+            start = int(path.split("-")[1].split(".")[0]) * self.per_sitemap
+            if start >= len(lastmods):
+                return 404, "text/plain", "Not found"
+            entries = ''.join(f'<url><loc>{self.page_path(n)}</loc><lastmod>{self.date(lastmods[n])}</lastmod></url>'
+                              for n in range(start, min(start + self.per_sitemap, len(lastmods))))
+            body = f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+            return 200, "application/x-gzip", gzip.compress(body.encode('utf-8'))
+        return 404, "text/plain", "Not found"
+
+
+def recorded_pages(directory, prefix="/recorded/"):
+    """
+    Handler serving files saved from real sites: `/recorded/<name>` returns `<directory>/<name>`.
+
+    Returns:
+        callable: A route handler for `FixtureServer.add_route(prefix, ...)`.
+    """
+    root = os.path.abspath(directory)
+
+    def handler(path, query):
+        file_path = os.path.abspath(os.path.join(root, path[len(prefix):]))
+        if not file_path.startswith(root + os.sep) or not os.path.isfile(file_path):
+            return 404, "text/plain", "Not found"
+        content_type = "application/json" if file_path.endswith(".json") else "text/html; charset=utf-8"
+        with open(file_path, "rb") as f:
+            return 200, content_type, f.read()
+
+    return handler
+
+
+class FixtureServer:
+    """
+    Local HTTP server for offline benchmarks and manual testing of the scrapers.
+
+    Routes map a path prefix to a handler `handler(path, query) -> (status, content type, body)`.
+    Every response can be delayed by `latency` seconds and replaced by a 503 error with
+    probability `error_rate`, to mimic slow or flaky sites.
+
+    The server listens on loopback only. Other 127.0.0.x addresses asked for by `url` get a
+    listener of their own on the same port, so benchmarks can fake several domains.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.routes = [("/pages/", synthetic_page), ("/search.json", serpapi_jobs),
+                       ("/news", google_news_results), ("/seek", seek_results), ("/files/", binary_file),
+                       ("/rss/search", news_feed)]
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.host = host
+        self._server = self._listen(host, port)
+        self._servers = {host: self._server}
+        self._started = False
+
+    def _listen(self, host, port):
+        server = ThreadingHTTPServer((host, port), self._handler_class())
+        server.daemon_threads = True
+        return server
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def url(self, path="/", host=None):
+        """Absolute URL of a path on the server; a 127.0.0.x host other than the bound one gets its own listener."""
+        host = host or self.host
+        with self._lock:
+            if host not in self._servers:
+                server = self._servers[host] = self._listen(host, self.port)
+                if self._started:
+                    threading.Thread(target=server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self.port}{path}"
+
+    def add_route(self, prefix, handler):
+        """Registers a handler for every path starting with `prefix` (checked before earlier routes)."""
+        self.routes.insert(0, (prefix, handler))
+
+    def respond(self, path, query):
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            return 503, "text/plain", "Injected error"
+        for prefix, handler in self.routes:
+            if path.startswith(prefix):
+                return handler(path, query)
+        return 404, "text/plain", "Not found"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                status, content_type, body = server.respond(parsed.path, parse_qs(parsed.query))
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client stopped reading (content-type or byte-cap cut-off)
+
+            def log_message(self, *args):
+                pass  # Keep benchmark output readable
+
+        return Handler
+
+    def start(self):
+        with self._lock:
+            self._started = True
+            for server in self._servers.values():
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            servers = list(self._servers.values())
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve synthetic fixture pages for offline scraper runs.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--recorded", default=None, help="Directory of saved pages served under /recorded/")
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=args.latency, error_rate=args.error_rate, port=args.port)
+    if args.recorded:
+        server.add_route("/recorded/", recorded_pages(args.recorded))
+    with server:
+        print(f"Serving fixtures on {server.url()} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -1,32 +1,38 @@
 import json
+import argparse
 import pandas as pd
 import os
 from dotenv import load_dotenv
-from serpapi import GoogleSearch
+from serpapi_client import SerpApiClient
+from metrics import run
 
-def get_google_jobs(query, location, company, api_key):
+def jobs_query(query, location, company):
     """
-    Fetches job listings from Google Jobs using SerpAPI.
+    Builds the SerpAPI parameters of a Google Jobs search.
     
     Parameters:
         query (str): The job title or keyword to search for.
         location (str): The location where jobs are being searched.
         company (str): The company name to filter job results.
-        api_key (str): The API key for SerpAPI.
     
     Returns:
-        list: A list of dictionaries containing job details.
+        dict: SerpAPI query parameters (without the API key).
     """
-    params = {
+    return {
         "engine": "google_jobs",
-        "q": f"{query} {company} {location}", # query
-        "api_key": api_key
+        "q": f"{query} {company} {location}" # query
     }
+
+def parse_jobs(jobs):
+    """
+    Converts Google Jobs results into job records.
     
-    search = GoogleSearch(params)
-    results = search.get_dict()
-    jobs = results.get("jobs_results", [])
+    Parameters:
+        jobs (list): The `jobs_results` entries returned by SerpAPI.
     
+    Returns:
+        list: A list of dictionaries containing job details.
+    """
     job_list = []
     for job in jobs:
         # Extract the job posting date if available
@@ -44,26 +50,47 @@ def get_google_jobs(query, location, company, api_key):
     
     return job_list
 
-def fetch_jobs(api_key, csv_filename="data/jobs_data.csv"):
+def get_google_jobs(query, location, company, api_key, client=None):
+    """
+    Fetches job listings from Google Jobs using SerpAPI, following result pages.
+    
+    Parameters:
+        query (str): The job title or keyword to search for.
+        location (str): The location where jobs are being searched.
+        company (str): The company name to filter job results.
+        api_key (str): The API key for SerpAPI.
+        client (SerpApiClient): Client to reuse (cache, quota); a new one is created if omitted.
+    
+    Returns:
+        list: A list of dictionaries containing job details.
+    """
+    client = client or SerpApiClient(api_key)
+    jobs = client.search_pages(jobs_query(query, location, company))
+    return parse_jobs(jobs)
+
+def fetch_jobs(api_key, csv_filename="data/jobs_data.csv", client=None):
     """
     Fetches job listings for multiple locations and companies, then stores them in a CSV file.
+    All searches run concurrently through the SerpAPI client, which caches responses and counts quota.
     
     Parameters:
         api_key (str): The API key for SerpAPI.
         csv_filename (str): The name of the CSV file to store job data.
+        client (SerpApiClient): Client to use; a default one is created if omitted.
     
     Returns:
         pd.DataFrame: A DataFrame containing the job listings.
     """
+    client = client or SerpApiClient(api_key)
     locations = ["India", "Australia"]
     companies = ["TCS", "Infosys", "Wipro", "LTIMindtree", "Cognizant", "Tech Mahindra", "HCLTech"]
     all_jobs = []
     
-    # Iterate through each location and company to fetch job listings
-    for location in locations:
-        for company in companies:
-            jobs = get_google_jobs("GenAI", location, company, api_key)
-            all_jobs.extend(jobs)
+    # Search every location and company combination, keeping the original order of the results
+    queries = [jobs_query("GenAI", location, company) for location in locations for company in companies]
+    for jobs in client.search_many(queries):
+        all_jobs.extend(parse_jobs(jobs))
+    client.report()
     
     new_jobs_df = pd.DataFrame(all_jobs)
     
@@ -80,9 +107,20 @@ def fetch_jobs(api_key, csv_filename="data/jobs_data.csv"):
     return combined_df
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch GenAI job listings from Google Jobs via SerpAPI.")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent SerpAPI requests")
+    parser.add_argument("--pages", type=int, default=3, help="Result pages to follow per query")
+    parser.add_argument("--cache-ttl", type=float, default=24, help="Hours a cached response stays valid")
+    parser.add_argument("--max-searches", type=int, default=None, help="Budget of live (paid) searches for this run")
+    parser.add_argument("--base-url", default=None, help="SerpAPI endpoint, e.g. a local stub server")
+    args = parser.parse_args()
+    
     # Replace with your actual SerpAPI key
     load_dotenv()
     
     API_KEY = os.getenv('SERPAPI')
-    jobs_df = fetch_jobs(API_KEY)
+    client = SerpApiClient(API_KEY, base_url=args.base_url, cache_ttl=args.cache_ttl * 3600,
+                           max_workers=args.workers, max_pages=args.pages, max_searches=args.max_searches)
+    with run("google_jobs_scraper"):
+        jobs_df = fetch_jobs(API_KEY, client=client)
     print("Job data updated successfully.")
@@ -1,14 +1,21 @@
 import time
 import random
-import pandas as pd
+import argparse
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from webdriver_manager.chrome import ChromeDriverManager
-import requests
 from bs4 import BeautifulSoup
+from crawl_state import CrawlJournal, LinkWatermarks, task_key
+from record_sink import JsonlSink
+from news_archive import WATERMARKS_PATH, ARCHIVE_PATH, query_key, seed_archive, write_output
+from metrics import inc, timer, run
+from http_fetch import fetch_html
+
+# Paging a query stops after a result page with at least this share of known links
+KNOWN_SHARE_STOP = 0.8
 
 def scrape_url(url):
     """
@@ -37,42 +44,94 @@ def scrape_url(url):
     for user_agent in USER_AGENTS:
         headers = {"User-Agent": user_agent}
         try:
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
+            with timer("fetch_seconds", scraper="google_news"):
+                page = fetch_html(url, headers=headers, timeout=10, scraper="google_news")
+            inc("pages_fetched", scraper="google_news")
+            if page.status_code == 200 and page.text is None:
+                break  # Not an HTML page (PDF, video...); another user agent will not change that
+            if page.status_code == 200:
                 # Parse HTML content
-                soup = BeautifulSoup(response.text, "html.parser")
+                soup = BeautifulSoup(page.text, "html.parser")
                 link_texts = [link.get_text(strip=True) for link in soup.find_all("a", href=True)]
                 page_content = " ".join(link_texts)
                 success = True
                 break  # Stop trying other user agents if successful
             else:
-                print(f"Failed with UA '{user_agent}': {url} (Status Code: {response.status_code})")
+                print(f"Failed with UA '{user_agent}': {url} (Status Code: {page.status_code})")
         except Exception as e:
             print(f"Error with UA '{user_agent}' for URL {url}: {e}")
+        inc("retries", scraper="google_news")
         
         time.sleep(UA_DELAY)  # Wait before trying the next user agent
     
     if not success:
         page_content = ""
+        inc("fetch_errors", scraper="google_news")
     
     time.sleep(REQUEST_DELAY)  # Final delay before returning the result
     
     return page_content
 
-def scrape_google_news(companies, locations, keywords, pages):
+def unseen_links(watermarks, query, links):
+    """
+    Decides what to fetch from one result page of an incremental crawl.
+    
+    Parameters:
+        watermarks (LinkWatermarks): Links collected by earlier runs, or None for a full-depth crawl.
+        query (str): The search query.
+        links (list): Article links on the page, in result order.
+    
+    Returns:
+        tuple: (links to fetch, whether to stop paging after this page)
+    """
+    if watermarks is None:
+        return list(links), False
+    unseen = [link for link in links if not watermarks.is_known(query, link)]
+    inc("known_links_skipped", len(links) - len(unseen), scraper="google_news")
+    return unseen, watermarks.known_share(query, links) >= KNOWN_SHARE_STOP
+
+def archive_run(journal, archive_path, watermarks):
+    """Appends the articles of this run to the archive, then records their links as seen"""
+    with JsonlSink(archive_path, mode="a") as archive:
+        for _, task, records in journal.entries():
+            query = task.split(" | page | ")[0]
+            for record in records:
+                archive.write(record)
+            watermarks.add(query, [record["Link"] for record in records])
+    watermarks.save()
+
+def scrape_google_news(companies, locations, keywords, pages, output_file="data/google_news.csv", resume=False,
+                       journal_path="data/.crawl/google_news.jsonl", full_depth=False,
+                       watermarks_path=WATERMARKS_PATH, archive_path=ARCHIVE_PATH):
     """
     Scrapes Google News for Generative AI-related articles for given companies and locations.
     Uses Selenium to navigate through Google News and extract relevant article information.
+    Every finished result page is journaled to disk, so an interrupted run can be resumed.
+    
+    Runs are incremental: only article links not collected by an earlier run are fetched, and
+    paging a query stops once a result page is mostly known links. New articles are added to
+    an archive of all articles collected so far, from which `output_file` is rebuilt.
     
     Parameters:
         companies (list): List of company names to search for.
         locations (list): List of locations to include in the search query.
         pages (int): Number of pages to scrape per search query.
+        output_file (str): Where to save the articles (.csv, .jsonl or .parquet).
+        resume (bool): Skip queries and pages completed by a previous run.
+        journal_path (str): File used to record completed pages and their articles.
+        full_depth (bool): Walk all `pages` pages and re-fetch every link, as before watermarks.
+        watermarks_path (str): JSON file of the links collected per query.
+        archive_path (str): JSONL file of every article collected so far.
     
     Returns:
-        pd.DataFrame: DataFrame containing extracted news headlines, sources, descriptions, and links.
+        int: Number of news articles (headlines, sources, descriptions, and links) saved. This used
+        to be a DataFrame of the articles; read `output_file` (e.g. `pd.read_csv(output_file)`) for it.
     """
     
+    journal = CrawlJournal(journal_path, resume=resume)
+    watermarks = LinkWatermarks(watermarks_path)
+    seed_archive(output_file, archive_path)
+    
     # Configure Selenium WebDriver
     chrome_options = Options()
     chrome_options.add_argument("--start-maximized")  # Maximize browser window
@@ -81,13 +140,40 @@ def scrape_google_news(companies, locations, keywords, pages):
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     
-    news_data = []  # List to store scraped news data
+    try:
+        scrape_queries(driver, journal, companies, locations, keywords, pages,
+                       watermarks=None if full_depth else watermarks)
+    finally:
+        driver.quit()  # Close the browser, even on Ctrl-C or a crash
+        journal.close()
+    
+    archive_run(journal, archive_path, watermarks)
+    
+    # Stream all collected articles (earlier runs, resumed pages and this run) into the output file
+    return write_output(output_file, archive_path)
+
+def scrape_queries(driver, journal, companies, locations, keywords, pages, watermarks=None):
+    """
+    Runs every keyword x location x company search in the browser, journaling each result page.
     
+    Parameters:
+        driver (webdriver.Chrome): The Selenium driver to search with.
+        journal (CrawlJournal): Journal of completed queries and pages.
+        companies (list): List of company names to search for.
+        locations (list): List of locations to include in the search query.
+        keywords (list): List of keywords to include in the search query.
+        pages (int): Number of pages to scrape per search query.
+        watermarks (LinkWatermarks): Links collected by earlier runs; None crawls at full depth.
+    """
     for keyword in keywords:
         for location in locations:
             for company in companies:
+                search_query = query_key(company, keyword, location)  # Construct search query
+                if journal.is_done(search_query):
+                    print(f"Skipping {company} news in {location} ({keyword}), already scraped.")
+                    continue
+                
                 print(f"Searching for {company} news in {location}...")
-                search_query = f"{company} + Generative AI + {keyword} + {location}"  # Construct search query
                 driver.get("https://www.google.com/")
                 time.sleep(random.uniform(3, 8))
         
@@ -108,8 +194,17 @@ def scrape_google_news(companies, locations, keywords, pages):
         
                 page = 1
                 while page <= pages:
-                    articles = driver.find_elements(By.XPATH, '//div[@class="SoaBEf"]')
-                    print(f"Found {len(articles)} news articles on page {page}.")
+                    page_task = task_key(search_query, "page", page)
+                    if journal.is_done(page_task):
+                        print(f"Page {page} already scraped, moving on.")
+                        inc("cache_hits", scraper="google_news")
+                        articles = []
+                    else:
+                        articles = driver.find_elements(By.XPATH, '//div[@class="SoaBEf"]')
+                        inc("selenium_pages", scraper="google_news")
+                        print(f"Found {len(articles)} news articles on page {page}.")
+                    page_data = []
+                    cards = []
         
                     for article in articles:
                         try:
@@ -124,21 +219,36 @@ def scrape_google_news(companies, locations, keywords, pages):
                             # Extract source name
                             source_element = article.find_element(By.XPATH, './/div[contains(@class, "MgUUmf")]')
                             source = source_element.text if source_element else "N/A"
-
-                            # Scrape article content from the URL
-                            content = scrape_url(link)
-        
-                            # Store extracted data
-                            news_data.append({
-                                "Company": company,
-                                "Location": location,
-                                "Headline": headline,
-                                "Source": source,
-                                "Content": content,
-                                "Link": link
-                            })
+                            cards.append((headline, link, source))
                         except Exception as e:
                             print(f"Error extracting news details for {company} in {location}: {e}")
+                    
+                    # Only links not collected by an earlier run are fetched
+                    unseen, stop = unseen_links(watermarks, search_query, [link for _, link, _ in cards])
+                    unseen = set(unseen)
+                    for headline, link, source in cards:
+                        if link not in unseen:
+                            continue
+                        # Scrape article content from the URL
+                        content = scrape_url(link)
+        
+                        # Store extracted data
+                        page_data.append({
+                            "Company": company,
+                            "Location": location,
+                            "Headline": headline,
+                            "Source": source,
+                            "Content": content,
+                            "Link": link
+                        })
+                    
+                    if not journal.is_done(page_task):
+                        journal.mark_done(page_task, page_data)
+                    
+                    if cards and stop:
+                        print(f"Page {page} is mostly known articles, done with this query.")
+                        inc("early_stops", scraper="google_news")
+                        break
         
                     try:
                         # Navigate to the next page
@@ -149,19 +259,22 @@ def scrape_google_news(companies, locations, keywords, pages):
                     except:
                         print(f"No more pages available for {company} in {location}.")
                         break
-    
-    driver.quit()  # Close the browser
-    
-    # Convert collected data into a DataFrame and save as CSV
-    df = pd.DataFrame(news_data)
-    df.to_csv("data/google_news.csv", index=False)
-    
-    return df
+                
+                journal.mark_done(search_query)
 
 if __name__=='__main__':
+    parser = argparse.ArgumentParser(description="Scrape Google News for GenAI initiatives of IT companies.")
+    parser.add_argument("--resume", action="store_true", help="Skip queries and pages completed by a previous run")
+    parser.add_argument("--pages", type=int, default=10, help="Result pages per query at most")
+    parser.add_argument("--full-depth", action="store_true",
+                        help="Walk every page and re-fetch every article instead of stopping at known links")
+    args = parser.parse_args()
+    
     companies = ['Tata Consultancy Services', 'Infosys', 'Wipro', 'LTIMindtree', 'HCLTech', 'Tech Mahindra', 'Dell']
     locations = ["India", "Australia"]
     keywords = ['initiatives', 'investment', 'strategy']
-    pages = 10
 
-    df = scrape_google_news(companies, locations, keywords, pages)
+    with run("google_news_scraper"):
+        count = scrape_google_news(companies, locations, keywords, args.pages, resume=args.resume,
+                                   full_depth=args.full_depth)
+    print(f"Saved {count} news articles to data/google_news.csv")
@@ -0,0 +1,153 @@
+"""
+Streaming page fetches shared by the scrapers.
+
+Responses are streamed instead of downloaded whole: non-HTML content types (PDFs, videos,
+archives) are rejected from their headers before the body is read, reading stops at a byte
+cap, and the encoding comes from the Content-Type header, a BOM, a <meta charset> /
+XML declaration in the first bytes, or charset detection over a small sample, never over
+the whole payload as `response.apparent_encoding` does.
+
+    page = fetch_html(url, headers=headers, timeout=10, scraper="webpage")
+    if page.status_code == 200 and page.text is not None:
+        soup = BeautifulSoup(page.text, "html.parser")
+"""
+import re
+import codecs
+import requests
+from metrics import inc
+
+# Pages are cut to 100,000 characters downstream; 2 MB leaves room for markup and scripts
+DEFAULT_MAX_BYTES = 2_000_000
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+CHUNK_SIZE = 64 * 1024
+# Browsers look for <meta charset> in the first 1024 bytes; some pages put it later
+SNIFF_BYTES = 4096
+DETECTION_SAMPLE_BYTES = 32 * 1024
+
+CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+XML_ENCODING_PATTERN = re.compile(rb"""^<\?xml[^>]+encoding\s*=\s*["']([\w.:-]+)["']""")
+BOMS = [(codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")]
+
+
+class Page:
+    """
+    A fetched page.
+
+    Attributes:
+        response (requests.Response): The response, already closed (status, headers and URL remain usable).
+        text (str): Decoded body, or None if the content type is not accepted.
+        encoding (str): Encoding used to decode the body.
+        truncated (bool): Reading stopped at the byte cap.
+        bytes_read (int): Body bytes downloaded.
+    """
+
+    def __init__(self, response, text=None, encoding=None, truncated=False, bytes_read=0):
+        self.response = response
+        self.text = text
+        self.encoding = encoding
+        self.truncated = truncated
+        self.bytes_read = bytes_read
+
+    @property
+    def status_code(self):
+        return self.response.status_code
+
+    @property
+    def content_type(self):
+        return self.response.headers.get("Content-Type", "")
+
+
+def valid_encoding(name):
+    """Normalized codec name, or None if Python does not know it"""
+    if not name:
+        return None
+    if isinstance(name, bytes):
+        name = name.decode("ascii", "ignore")
+    try:
+        return codecs.lookup(name.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def header_charset(content_type):
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            return valid_encoding(value)
+    return None
+
+
+def detect_encoding(content_type, body):
+    """
+    Encoding of an HTML body: Content-Type charset, BOM, <meta charset> or XML declaration in
+    the first SNIFF_BYTES, UTF-8 if a sample decodes as such, else detection over the sample.
+    """
+    encoding = header_charset(content_type)
+    if encoding:
+        return encoding
+    for bom, name in BOMS:
+        if body.startswith(bom):
+            return name
+    head = body[:SNIFF_BYTES]
+    match = CHARSET_PATTERN.search(head) or XML_ENCODING_PATTERN.search(head)
+    encoding = valid_encoding(match.group(1)) if match else None
+    if encoding:
+        return encoding
+
+    sample = body[:DETECTION_SAMPLE_BYTES]
+    try:
+        # The sample may end inside a multi-byte character
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        if e.start >= len(sample) - 3:
+            return "utf-8"
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(sample).best()
+        return valid_encoding(best.encoding) if best else "windows-1252"
+    except ImportError:
+        return "windows-1252"
+
+
+def fetch_html(url, session=None, max_bytes=DEFAULT_MAX_BYTES, content_types=HTML_CONTENT_TYPES,
+               scraper=None, **kwargs):
+    """
+    Streams an HTML page.
+
+    Parameters:
+        url (str): Page URL.
+        session (requests.Session): Session to reuse connections with (module-level requests if None).
+        max_bytes (int): Body bytes read at most; the rest of the page is not downloaded.
+        content_types (tuple): Accepted media types; a response without Content-Type is accepted.
+        scraper (str): Label of the bytes_fetched / content_type_skipped / truncated_pages counters.
+        **kwargs: Passed to `get` (headers, timeout, verify, allow_redirects, ...).
+
+    Returns:
+        Page: The page; its text is None when the content type is not accepted.
+
+    Raises:
+        requests.RequestException: On connection errors and timeouts, as `requests.get` does.
+    """
+    labels = {"scraper": scraper} if scraper else {}
+    with (session or requests).get(url, stream=True, **kwargs) as response:
+        content_type = response.headers.get("Content-Type", "")
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type and media_type not in content_types:
+            inc("content_type_skipped", **labels)
+            return Page(response)
+
+        chunks, size, truncated = [], 0, False
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_bytes:
+                truncated = True
+                break
+        body = b"".join(chunks)[:max_bytes]
+
+    inc("bytes_fetched", len(body), **labels)
+    if truncated:
+        inc("truncated_pages", **labels)
+    encoding = detect_encoding(content_type, body)
+    return Page(response, body.decode(encoding, errors="replace"), encoding, truncated, len(body))
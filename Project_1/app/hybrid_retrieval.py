@@ -0,0 +1,144 @@
+from typing import Any, Callable, List, Optional
+import numpy as np
+from pydantic import Field
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.documents import Document
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from bm25 import reciprocal_rank_fusion
+from metrics import timer
+from request_cache import LRUCache
+
+# Query embeddings and fused rankings kept per retriever (i.e. per index version)
+QUERY_CACHE_SIZE = 1024
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Fuses dense FAISS results with BM25 results over the cleaned text using reciprocal rank fusion.
+
+    Document ids are positions in the FAISS index, which is built in the same order as the
+    BM25 index. Queries naming a rare identifier ("WisdomNext", "ISO20022") are prefiltered
+    lexically: only documents containing it are scored, both by BM25 and by vector distance.
+
+    Query embeddings and rankings are cached per retriever, so a refreshed index (a new
+    retriever) never serves rankings of the previous version.
+    """
+
+    vector_store: Any
+    bm25: Any
+    clean_query: Callable[[str], str]
+    k: int = 3
+    fetch_k: int = 20
+    version: Optional[str] = None
+    embedding_cache: Any = Field(default_factory=lambda: LRUCache(QUERY_CACHE_SIZE, name="query_embedding"))
+    ranking_cache: Any = Field(default_factory=lambda: LRUCache(QUERY_CACHE_SIZE, name="ranking"))
+
+    def document(self, doc_id):
+        """Returns the stored document at a FAISS position."""
+        docstore_id = self.vector_store.index_to_docstore_id[doc_id]
+        return self.vector_store.docstore.search(docstore_id)
+
+    def embed_queries(self, queries):
+        """Query embeddings as one float32 matrix; queries not in the cache are embedded in a single model call."""
+        vectors = [self.embedding_cache.get(query) for query in queries]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = self.vector_store.embeddings.embed_documents([queries[i] for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+                self.embedding_cache.put(queries[i], vectors[i])
+        return np.stack(vectors)
+
+    def dense_ranking(self, query, candidates=None, query_vector=None):
+        """FAISS positions ordered by vector distance, optionally restricted to candidate positions."""
+        if query_vector is None:
+            query_vector = self.embed_queries([query])
+        if candidates is None:
+            _, positions = self.vector_store.index.search(query_vector, self.fetch_k)
+            return [int(pos) for pos in positions[0] if pos >= 0]
+
+        # Few candidates: compare against their stored vectors directly instead of searching the index
+        positions = sorted(candidates)
+        vectors = np.stack([self.vector_store.index.reconstruct(pos) for pos in positions])
+        distances = ((vectors - query_vector) ** 2).sum(axis=1)
+        return [positions[i] for i in np.argsort(distances)[:self.fetch_k]]
+
+    def ranked(self, query):
+        """Fused (FAISS position, RRF score) pairs for a query, best first."""
+        return self.ranked_batch([query])[0]
+
+    def ranked_batch(self, queries, k=None):
+        """
+        Fused rankings for several queries at once: one embedding call for all of them and
+        one FAISS search for those without an exact-term prefilter. Rankings already in the
+        cache are not recomputed.
+
+        Returns:
+            list: One list of (FAISS position, RRF score) pairs per query, best first.
+        """
+        k = k or self.k
+        results = [self.ranking_cache.get((query, k)) for query in queries]
+        missing = [i for i, ranked in enumerate(results) if ranked is None]
+        if missing:
+            computed = self._rank_batch([queries[i] for i in missing], k)
+            for i, ranked in zip(missing, computed):
+                results[i] = ranked
+                self.ranking_cache.put((queries[i], k), ranked)
+        return results
+
+    def _rank_batch(self, queries, k):
+        query_vectors = self.embed_queries(queries)
+        plans = []
+        for query in queries:
+            tokens = self.clean_query(query).split()
+            plans.append((tokens, self.bm25.exact_term_candidates(query, tokens)))
+
+        unfiltered = [i for i, (_, candidates) in enumerate(plans) if candidates is None]
+        dense = {}
+        if unfiltered:
+            _, positions = self.vector_store.index.search(query_vectors[unfiltered], self.fetch_k)
+            for i, row in zip(unfiltered, positions):
+                dense[i] = [int(pos) for pos in row if pos >= 0]
+
+        results = []
+        for i, (query, (tokens, candidates)) in enumerate(zip(queries, plans)):
+            if candidates is not None and not candidates:
+                results.append([])
+                continue
+            if i not in dense:
+                dense[i] = self.dense_ranking(query, candidates, query_vectors[i:i + 1])
+            lexical = [doc_id for doc_id, _ in self.bm25.search(tokens, self.fetch_k, candidates)]
+            results.append(reciprocal_rank_fusion([dense[i], lexical], with_scores=True)[:k])
+        return results
+
+    def ranked_ids(self, query):
+        """Fused FAISS positions for a query, best first."""
+        return [doc_id for doc_id, _ in self.ranked(query)]
+
+    def scored_documents(self, ranked):
+        """Stored documents for (FAISS position, score) pairs, with the score in their metadata."""
+        documents = []
+        for doc_id, score in ranked:
+            doc = self.document(doc_id)
+            documents.append(Document(page_content=doc.page_content, metadata={**doc.metadata, "score": score}))
+        return documents
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        with timer("retrieval_seconds"):
+            ranked = self.ranked(query)
+        return self.scored_documents(ranked)
+
+
+class RemoteRetriever(BaseRetriever):
+    """
+    Thin retriever for the dashboard: queries a shared retrieval service (`retrieval_service.py`)
+    instead of holding the embedding model and indexes in every Streamlit process.
+    """
+
+    client: Any
+    k: int = 3
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        with timer("retrieval_seconds"):
+            results = self.client.search(query, self.k)
+        return [Document(page_content=doc["page_content"], metadata=doc["metadata"]) for doc in results]
@@ -0,0 +1,406 @@
+import os
+import math
+import json
+import time
+import shutil
+import hashlib
+from functools import lru_cache
+from metrics import inc, timer, timed
+from pdf_ingestion import pdf_sources
+
+# Each build is published to its own version directory under INDEX_ROOT; the CURRENT file
+# names the version in use and is replaced atomically, so a running dashboard never reads
+# a half-written index and can swap to a new version without a restart.
+INDEX_ROOT = 'data/index'
+STAGING_DIR = os.path.join(INDEX_ROOT, 'staging')
+CURRENT_FILE = os.path.join(INDEX_ROOT, 'CURRENT')
+KEEP_VERSIONS = 2
+SOURCE_FILES = ['data/jobs_data.csv', 'data/genai_company_articles.csv', 'data/google_news.csv']
+
+# FAISS index type: 'flat' (exact), 'hnsw', 'ivf_flat', 'ivf_sq8', 'ivf_pq', or 'auto' to pick by corpus size.
+# `python benchmark_ann.py` compares their recall, latency and memory on the staged vectors.
+INDEX_TYPE = os.getenv('INDEX_TYPE', 'auto')
+INDEX_TYPES = ('flat', 'hnsw', 'ivf_flat', 'ivf_sq8', 'ivf_pq')
+
+
+def fingerprint(paths):
+    """
+    Content hash of a set of files; a missing file hashes differently from any content.
+
+    Parameters:
+        paths (list): File paths.
+
+    Returns:
+        str: Hex sha256 digest.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode('utf-8'))
+        if not os.path.exists(path):
+            digest.update(b'<missing>')
+            continue
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_embeddings():
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(
+        model_name="all-MiniLM-L6-v2",
+        model_kwargs={'device': 'cpu'}
+    )
+
+
+def choose_index_type(n_vectors):
+    """
+    Index type for a corpus size: exact search while it is cheap, then HNSW, then IVF with
+    quantized vectors once float32 vectors plus a graph would take too much RAM.
+    """
+    if n_vectors < 20_000:
+        return 'flat'
+    if n_vectors < 200_000:
+        return 'hnsw'
+    if n_vectors < 1_000_000:
+        return 'ivf_sq8'
+    return 'ivf_pq'
+
+
+def build_faiss_index(vectors, index_type='auto', nlist=None, nprobe=None, ef_search=64):
+    """
+    Builds (and for IVF types trains) a FAISS index over float32 vectors, L2 distance.
+
+    Parameters:
+        vectors (np.ndarray): (n, d) float32 matrix; row i gets id i.
+        index_type (str): One of INDEX_TYPES, or 'auto'.
+        nlist (int): IVF cells; defaults to about 4 * sqrt(n).
+        nprobe (int): IVF cells visited per query; defaults to nlist / 16 (at least 8).
+        ef_search (int): HNSW candidate list size per query.
+
+    Returns:
+        faiss.Index: The filled index.
+    """
+    import faiss
+
+    n, d = vectors.shape
+    if index_type == 'auto':
+        index_type = choose_index_type(n)
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {index_type!r}; expected one of {', '.join(INDEX_TYPES)} or 'auto'")
+
+    if index_type == 'flat':
+        index = faiss.IndexFlatL2(d)
+    elif index_type == 'hnsw':
+        index = faiss.IndexHNSWFlat(d, 32)
+        index.hnsw.efConstruction = 80
+        index.hnsw.efSearch = ef_search
+    else:
+        # FAISS wants ~39 training points per cell
+        nlist = max(1, min(nlist or int(4 * math.sqrt(n)), n // 39))
+        quantizer = faiss.IndexFlatL2(d)
+        if index_type == 'ivf_flat':
+            index = faiss.IndexIVFFlat(quantizer, d, nlist)
+        elif index_type == 'ivf_sq8':
+            index = faiss.IndexIVFScalarQuantizer(quantizer, d, nlist, faiss.ScalarQuantizer.QT_8bit)
+        else:
+            # 4-dimensional sub-vectors, 1 byte each: 96 bytes per MiniLM vector instead of 1536
+            m = max(m for m in range(1, d // 4 + 1) if d % m == 0)
+            index = faiss.IndexIVFPQ(quantizer, d, nlist, m, 8)
+        with timer("index_train_seconds", index_type=index_type):
+            index.train(vectors)
+        index.nprobe = min(nlist, nprobe or max(8, nlist // 16))
+
+    index.add(vectors)
+    if index_type.startswith('ivf'):
+        index.make_direct_map()  # HybridRetriever reconstructs candidate vectors by id
+    return index
+
+
+class CompactDocstore:
+    """
+    Read-only docstore of a published index: the document texts in one list, looked up by
+    FAISS position. Documents are created on lookup, so a loaded index holds one string per
+    document instead of a Document with its own metadata dict and a uuid mapping.
+    """
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+
+    def search(self, search):
+        from langchain_core.documents import Document
+
+        return Document(page_content=self.texts[search], metadata={"doc_id": search})
+
+
+def record_text(item, limit=1000):
+    """Stored text of a record: its dict repr without missing values or the cleaned copy (BM25 has that)"""
+    import pandas as pd
+
+    fields = {key: value for key, value in item.items() if not key.startswith('Cleaned ') and not pd.isna(value)}
+    return str(fields)[:limit]
+
+
+def source_files():
+    """The CSVs and the PDFs (of pdf_ingestion.PDF_SOURCES) the index is built from"""
+    return SOURCE_FILES + [path for _, paths in pdf_sources() for path in paths]
+
+
+def iter_records(frames):
+    """Rows of the frames as dicts, one at a time"""
+    for df in frames:
+        columns = list(df.columns)
+        for row in df.itertuples(index=False, name=None):
+            yield dict(zip(columns, row))
+
+
+def load_and_preprocess_data():
+    import pandas as pd
+    from utils import clean_company_name, preprocess_text, impute_missing_content, compact_dataframe
+
+    jobs_df = pd.read_csv('data/jobs_data.csv')
+    articles_df = pd.read_csv('data/genai_company_articles.csv')
+    news_df = pd.read_csv('data/google_news.csv')
+
+    jobs_df = clean_company_name(jobs_df)
+    jobs_df = preprocess_text(jobs_df, "Content")
+    articles_df = preprocess_text(articles_df, "Content")
+    news_df = impute_missing_content(news_df)
+    news_df = preprocess_text(news_df, 'Content')
+
+    return compact_dataframe(jobs_df), compact_dataframe(articles_df), compact_dataframe(news_df)
+
+
+def stage_pdf_chunks(f):
+    """Writes the chunks of the PDFs of PDF_SOURCES as staged documents; returns how many"""
+    from utils import get_text_cleaner
+    from pdf_ingestion import iter_pdf_chunks
+
+    sources = [(company, paths) for company, paths in pdf_sources() if paths]
+    files = sum(len(paths) for _, paths in sources)
+    if not files:
+        return 0
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        print(f"pypdf is not installed; skipping {files} PDF files")
+        return 0
+
+    clean_text = get_text_cleaner()
+    staged = 0
+    for company, paths in sources:
+        for chunk in iter_pdf_chunks(paths, company=company):
+            item = {key: value for key, value in chunk.items() if value is not None}
+            # Chunks are already at most CHUNK_CHARS long, so the stored text keeps the whole chunk
+            f.write(json.dumps({"text": record_text(item, limit=None), "cleaned": clean_text(chunk["Content"])}) + "\n")
+            staged += 1
+    if staged:
+        print(f"Staged {staged} chunks from {files} PDF files")
+    return staged
+
+
+@timed("clean_stage_seconds")
+def prepare_documents(staging_dir=STAGING_DIR):
+    """
+    Clean stage: preprocesses the source CSVs, collapses near-duplicates and stages the
+    documents to embed with their cleaned text (for BM25) in `documents.jsonl`, followed by
+    the page-level chunks of the PDFs under PDF_DIR, streamed as they are extracted.
+
+    Returns:
+        int: Number of staged documents.
+    """
+    from dedup import find_near_duplicates
+
+    sources = fingerprint(source_files())
+    jobs_df, articles_df, news_df = load_and_preprocess_data()
+    # Records are generated row by row from the compact frames rather than held as lists of dicts
+    frames = [news_df, jobs_df, articles_df]
+
+    # Collapse near-duplicate content (syndicated news, copy-pasted job ads) before embedding
+    clusters = find_near_duplicates(content for df in frames for content in df['Content'])
+    duplicates = {pos for cluster in clusters for pos in cluster[1:]}
+    if clusters:
+        print(f"Collapsed {len(duplicates)} near-duplicate records in {len(clusters)} clusters before embedding")
+
+    os.makedirs(staging_dir, exist_ok=True)
+    tmp_path = os.path.join(staging_dir, 'documents.jsonl.tmp')
+    staged = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for pos, item in enumerate(iter_records(frames)):
+            if pos in duplicates:
+                continue
+            cleaned = item.get('Cleaned Content')
+            f.write(json.dumps({"text": record_text(item), "cleaned": cleaned if isinstance(cleaned, str) else ""}) + "\n")
+            staged += 1
+        staged += stage_pdf_chunks(f)
+    os.replace(tmp_path, os.path.join(staging_dir, 'documents.jsonl'))
+    with open(os.path.join(staging_dir, 'sources.json'), 'w') as f:
+        json.dump({"sources": sources}, f)
+
+    return staged
+
+
+def read_documents(staging_dir=STAGING_DIR):
+    """Staged documents and their cleaned texts, in index order"""
+    documents, cleaned = [], []
+    with open(os.path.join(staging_dir, 'documents.jsonl'), encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            documents.append(entry["text"])
+            cleaned.append(entry["cleaned"])
+    return documents, cleaned
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+@timed("embed_stage_seconds")
+def embed_documents(embeddings, staging_dir=STAGING_DIR):
+    """
+    Embed stage: embeds the staged documents into `vectors.npy`, reusing the vectors of
+    documents that an earlier run already embedded, so a refresh only embeds new text.
+
+    Returns:
+        int: Number of documents actually embedded.
+    """
+    import numpy as np
+
+    documents, _ = read_documents(staging_dir)
+    hashes = [text_hash(text) for text in documents]
+
+    vectors_path = os.path.join(staging_dir, 'vectors.npy')
+    hashes_path = os.path.join(staging_dir, 'vector_hashes.json')
+    known = {}
+    if os.path.exists(vectors_path) and os.path.exists(hashes_path):
+        with open(hashes_path) as f:
+            known = dict(zip(json.load(f), np.load(vectors_path)))
+
+    missing = [i for i, h in enumerate(hashes) if h not in known]
+    with timer("embed_seconds"):
+        new_vectors = embeddings.embed_documents([documents[i] for i in missing]) if missing else []
+    for i, vector in zip(missing, new_vectors):
+        known[hashes[i]] = np.asarray(vector, dtype=np.float32)
+    inc("rows_embedded", len(missing))
+    inc("embedding_cache_hits", len(documents) - len(missing))
+
+    vectors = np.stack([known[h] for h in hashes]).astype(np.float32) if hashes else np.zeros((0, 0), dtype=np.float32)
+    with open(vectors_path + '.tmp', 'wb') as f:
+        np.save(f, vectors)
+    os.replace(vectors_path + '.tmp', vectors_path)
+    with open(hashes_path, 'w') as f:
+        json.dump(hashes, f)
+
+    return len(missing)
+
+
+@timed("index_stage_seconds")
+def publish_indexes(embeddings, staging_dir=STAGING_DIR, index_type=INDEX_TYPE):
+    """
+    Index stage: builds the FAISS (of `index_type`) and BM25 indexes from the staged documents
+    and vectors into a new version directory, then makes it current.
+
+    Returns:
+        tuple: (vector_store, bm25) of the published version.
+    """
+    import numpy as np
+    from bm25 import BM25Index
+    from langchain_community.vectorstores import FAISS
+
+    documents, cleaned = read_documents(staging_dir)
+    vectors = np.load(os.path.join(staging_dir, 'vectors.npy'))
+    with open(os.path.join(staging_dir, 'sources.json')) as f:
+        sources = json.load(f)["sources"]
+
+    # Document ids are positions, shared by both indexes
+    if index_type == 'auto':
+        index_type = choose_index_type(len(documents))
+    index = build_faiss_index(vectors, index_type)
+    vector_store = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=CompactDocstore(documents),
+        index_to_docstore_id=list(range(len(documents))),
+    )
+    bm25 = BM25Index.from_texts(cleaned)
+
+    version = time.strftime('%Y%m%d-%H%M%S') + '-' + fingerprint([os.path.join(staging_dir, 'vectors.npy')])[:8]
+    version_dir = os.path.join(INDEX_ROOT, version)
+    vector_store.save_local(version_dir)
+    bm25.save(os.path.join(version_dir, 'bm25.pkl'))
+    with open(os.path.join(version_dir, 'manifest.json'), 'w') as f:
+        json.dump({"version": version, "sources": sources, "documents": len(documents), "index_type": index_type}, f)
+
+    with open(CURRENT_FILE + '.tmp', 'w') as f:
+        f.write(version)
+    os.replace(CURRENT_FILE + '.tmp', CURRENT_FILE)
+    prune_versions(keep=KEEP_VERSIONS)
+
+    return vector_store, bm25
+
+
+def prune_versions(keep=KEEP_VERSIONS):
+    """Deletes all but the newest `keep` version directories (never the current one)"""
+    current = index_version()
+    versions = sorted(name for name in os.listdir(INDEX_ROOT)
+                      if os.path.isdir(os.path.join(INDEX_ROOT, name)) and name != os.path.basename(STAGING_DIR))
+    for name in versions[:-keep]:
+        if name != current:
+            shutil.rmtree(os.path.join(INDEX_ROOT, name), ignore_errors=True)
+
+
+def index_version():
+    """Name of the current index version, or None if no index was published yet"""
+    try:
+        with open(CURRENT_FILE) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+@timed("load_indexes_seconds")
+def load_indexes(embeddings, version=None, allow_stale=False):
+    """
+    Loads a published index version (the current one by default).
+
+    Parameters:
+        allow_stale (bool): Also load an index built from source files that have changed
+            since (e.g. while a refresh is still running), with a warning.
+
+    Returns:
+        tuple: (vector_store, bm25), or None if there is no (usable) index.
+    """
+    import faiss
+    from bm25 import BM25Index
+    from langchain_community.vectorstores import FAISS
+
+    version = version or index_version()
+    if version is None:
+        return None
+    version_dir = os.path.join(INDEX_ROOT, version)
+    try:
+        with open(os.path.join(version_dir, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except OSError:
+        return None
+    if manifest["sources"] != fingerprint(source_files()):
+        if not allow_stale:
+            return None
+        print(f"Index {version} was built from older data; run refresh.py to update it")
+
+    # Only files written by publish_indexes are unpickled
+    vector_store = FAISS.load_local(version_dir, embeddings, allow_dangerous_deserialization=True)
+    ivf = faiss.try_extract_index_ivf(vector_store.index)
+    if ivf is not None:
+        ivf.make_direct_map()  # HybridRetriever reconstructs candidate vectors by id
+    return vector_store, BM25Index.load(os.path.join(version_dir, 'bm25.pkl'))
+
+
+@timed("build_indexes_seconds")
+def build_indexes(embeddings):
+    """Runs the clean, embed and index stages in one go and returns the published (vector_store, bm25)"""
+    prepare_documents()
+    embed_documents(embeddings)
+    return publish_indexes(embeddings)
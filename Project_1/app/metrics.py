@@ -0,0 +1,236 @@
+"""
+Pipeline-wide timing and counters.
+
+Scrapers, preprocessing, indexing and the dashboard record into one process-wide
+registry; each script run appends a JSON line with its counters and timing
+histograms to data/metrics/runs.jsonl, and setting METRICS_PORT also serves the
+registry in the Prometheus text format at http://localhost:<port>/metrics (on loopback
+unless METRICS_HOST is set, e.g. to 0.0.0.0 for a Prometheus server on another machine).
+`python metrics.py` ranks the timings of the latest runs by total time.
+
+    from metrics import inc, timer, timed, run
+
+    with run("webpage_scraper"):
+        with timer("fetch_seconds", scraper="webpage"):
+            ...
+        inc("pages_fetched", scraper="webpage")
+"""
+import os
+import json
+import time
+import argparse
+import bisect
+import threading
+from functools import wraps
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+RUNS_PATH = "data/metrics/runs.jsonl"
+# Interface the /metrics endpoint listens on
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Upper bounds (seconds) of the Prometheus histogram buckets
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300]
+
+# Observations kept per histogram for the percentiles in the run summary
+MAX_SAMPLES = 100000
+
+
+def metric_key(name, labels):
+    """Prometheus-style series name, e.g. pages_fetched{scraper="webpage"}"""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and histograms, keyed by name and labels.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        """Adds `value` to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Records one observation (e.g. a duration in seconds) in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.setdefault(
+                key, {"count": 0, "sum": 0.0, "max": 0.0, "samples": [], "buckets": [0] * len(BUCKETS)})
+            # Bucket counts cover every observation, also beyond MAX_SAMPLES
+            bucket = bisect.bisect_left(BUCKETS, value)
+            if bucket < len(BUCKETS):
+                histogram["buckets"][bucket] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+            histogram["max"] = max(histogram["max"], value)
+            if len(histogram["samples"]) < MAX_SAMPLES:
+                histogram["samples"].append(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Times the enclosed block into the histogram `name`, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        """Decorator timing every call of a function into the histogram `name`."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """
+        Current values as plain data.
+
+        Returns:
+            dict: {"counters": {series: value}, "histograms": {series: {count, sum, mean, p50, p95, max}}}
+        """
+        with self.lock:
+            counters = {metric_key(name, dict(labels)): value for (name, labels), value in self.counters.items()}
+            histograms = {}
+            for (name, labels), histogram in self.histograms.items():
+                samples = histogram["samples"]
+                histograms[metric_key(name, dict(labels))] = {
+                    "count": histogram["count"],
+                    "sum": round(histogram["sum"], 6),
+                    "mean": round(histogram["sum"] / histogram["count"], 6),
+                    "p50": round(percentile(samples, 0.5), 6),
+                    "p95": round(percentile(samples, 0.95), 6),
+                    "max": round(histogram["max"], 6),
+                }
+        return {"counters": counters, "histograms": histograms}
+
+    def prometheus_text(self):
+        """The registry in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (series, labels), value in self.counters.items():
+                    if series == name:
+                        lines.append(f"{metric_key(name, dict(labels))} {value}")
+
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (series, labels), histogram in self.histograms.items():
+                    if series != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, histogram["buckets"]):
+                        cumulative += count
+                        lines.append(f"{metric_key(name + '_bucket', {**dict(labels), 'le': bound})} {cumulative}")
+                    lines.append(f"{metric_key(name + '_bucket', {**dict(labels), 'le': '+Inf'})} {histogram['count']}")
+                    lines.append(f"{metric_key(name + '_sum', dict(labels))} {histogram['sum']}")
+                    lines.append(f"{metric_key(name + '_count', dict(labels))} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+METRICS = Metrics()
+inc = METRICS.inc
+observe = METRICS.observe
+timer = METRICS.timer
+timed = METRICS.timed
+
+
+def write_run(name, started, status="ok", path=RUNS_PATH, registry=METRICS):
+    """Appends one JSON line summarising the registry for a run."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    line = {"run": name, "started": round(started, 3), "duration_seconds": round(time.time() - started, 3),
+            "status": status, **registry.snapshot()}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(line) + "\n")
+    return line
+
+
+@contextmanager
+def run(name, path=RUNS_PATH, registry=METRICS):
+    """
+    Wraps a script run: serves /metrics when METRICS_PORT is set and writes the
+    run summary to `path` when the block exits, whether or not it failed.
+    """
+    if os.getenv("METRICS_PORT"):
+        serve(int(os.getenv("METRICS_PORT")), registry)
+    started = time.time()
+    status = "error"
+    try:
+        yield registry
+        status = "ok"
+    finally:
+        write_run(name, started, status, path, registry)
+
+
+_servers = {}
+
+
+def serve(port, registry=METRICS, host=METRICS_HOST):
+    """Starts (once per port) a background HTTP server exposing the registry at /metrics on `host`."""
+    if port in _servers:
+        return _servers[port]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+    _servers[port] = server
+    return server
+
+
+def print_bottlenecks(path=RUNS_PATH, last=1):
+    """Prints the timing histograms of the last runs in `path`, largest total time first."""
+    with open(path, encoding="utf-8") as f:
+        runs = [json.loads(line) for line in f if line.strip()][-last:]
+    for line in runs:
+        print(f"{line['run']} ({line['status']}, {line['duration_seconds']:.1f} s)")
+        ranked = sorted(line["histograms"].items(), key=lambda item: item[1]["sum"], reverse=True)
+        for series, histogram in ranked:
+            print(f"  {series:50s} {histogram['sum']:10.3f} s total  {histogram['count']:7d} calls  "
+                  f"p50 {histogram['p50'] * 1000:9.1f} ms  p95 {histogram['p95'] * 1000:9.1f} ms")
+        for series, value in sorted(line["counters"].items()):
+            print(f"  {series:50s} {value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show where the time went in recent pipeline runs.")
+    parser.add_argument("--path", default=RUNS_PATH, help="Run log written by the scrapers and the dashboard")
+    parser.add_argument("--last", type=int, default=1, help="Number of most recent runs to show")
+    args = parser.parse_args()
+    print_bottlenecks(args.path, args.last)
@@ -0,0 +1,72 @@
+"""
+Archive of the news articles collected by the Google News scraper and the feed ingester.
+
+Every run appends its new articles to one JSONL archive and records their links as
+watermarks per query; `data/google_news.csv` is then rebuilt from the archive, so both
+collectors can run (and be re-run incrementally) without overwriting each other's articles.
+"""
+import os
+import csv
+import json
+from record_sink import open_sink, JsonlSink
+from metrics import inc
+
+FIELDNAMES = ["Company", "Location", "Headline", "Source", "Content", "Link"]
+WATERMARKS_PATH = "data/.crawl/google_news_watermarks.json"
+# Every article collected so far; the output file is rebuilt from it after each run
+ARCHIVE_PATH = "data/.crawl/google_news_archive.jsonl"
+
+
+def query_key(company, keyword, location):
+    """
+    Watermark key of a company/keyword/location search, shared by both collectors so each
+    skips the links the other already collected (it is the Google News scraper's query).
+    """
+    return f"{company} + Generative AI + {keyword} + {location}"
+
+
+def seed_archive(output_file, archive_path=ARCHIVE_PATH):
+    """Starts the archive from an output file written before incremental crawling existed"""
+    if os.path.exists(archive_path) or not os.path.exists(output_file):
+        return
+    if not output_file.endswith((".csv", ".jsonl")):
+        print(f"Cannot carry {output_file} over into the archive; only new articles will be saved")
+        return
+    with open(output_file, newline="", encoding="utf-8") as f, JsonlSink(archive_path, mode="a") as archive:
+        rows = csv.DictReader(f) if output_file.endswith(".csv") else (json.loads(line) for line in f)
+        for row in rows:
+            archive.write({field: row.get(field) for field in FIELDNAMES})
+
+
+def record_key(record):
+    """An article is one link found for one company and location; a link can match several"""
+    return record.get("Company"), record.get("Location"), record["Link"]
+
+
+def archived_records(archive_path=ARCHIVE_PATH):
+    """Yields the archived articles, keeping the latest version of each company/location/link"""
+    latest = {}
+    with open(archive_path, encoding="utf-8") as f:
+        for position, line in enumerate(f):
+            latest[record_key(json.loads(line))] = position
+    with open(archive_path, encoding="utf-8") as f:
+        for position, line in enumerate(f):
+            record = json.loads(line)
+            if latest[record_key(record)] == position:
+                yield record
+
+
+def write_output(output_file, archive_path=ARCHIVE_PATH, scraper="google_news"):
+    """
+    Streams every archived article into the output file (.csv, .jsonl or .parquet).
+
+    Returns:
+        int: Number of articles written.
+    """
+    if not os.path.exists(archive_path):
+        return 0
+    with open_sink(output_file, FIELDNAMES) as sink:
+        for record in archived_records(archive_path):
+            sink.write(record)
+            inc("rows_written", scraper=scraper)
+    return sink.count
@@ -0,0 +1,246 @@
+"""
+Feed-based news collection: reads Google News RSS search feeds (or any RSS/Atom feed)
+instead of driving google.com in a browser like `google_news_scraper.py`.
+
+Feeds are parsed while they stream in and many queries run at once over one pooled HTTP
+session. Records have the scraper's Company/Location/Headline/Source/Content/Link fields,
+with the feed's summary as Content, and go to the same archive and output file (see
+`news_archive.py`); links either collector already has are skipped.
+
+Article pages can be fetched for their text (`--fetch-content`), for links no earlier run
+collected. Google News feed links all point at news.google.com redirect pages, so those
+fetches are spaced `--delay` seconds apart whatever the number of workers, and a redirect
+page that does not lead to the article leaves the summary in place.
+
+    python news_feed_ingester.py
+    python news_feed_ingester.py --feed-url "http://127.0.0.1:8765/rss/search?q={query}"   # fixture feeds
+"""
+import os
+import time
+import argparse
+from urllib.parse import quote_plus, urljoin, urlparse
+from xml.etree.ElementTree import XMLPullParser, ParseError
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+from crawl_state import LinkWatermarks
+from record_sink import JsonlSink
+from news_archive import WATERMARKS_PATH, ARCHIVE_PATH, query_key, seed_archive, write_output
+from politeness import DomainThrottle
+from metrics import inc, observe, timer, run
+from http_fetch import fetch_html
+
+NEWS_FEED_URL = "https://news.google.com/rss/search?q={query}&hl=en-{region}&gl={region}&ceid={region}:en"
+REGIONS = {"India": "IN", "Australia": "AU"}
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+CHUNK_SIZE = 16 * 1024
+# Hosts serving redirect pages rather than articles; text of a page still on them is not used
+AGGREGATOR_HOSTS = {"news.google.com"}
+
+
+def local_name(tag):
+    """Tag without its XML namespace, e.g. '{http://www.w3.org/2005/Atom}entry' -> 'entry'"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def feed_entry(element):
+    """
+    Reads an RSS <item> or Atom <entry> element.
+
+    Returns:
+        dict: title, link, source and summary (HTML stripped) of the entry.
+    """
+    entry = {"title": "", "link": "", "source": "", "summary": ""}
+    for child in element:
+        name = local_name(child.tag)
+        text = (child.text or "").strip()
+        if name == "title":
+            entry["title"] = text
+        elif name == "link":
+            # RSS has the URL as text, Atom in href (the "alternate" link is the article)
+            if text:
+                entry["link"] = text
+            elif child.get("rel", "alternate") == "alternate":
+                entry["link"] = child.get("href", "")
+        elif name in ("description", "summary", "content") and not entry["summary"]:
+            entry["summary"] = BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
+        elif name == "source":
+            entry["source"] = text or "".join(child.itertext()).strip()
+        elif name == "author" and not entry["source"]:
+            entry["source"] = "".join(child.itertext()).strip()
+    # Google News titles end with " - <source>"
+    suffix = f" - {entry['source']}"
+    if entry["source"] and entry["title"].endswith(suffix):
+        entry["title"] = entry["title"][:-len(suffix)]
+    return entry
+
+
+def parse_feed(chunks):
+    """
+    Parses an RSS or Atom feed incrementally, yielding entries as soon as they are complete.
+
+    Parameters:
+        chunks (iterable): Bytes of the feed, e.g. `response.iter_content(...)`.
+
+    Yields:
+        dict: One entry per <item> / <entry> (see `feed_entry`).
+    """
+    parser = XMLPullParser(events=("end",))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if local_name(element.tag) in ("item", "entry"):
+                yield feed_entry(element)
+                element.clear()  # Entries already yielded are not kept in the tree
+    parser.close()
+
+
+def make_session(pool_size):
+    """HTTP session keeping up to `pool_size` connections open per host for the worker threads"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def fetch_feed(session, url, timeout=15):
+    """
+    Streams one feed.
+
+    Returns:
+        list: Its entries with absolute links; empty if the feed could not be fetched or parsed.
+    """
+    try:
+        with timer("fetch_seconds", scraper="news_feed"):
+            with session.get(url, stream=True, timeout=timeout) as response:
+                if response.status_code != 200:
+                    print(f"Feed error {response.status_code} for {url}")
+                    inc("fetch_errors", scraper="news_feed")
+                    return []
+                entries = list(parse_feed(response.iter_content(CHUNK_SIZE)))
+    except (requests.RequestException, ParseError) as e:
+        print(f"Error reading feed {url}: {e}")
+        inc("fetch_errors", scraper="news_feed")
+        return []
+    inc("feeds_fetched", scraper="news_feed")
+    observe("feed_entries", len(entries), scraper="news_feed")
+    for entry in entries:
+        entry["link"] = urljoin(url, entry["link"])
+    return entries
+
+
+def article_text(session, url, throttle):
+    """Paragraph text of an article page, or "" if it cannot be fetched"""
+    throttle.wait(urlparse(url).netloc)
+    try:
+        with timer("fetch_seconds", scraper="news_feed"):
+            page = fetch_html(url, session=session, timeout=10, scraper="news_feed")
+        inc("pages_fetched", scraper="news_feed")
+    except requests.RequestException as e:
+        print(f"Error fetching article {url}: {e}")
+        inc("fetch_errors", scraper="news_feed")
+        return ""
+    if page.status_code != 200 or page.text is None:
+        return ""
+    if urlparse(page.response.url).netloc in AGGREGATOR_HOSTS:
+        inc("redirect_pages", scraper="news_feed")
+        return ""
+    soup = BeautifulSoup(page.text, "html.parser")
+    return " ".join(p.get_text(" ", strip=True) for p in soup.find_all("p") if p.get_text(strip=True))
+
+
+def ingest_feeds(companies, locations, keywords, output_file="data/google_news.csv", feed_url=None,
+                 workers=16, fetch_content=False, full_depth=False, delay=1.0,
+                 watermarks_path=WATERMARKS_PATH, archive_path=ARCHIVE_PATH):
+    """
+    Collects news articles for every keyword x location x company query from search feeds.
+
+    Parameters:
+        companies (list): List of company names to search for.
+        locations (list): Locations searched; they pick the feed's edition (India -> IN).
+        keywords (list): List of keywords to include in the search query.
+        output_file (str): Where to save the articles (.csv, .jsonl or .parquet).
+        feed_url (str): Feed URL template with {query} and {region}; defaults to the
+            NEWS_FEED_URL environment variable, then Google News search feeds.
+        workers (int): Feeds and article pages fetched at the same time.
+        fetch_content (bool): Fetch article pages for their text instead of keeping the feed's
+            summary as Content. Requests to one host are spaced by `delay`, and all Google
+            News links are on news.google.com, so this runs at about one article per `delay`.
+        full_depth (bool): Fetch every article again, including links collected by earlier runs.
+        delay (float): Seconds between requests to the same article domain.
+        watermarks_path (str): JSON file of the links collected per query.
+        archive_path (str): JSONL file of every article collected so far.
+
+    Returns:
+        int: Number of news articles saved.
+    """
+    feed_url = feed_url or os.getenv("NEWS_FEED_URL", NEWS_FEED_URL)
+    watermarks = LinkWatermarks(watermarks_path)
+    seed_archive(output_file, archive_path)
+    session = make_session(workers)
+    throttle = DomainThrottle(delay)
+
+    # (company, location, watermark key, search text) per query
+    queries = [(company, location, query_key(company, keyword, location), f"{company} Generative AI {keyword} {location}")
+               for keyword in keywords for location in locations for company in companies]
+    urls = [feed_url.format(query=quote_plus(text), region=REGIONS.get(location, "US"))
+            for _, location, _, text in queries]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        feeds = list(executor.map(lambda url: fetch_feed(session, url), urls))
+
+        # One record per company, location and article; only new links are fetched
+        records, seen = {}, set()
+        for (company, location, query, _), entries in zip(queries, feeds):
+            for entry in entries:
+                key = (company, location, entry["link"])
+                if not entry["link"] or key in seen:
+                    continue
+                seen.add(key)
+                if not full_depth and watermarks.is_known(query, entry["link"]):
+                    inc("known_links_skipped", scraper="news_feed")
+                    continue
+                records[key] = (query, {"Company": company, "Location": location, "Headline": entry["title"],
+                                        "Source": entry["source"], "Content": entry["summary"],
+                                        "Link": entry["link"]})
+        print(f"{len(urls)} feeds, {len(seen)} entries, {len(records)} new articles")
+
+        if fetch_content:
+            links = sorted({link for _, _, link in records})
+            texts = dict(zip(links, executor.map(lambda link: article_text(session, link, throttle), links)))
+            for _, record in records.values():
+                record["Content"] = texts[record["Link"]] or record["Content"]
+
+    with JsonlSink(archive_path, mode="a") as archive:
+        for query, record in records.values():
+            archive.write(record)
+            watermarks.add(query, [record["Link"]])
+    watermarks.save()
+
+    return write_output(output_file, archive_path, scraper="news_feed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect GenAI news of IT companies from search feeds.")
+    parser.add_argument("--feed-url", default=None, help="Feed URL template with {query} and {region}")
+    parser.add_argument("--workers", type=int, default=16, help="Feeds and pages fetched at the same time")
+    parser.add_argument("--fetch-content", action="store_true",
+                        help="Fetch article pages instead of keeping the feed summaries (one per --delay on news.google.com)")
+    parser.add_argument("--full-depth", action="store_true", help="Fetch articles collected by earlier runs again")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds between requests to the same article domain")
+    args = parser.parse_args()
+
+    companies = ['Tata Consultancy Services', 'Infosys', 'Wipro', 'LTIMindtree', 'HCLTech', 'Tech Mahindra', 'Dell']
+    locations = ["India", "Australia"]
+    keywords = ['initiatives', 'investment', 'strategy']
+
+    start = time.perf_counter()
+    with run("news_feed_ingester"):
+        count = ingest_feeds(companies, locations, keywords, feed_url=args.feed_url, workers=args.workers,
+                             fetch_content=args.fetch_content, full_depth=args.full_depth, delay=args.delay)
+    print(f"Saved {count} news articles to data/google_news.csv in {time.perf_counter() - start:.1f} s")
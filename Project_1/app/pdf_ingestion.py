@@ -0,0 +1,227 @@
+"""
+PDF extraction for the corpus: white papers, one-pagers and reports saved next to the CSVs.
+
+Files are memory-mapped rather than read: the PDF parser seeks into the mapping and the
+operating system pages in only the parts it touches, shared between processes. Pages are
+extracted in parallel by a process pool, a range of pages per task, and come back as
+page-level text chunks in document order, so a large document is never held whole.
+
+    for chunk in iter_pdf_chunks(["data/pdfs/report.pdf"]):
+        chunk["Content"], chunk["Page"]
+
+    python pdf_ingestion.py ../../Project_2/data/*.pdf --output data/pdf_chunks.jsonl
+"""
+import os
+import re
+import mmap
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import inc, timer
+
+# PDFs under this directory go into the index; a sub-directory name is taken as the company
+PDF_DIR = 'data/pdfs'
+# Directories indexed by default, as "directory" or "directory=company" entries separated by
+# os.pathsep (without a company, it is the sub-directory below PDF_DIR). Project_2's data holds
+# the Dell one-pagers its notebook extracted with PyPDF2; directories that do not exist are skipped.
+PDF_SOURCES = os.getenv('PDF_SOURCES', os.pathsep.join([PDF_DIR, '../../Project_2/data=Dell']))
+CHUNK_CHARS = 1000
+PAGES_PER_TASK = 8
+
+_readers = {}
+
+
+def open_pdf(path):
+    """A PdfReader over a memory map of the file, cached per process"""
+    reader = _readers.get(path)
+    if reader is None:
+        from pypdf import PdfReader
+
+        with open(path, 'rb') as f:
+            # The mapping stays valid after the file is closed
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        reader = _readers[path] = PdfReader(mapped)
+    return reader
+
+
+def split_text(text, size=CHUNK_CHARS):
+    """
+    Splits a page's text into chunks of at most `size` characters, on paragraph breaks where
+    possible, then on sentence ends, then on spaces.
+
+    Returns:
+        list: The chunks, without empty ones.
+    """
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        while len(paragraph) > size:
+            cut = paragraph.rfind(". ", 0, size) + 1
+            if cut <= 0:
+                cut = paragraph.rfind(" ", 0, size)
+            if cut <= 0:
+                cut = size
+            pieces.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if paragraph:
+            pieces.append(paragraph)
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > size:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def extract_pages(path, start, stop, chunk_chars=CHUNK_CHARS):
+    """
+    Extracts pages [start, stop) of a PDF (run in a worker process).
+
+    Returns:
+        list: (page number from 1, list of text chunks) per page; unreadable pages have no chunks.
+    """
+    reader = open_pdf(path)
+    pages = []
+    for number in range(start, stop):
+        try:
+            text = reader.pages[number].extract_text() or ""
+        except Exception as e:
+            print(f"Error extracting page {number + 1} of {path}: {e}")
+            text = ""
+        pages.append((number + 1, split_text(text, chunk_chars)))
+    # The reader keeps every object it parsed (content streams included); drop them so a
+    # worker's memory does not grow with the pages it has extracted
+    reader.resolved_objects.clear()
+    return pages
+
+
+def page_count(path):
+    """Number of pages of a PDF; the mapping is closed again, so the caller keeps no file open"""
+    from pypdf import PdfReader
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return len(PdfReader(mapped).pages)
+
+
+def close_pdfs():
+    """Closes the memory maps of the readers cached in this process"""
+    while _readers:
+        _, reader = _readers.popitem()
+        reader.stream.close()
+
+
+def _extract_task(task):
+    return extract_pages(*task)
+
+
+def ordered_results(executor, tasks, window):
+    """Results of the tasks in order, with at most `window` tasks queued or waiting to be read"""
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(_extract_task, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_pdf_chunks(paths, workers=None, pages_per_task=PAGES_PER_TASK, chunk_chars=CHUNK_CHARS, company=None):
+    """
+    Streams the text chunks of PDF files, in file and page order.
+
+    Parameters:
+        paths (list): PDF files.
+        workers (int): Processes extracting pages (the number of CPUs if None); 1 extracts in this process.
+        pages_per_task (int): Pages a worker extracts per task.
+        chunk_chars (int): Longest chunk in characters.
+        company (str): Company recorded with the chunks; if None, the name of the file's
+            directory below PDF_DIR, if any.
+
+    Yields:
+        dict: Company, Title (file name), Page, Content and Link (`path#page=N`) of one chunk.
+    """
+    files = []
+    for path in paths:
+        try:
+            files.append((path, page_count(path)))
+        except Exception as e:
+            print(f"Cannot read {path}: {e}")
+            inc("parse_errors", scraper="pdf")
+    tasks = [(path, start, min(start + pages_per_task, count), chunk_chars)
+             for path, count in files for start in range(0, count, pages_per_task)]
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        # Two tasks per worker keep the pool busy without results piling up ahead of the reader
+        window = 2 * (workers or os.cpu_count() or 1)
+        results = ordered_results(executor, tasks, window) if executor else map(_extract_task, tasks)
+        for (path, _, _, _), pages in zip(tasks, results):
+            owner = company
+            if owner is None:
+                parent = os.path.relpath(os.path.dirname(os.path.abspath(path)), os.path.abspath(PDF_DIR))
+                owner = parent if parent != "." and not parent.startswith("..") else None
+            for number, chunks in pages:
+                inc("pdf_pages", scraper="pdf")
+                for chunk in chunks:
+                    inc("pdf_chunks", scraper="pdf")
+                    yield {"Company": owner, "Title": os.path.basename(path), "Page": number,
+                           "Content": chunk, "Link": f"{path}#page={number}"}
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        # Pages extracted in this process (workers=1) left their readers in the cache
+        close_pdfs()
+
+
+def pdf_files(directory=PDF_DIR):
+    """PDF files below a directory, sorted, or none if it does not exist"""
+    found = []
+    for root, _, names in os.walk(directory):
+        found += [os.path.join(root, name) for name in names if name.lower().endswith('.pdf')]
+    return sorted(found)
+
+
+def pdf_sources(sources=PDF_SOURCES):
+    """
+    The PDFs indexed by default.
+
+    Parameters:
+        sources (str): "directory" or "directory=company" entries separated by os.pathsep.
+
+    Returns:
+        list: (company or None, sorted PDF files) per existing directory of `sources`.
+    """
+    found = []
+    for entry in filter(None, sources.split(os.pathsep)):
+        directory, _, company = entry.partition('=')
+        if os.path.isdir(directory):
+            found.append((company or None, pdf_files(directory)))
+    return found
+
+
+if __name__ == "__main__":
+    from record_sink import open_sink
+    from metrics import run
+
+    parser = argparse.ArgumentParser(description="Extract page-level text chunks from PDF files.")
+    parser.add_argument("paths", nargs="*", help="PDF files (default: every PDF of --sources)")
+    parser.add_argument("--sources", default=PDF_SOURCES,
+                        help=f"Directories to read, as directory[=company] entries separated by '{os.pathsep}'")
+    parser.add_argument("--output", required=True, help="File the chunks are written to (.csv, .jsonl or .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: one per CPU)")
+    parser.add_argument("--company", default=None, help="Company recorded with every chunk")
+    args = parser.parse_args()
+
+    sources = [(args.company, args.paths)] if args.paths else pdf_sources(args.sources)
+    with run("pdf_ingestion"), timer("pdf_seconds", scraper="pdf"):
+        with open_sink(args.output, ["Company", "Title", "Page", "Content", "Link"]) as sink:
+            for company, paths in sources:
+                for chunk in iter_pdf_chunks(paths, workers=args.workers, company=args.company or company):
+                    sink.write(chunk)
+    print(f"Wrote {sink.count} chunks to {args.output}")
@@ -0,0 +1,23 @@
+import time
+import threading
+
+
+class DomainThrottle:
+    """
+    Per-domain politeness for concurrent crawlers: requests to the same domain are
+    spaced at least `min_interval` seconds apart, while different domains proceed in parallel.
+    """
+
+    def __init__(self, min_interval=2.0):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, domain):
+        """Blocks until the caller may send its next request to `domain`."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,222 @@
+import os
+import csv
+import json
+
+
+class JsonlSink:
+    """Writes records as JSON lines, flushing each one so it is on disk as soon as it is scraped."""
+
+    def __init__(self, path, mode="w"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.count = 0
+        self._file = open(path, mode, encoding="utf-8")
+
+    def write(self, record):
+        """
+        Appends one record.
+
+        Returns:
+            int: Byte offset of the written line, usable with `read_jsonl_at`.
+        """
+        offset = self._file.tell()
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+        return offset
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink:
+    """Writes records to a CSV file row by row instead of building a DataFrame first."""
+
+    def __init__(self, path, fieldnames=None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.fieldnames = fieldnames
+        self.count = 0
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = None
+
+    def write(self, record):
+        if self._writer is None:
+            self.fieldnames = self.fieldnames or list(record.keys())
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerow(record)
+        self.count += 1
+
+    def close(self):
+        # Always leave a header behind, even if nothing was written
+        if self._writer is None and self.fieldnames:
+            csv.DictWriter(self._file, fieldnames=self.fieldnames).writeheader()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetSink:
+    """
+    Writes records to a Parquet file one row group at a time, so at most
+    `row_group_size` records are held in memory. Requires pyarrow.
+    """
+
+    def __init__(self, path, fieldnames=None, row_group_size=500):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet files requires pyarrow: pip install pyarrow")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self.fieldnames = fieldnames
+        self.row_group_size = row_group_size
+        self.count = 0
+        self._rows = []
+        self._writer = None
+
+    def write(self, record):
+        self._rows.append(record)
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        self.fieldnames = self.fieldnames or list(self._rows[0].keys())
+        columns = {name: [row.get(name) for row in self._rows] for name in self.fieldnames}
+        if self._writer is None:
+            # Scraped fields are free text, so every column is stored as a string
+            schema = self._pa.schema([(name, self._pa.string()) for name in self.fieldnames])
+            self._writer = self._pq.ParquetWriter(self.path, schema)
+        columns = {name: [None if value is None else str(value) for value in values] for name, values in columns.items()}
+        self._writer.write_table(self._pa.table(columns, schema=self._writer.schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_sink(path, fieldnames=None):
+    """
+    Opens a record sink for the given output file, chosen by its extension
+    (.csv, .jsonl or .parquet).
+
+    Parameters:
+        path (str): Output file path.
+        fieldnames (list): Column order for CSV/Parquet output; defaults to the keys of the first record.
+
+    Returns:
+        A sink with `write(record)` and `close()`, usable as a context manager.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        return ParquetSink(path, fieldnames)
+    if extension in (".jsonl", ".json"):
+        return JsonlSink(path)
+    return CsvSink(path, fieldnames)
+
+
+def read_jsonl_at(path, offsets):
+    """
+    Reads individual JSON lines back from a file by byte offset.
+
+    Parameters:
+        path (str): JSON lines file.
+        offsets (list): Byte offsets of the lines to read.
+
+    Returns:
+        list: The decoded lines, in the order of `offsets`.
+    """
+    entries = []
+    with open(path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            entries.append(json.loads(f.readline()))
+    return entries
+
+
+class DomainAggregator:
+    """
+    Groups scraped pages per (domain, company) without keeping their text in memory.
+
+    Only each page's URL and the location of its record in a JSON lines file are
+    stored; `write` reads the text of one group at a time back from that file,
+    so memory use is bounded by the largest single group rather than the whole crawl.
+    """
+
+    def __init__(self, jsonl_path):
+        self.jsonl_path = jsonl_path
+        self.groups = {}
+
+    def add(self, record, offset, position=0, order=0):
+        """
+        Registers a record stored in the JSON lines file.
+
+        Parameters:
+            record (dict): The record, with 'domain_name', 'company_name' and 'url' keys.
+            offset (int): Byte offset of the line holding the record.
+            position (int): Index of the record within that line, for lines holding a list of records.
+            order (int): Sort key of the record within its group, e.g. its position in the input file.
+                         Records with equal keys keep the order they were added in.
+        """
+        key = (record.get('domain_name'), record.get('company_name'))
+        if None in key:
+            return  # Matches pandas groupby, which drops rows with missing keys
+        self.groups.setdefault(key, []).append((order, record['url'], offset, position))
+
+    def rows(self):
+        """Yields one grouped row per (domain, company), sorted by key, with contents joined by blank lines."""
+        for domain_name, company_name in sorted(self.groups):
+            members = sorted(self.groups[(domain_name, company_name)], key=lambda member: member[0])
+            urls = [url for _, url, _, _ in members]
+            entries = read_jsonl_at(self.jsonl_path, [offset for _, _, offset, _ in members])
+            contents = [records_of(entry)[position]['content'] for entry, (_, _, _, position) in zip(entries, members)]
+            yield {
+                'domain_name': domain_name,
+                'company_name': company_name,
+                'url': str(urls),
+                'content': "\n\n".join(contents)  # Separate the grouped content by 2 newline characters
+            }
+
+    def write(self, output_file):
+        """
+        Streams the grouped rows into an output file (CSV, JSON lines or Parquet).
+
+        Returns:
+            int: Number of grouped rows written.
+        """
+        with open_sink(output_file, ['domain_name', 'company_name', 'url', 'content']) as sink:
+            for row in self.rows():
+                sink.write(row)
+        return sink.count
+
+
+def records_of(entry):
+    """Returns the records held by a JSON line: the 'records' list of a crawl journal entry, or the line itself."""
+    if isinstance(entry, dict) and 'records' in entry and 'task' in entry:
+        return entry['records']
+    return [entry]
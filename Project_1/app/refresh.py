@@ -0,0 +1,217 @@
+"""
+Incremental refresh of the dashboard data: scrape -> clean -> embed -> index.
+
+Stages form a dependency graph. Independent scrapers run in parallel (as separate
+processes, as when run by hand); each stage fingerprints its inputs and outputs and is
+skipped when neither changed since its last successful run (scrapers additionally re-run
+once their results are older than --scrape-interval hours). The index stage publishes a
+new index version that a running dashboard picks up without a restart.
+
+    python refresh.py                       # everything that is due
+    python refresh.py --skip-scrapers       # rebuild from the CSVs already on disk
+    python refresh.py --force embed index   # re-run stages regardless of fingerprints
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from indexing import (source_files, STAGING_DIR, CURRENT_FILE, fingerprint, get_embeddings,
+                      prepare_documents, embed_documents, publish_indexes)
+from metrics import inc, timer, run
+
+STATE_PATH = "data/.refresh_state.json"
+
+
+class Stage:
+    """
+    One node of the refresh graph.
+
+    Parameters:
+        name (str): Stage name.
+        action (callable): Runs the stage; raises on failure.
+        deps (list): Names of stages that must finish first.
+        inputs (list): Files whose content decides whether the stage must re-run.
+        outputs (list): Files the stage produces; re-run if they changed or disappeared.
+        max_age (float): Seconds after which the stage re-runs even if nothing changed.
+        optional (bool): A failure does not block dependent stages (they use the previous outputs).
+    """
+
+    def __init__(self, name, action, deps=(), inputs=(), outputs=(), max_age=None, optional=False):
+        self.name = name
+        self.action = action
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.max_age = max_age
+        self.optional = optional
+
+
+def script(name, *args):
+    """Action running a scraper script in its own process, as when it is run by hand"""
+    def action():
+        subprocess.run([sys.executable, name, *args], check=True)
+    return action
+
+
+def build_stages(scrape_interval_hours=24, skip_scrapers=False):
+    """The refresh graph of the dashboard"""
+    max_age = scrape_interval_hours * 3600
+    stages = []
+    if not skip_scrapers:
+        stages += [
+            # Both job scrapers append to data/jobs_data.csv. Only seek_jobs, which runs last,
+            # fingerprints it; as an output of both, each run would make the other look stale
+            Stage("google_jobs", script("google_jobs_scraper.py"),
+                  inputs=["google_jobs_scraper.py", "serpapi_client.py"],
+                  max_age=max_age, optional=True),
+            Stage("seek_jobs", script("seek_jobs_scraper.py"), deps=["google_jobs"],
+                  inputs=["seek_jobs_scraper.py"], outputs=["data/jobs_data.csv"],
+                  max_age=max_age, optional=True),
+            # Search feeds instead of a browser; google_news_scraper.py remains for manual runs
+            Stage("google_news", script("news_feed_ingester.py"),
+                  inputs=["news_feed_ingester.py", "news_archive.py"], outputs=["data/google_news.csv"],
+                  max_age=max_age, optional=True),
+            Stage("webpages", script("webpage_scraper.py", "--discover"),
+                  inputs=["webpage_scraper.py", "url_discovery.py"], outputs=["data/genai_company_articles.csv"],
+                  max_age=max_age, optional=True),
+        ]
+    scrapers = [stage.name for stage in stages]
+
+    documents = os.path.join(STAGING_DIR, "documents.jsonl")
+    vectors = os.path.join(STAGING_DIR, "vectors.npy")
+    stages += [
+        Stage("clean", prepare_documents, deps=scrapers,
+              inputs=source_files() + ["utils.py", "dedup.py", "indexing.py", "pdf_ingestion.py"], outputs=[documents]),
+        Stage("embed", lambda: embed_documents(get_embeddings()), deps=["clean"],
+              inputs=[documents], outputs=[vectors]),
+        Stage("index", lambda: publish_indexes(get_embeddings()), deps=["embed"],
+              inputs=[documents, vectors, "bm25.py"], outputs=[CURRENT_FILE]),
+    ]
+    return stages
+
+
+class Refresh:
+    """
+    Runs a stage graph: stages start as soon as their dependencies are done, on a thread pool.
+
+    Parameters:
+        stages (list): Stage objects.
+        state_path (str): JSON file with the fingerprints of each stage's last successful run.
+        force (set): Stage names to run regardless of fingerprints.
+        workers (int): Stages run at the same time.
+        dry_run (bool): Only report what would run.
+    """
+
+    def __init__(self, stages, state_path=STATE_PATH, force=(), workers=4, dry_run=False):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.force = set(force)
+        self.workers = workers
+        self.dry_run = dry_run
+        self.lock = threading.Lock()
+        self.status = {}
+        self.durations = {}
+        try:
+            with open(state_path) as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def is_fresh(self, stage):
+        """True if the stage's inputs and outputs match its last successful run and it is not too old"""
+        previous = self.state.get(stage.name)
+        if stage.name in self.force or not previous:
+            return False
+        if stage.max_age is not None and time.time() - previous["finished"] > stage.max_age:
+            return False
+        return (previous["inputs"] == fingerprint(stage.inputs)
+                and previous["outputs"] == fingerprint(stage.outputs))
+
+    def save_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path + ".tmp", "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def execute(self, stage):
+        """Runs one stage unless it is fresh; returns its status"""
+        blocked = [dep for dep in stage.deps
+                   if self.status.get(dep) in ("failed", "blocked") and not self.stages[dep].optional]
+        if blocked:
+            return "blocked"
+        # A dependency that ran may have changed this stage's inputs, so freshness is checked now
+        if self.is_fresh(stage):
+            return "unchanged"
+        if self.dry_run:
+            return "would run"
+
+        input_fp = fingerprint(stage.inputs)
+        start = time.perf_counter()
+        try:
+            with timer("refresh_stage_seconds", stage=stage.name):
+                stage.action()
+        except Exception as e:
+            print(f"Stage {stage.name} failed: {e}")
+            inc("refresh_stage_failures", stage=stage.name)
+            return "failed"
+        finally:
+            self.durations[stage.name] = time.perf_counter() - start
+
+        with self.lock:
+            self.state[stage.name] = {"inputs": input_fp, "outputs": fingerprint(stage.outputs), "finished": time.time()}
+            self.save_state()
+        return "ran"
+
+    def run(self):
+        """
+        Runs the graph to completion.
+
+        Returns:
+            dict: Stage name -> "ran", "unchanged", "failed", "blocked" or "would run".
+        """
+        remaining = dict(self.stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while remaining or running:
+                ready = [stage for stage in remaining.values()
+                         if all(dep in self.status or dep not in self.stages for dep in stage.deps)]
+                for stage in ready:
+                    del remaining[stage.name]
+                    running[executor.submit(self.execute, stage)] = stage.name
+                if not running:
+                    raise ValueError(f"Dependency cycle among stages: {', '.join(remaining)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.status[name] = future.result()
+                    took = f" in {self.durations[name]:.1f} s" if name in self.durations else ""
+                    print(f"{name:12s} {self.status[name]}{took}")
+        return self.status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally refresh the dashboard's data and index.")
+    parser.add_argument("--skip-scrapers", action="store_true", help="Only clean, embed and index the CSVs on disk")
+    parser.add_argument("--scrape-interval", type=float, default=24, help="Hours before a scraper runs again")
+    parser.add_argument("--force", nargs="*", default=None, help="Stages to run regardless of fingerprints (all if none given)")
+    parser.add_argument("--workers", type=int, default=4, help="Stages run in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Show which stages would run")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    with run("refresh"):
+        stages = build_stages(args.scrape_interval, args.skip_scrapers)
+        force = [stage.name for stage in stages] if args.force == [] else args.force or []
+        refresh = Refresh(stages, force=force, workers=args.workers, dry_run=args.dry_run)
+        status = refresh.run()
+    print(f"Refresh finished in {time.perf_counter() - start:.1f} s")
+    failed = [name for name, result in status.items()
+              if result in ("failed", "blocked") and not refresh.stages[name].optional]
+    sys.exit(1 if failed else 0)
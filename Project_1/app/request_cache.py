@@ -0,0 +1,93 @@
+"""
+In-process caching and request coalescing shared by the dashboard sessions of one server process.
+
+    embeddings = LRUCache(1024, name="query_embedding")
+    vector = embeddings.get(query)            # None on a miss
+    embeddings.put(query, vector)
+
+    flight = SingleFlight(name="analysis")
+    answer = flight.do(key, lambda: chain.invoke(...))   # concurrent callers with the same key share one call
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from metrics import inc
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache.
+
+    Parameters:
+        maxsize (int): Entries kept; the least recently used is evicted first.
+        name (str): Label of the <name>_cache_hits / <name>_cache_misses counters.
+    """
+
+    def __init__(self, maxsize=1024, name="lru"):
+        self.maxsize = maxsize
+        self.name = name
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                value = self.entries[key]
+                hit = True
+            else:
+                value = default
+                hit = False
+        inc(f"{self.name}_cache_hits" if hit else f"{self.name}_cache_misses")
+        return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is running, other callers with
+    the same key wait for its result (or exception) instead of starting their own.
+
+    Parameters:
+        name (str): Label of the <name>_coalesced counter.
+    """
+
+    def __init__(self, name="single_flight"):
+        self.name = name
+        self.lock = threading.Lock()
+        self.in_flight = {}
+
+    def do(self, key, fn):
+        """
+        Runs `fn()` unless a call for `key` is already running, and returns its result.
+
+        Returns:
+            tuple: (result, shared) where shared is True if another caller's call was reused.
+        """
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+        if not leader:
+            inc(f"{self.name}_coalesced")
+            return future.result(), True
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+        return future.result(), False
@@ -0,0 +1,292 @@
+"""
+Shared retrieval service: loads the embedding model and the current index once and serves
+hybrid search over HTTP (or a Unix socket) to any number of dashboard processes.
+
+Concurrent requests are micro-batched: queries arriving within --max-wait-ms of each other
+(up to --max-batch) are embedded in one model call and searched with one FAISS call. A new
+index version published by refresh.py is loaded in the background and swapped in.
+
+    python retrieval_service.py --port 8600
+    python retrieval_service.py --socket /tmp/retrieval.sock
+    RETRIEVAL_SERVICE_URL=http://127.0.0.1:8600 streamlit run app.py
+"""
+import os
+import json
+import time
+import queue
+import socket
+import argparse
+import threading
+import http.client
+import socketserver
+from urllib.parse import urlparse
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from indexing import index_version
+from metrics import METRICS, inc, observe, timer
+
+
+def get_retriever(k=3):
+    """Hybrid BM25 + vector retriever over the current published index, built first if there is none"""
+    from utils import get_text_cleaner
+    from hybrid_retrieval import HybridRetriever
+    from indexing import get_embeddings, load_indexes, build_indexes
+
+    with timer("embedding_model_load_seconds"):
+        embeddings = get_embeddings()
+    version = index_version()
+    indexes = load_indexes(embeddings, version, allow_stale=True)
+    if indexes is None:
+        indexes = build_indexes(embeddings)
+        version = index_version()
+    vector_store, bm25 = indexes
+    return HybridRetriever(vector_store=vector_store, bm25=bm25, clean_query=get_text_cleaner(), k=k, version=version)
+
+
+class RetrieverSlot:
+    """
+    A retriever loaded in a background thread.
+
+    When `refresh.py` publishes a new index version, the next call to `current` starts loading
+    it in the background and swaps it in once ready; until then callers keep the previous version.
+
+    Parameters:
+        loader (callable): Builds the retriever.
+        follow_index (bool): Reload when the published index version changes.
+    """
+
+    def __init__(self, loader=get_retriever, follow_index=True):
+        self.loader = loader
+        self.follow_index = follow_index
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="warm-up")
+        self.lock = threading.Lock()
+        self.future = self.executor.submit(loader)
+        self.pending = None
+
+    def current(self):
+        """Future of the retriever to use now"""
+        with self.lock:
+            if self.pending is not None and self.pending.done():
+                if self.pending.exception() is None:
+                    self.future = self.pending
+                    inc("index_swaps")
+                self.pending = None
+            if self.future.done() and self.pending is None:
+                if self.future.exception() is not None:
+                    self.future = self.executor.submit(self.loader)  # Retry a failed warm-up
+                elif self.follow_index and self.future.result().version != index_version():
+                    self.pending = self.executor.submit(self.loader)
+            return self.future
+
+
+class MicroBatcher:
+    """
+    Collects concurrent search requests into batches for `HybridRetriever.ranked_batch`.
+
+    Parameters:
+        slot (RetrieverSlot): Source of the current retriever.
+        max_batch (int): Most queries searched together.
+        max_wait (float): Seconds the first query of a batch waits for others to join.
+    """
+
+    def __init__(self, slot, max_batch=32, max_wait=0.002):
+        self.slot = slot
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True, name="micro-batcher").start()
+
+    def search(self, query, k):
+        """
+        Searches one query; blocks until its batch is done.
+
+        Returns:
+            tuple: (list of {"page_content", "metadata"} dicts, index version)
+        """
+        future = Future()
+        self.requests.put((query, k, future))
+        return future.result()
+
+    def _next_batch(self):
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            # Requests that queued up during the previous batch join without waiting
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                retriever = self.slot.current().result()
+                with timer("service_batch_seconds"):
+                    rankings = retriever.ranked_batch([query for query, _, _ in batch], k=max(k for _, k, _ in batch))
+                observe("service_batch_size", len(batch))
+                for (_, k, future), ranked in zip(batch, rankings):
+                    documents = [{"page_content": doc.page_content, "metadata": doc.metadata}
+                                 for doc in retriever.scored_documents(ranked[:k])]
+                    future.set_result((documents, retriever.version))
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+class RetrievalHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Many sessions connect at once; the default backlog of 5 drops connections
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_handler(batcher):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so clients reuse their connection
+        disable_nagle_algorithm = True  # Headers and body are written separately
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                future = batcher.slot.current()
+                ready = future.done() and future.exception() is None
+                self.send_json(200, {"ready": ready, "version": future.result().version if ready else None})
+            elif self.path == "/metrics":
+                body = METRICS.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self.send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/search":
+                self.send_json(404, {"error": "not found"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with timer("service_request_seconds"):
+                    documents, version = batcher.search(request["query"], int(request.get("k", 3)))
+            except (ValueError, KeyError) as e:
+                self.send_json(400, {"error": str(e)})
+                return
+            except Exception as e:
+                self.send_json(500, {"error": str(e)})
+                return
+            self.send_json(200, {"documents": documents, "version": version})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(host="127.0.0.1", port=8600, socket_path=None, max_batch=32, max_wait=0.002, slot=None):
+    """Starts the service and blocks; the retriever loads in the background while it already accepts requests"""
+    batcher = MicroBatcher(slot or RetrieverSlot(), max_batch=max_batch, max_wait=max_wait)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, make_handler(batcher))
+        print(f"Retrieval service listening on unix://{socket_path}")
+    else:
+        server = RetrievalHTTPServer((host, port), make_handler(batcher))
+        print(f"Retrieval service listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class RetrievalClient:
+    """
+    Client of the retrieval service, safe to share between threads (one keep-alive connection each).
+
+    Parameters:
+        url (str): "http://host:port" or "unix:///path/to/socket".
+        timeout (float): Seconds to wait for a response.
+    """
+
+    def __init__(self, url, timeout=60):
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            parsed = urlparse(self.url)
+            if parsed.scheme == "unix":
+                connection = UnixHTTPConnection(parsed.path, self.timeout)
+            else:
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def request(self, method, path, payload=None):
+        # Bytes, so http.client sends headers and body in one packet
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = json.loads(response.read())
+                break
+            except (http.client.HTTPException, ConnectionError, OSError):
+                connection.close()
+                self._local.connection = None  # Reconnect once, e.g. after the service restarted
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(f"Retrieval service error {response.status}: {data.get('error')}")
+        return data
+
+    def search(self, query, k=3):
+        """Documents for a query as {"page_content", "metadata"} dicts, best first"""
+        return self.request("POST", "/search", {"query": query, "k": k})["documents"]
+
+    def health(self):
+        return self.request("GET", "/health")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve hybrid retrieval to the dashboard processes.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--socket", default=None, help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=32, help="Most queries embedded and searched together")
+    parser.add_argument("--max-wait-ms", type=float, default=2, help="How long a query waits for others to batch with")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    serve(args.host, args.port, args.socket, args.max_batch, args.max_wait_ms / 1000)
@@ -1,14 +1,165 @@
+import re
 import time
 import os
+import json
+import argparse
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
-
-def scrape_seek_jobs(output_file="data/jobs_data.csv"):
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote_plus, urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup
+from http_fetch import fetch_html
+from politeness import DomainThrottle
+from metrics import inc, timer, run
+
+SEEK_URL = "https://www.seek.com.au/"
+# Result page `page` of a keyword search; SEEK_SEARCH_URL can point it at a fixture server
+SEEK_SEARCH_URL = "https://www.seek.com.au/jobs?keywords={keywords}&page={page}"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+REDUX_DATA_PATTERN = re.compile(r"window\.SEEK_REDUX_DATA\s*=\s*(\{.*?\});?\s*\n", re.DOTALL)
+
+def embedded_jobs(html):
+    """
+    Reads the job list Seek embeds in its result pages as `window.SEEK_REDUX_DATA` JSON.
+
+    Returns:
+        tuple: (list of job dicts, total number of results), or (None, None) if the page has no such data.
+    """
+    match = REDUX_DATA_PATTERN.search(html)
+    if not match:
+        return None, None
+    try:
+        # The page is JavaScript, not JSON: `undefined` appears where a value is missing
+        data = json.loads(match.group(1).replace(":undefined", ":null"))
+        results = data["results"]["results"]
+        return results.get("jobs") or [], results.get("totalCount")
+    except (ValueError, KeyError, TypeError):
+        inc("parse_errors", scraper="seek")
+        return None, None
+
+def parse_seek_page(html, base_url, location="Australia"):
+    """
+    Extracts the job listings of a Seek result page, from its embedded JSON or from its job cards.
+
+    Parameters:
+        html (str): The result page.
+        base_url (str): URL of the page, to resolve relative links against.
+        location (str): Location recorded with each job.
+
+    Returns:
+        tuple: (list of job dicts, number of result pages or None if unknown)
+    """
+    jobs, total = embedded_jobs(html)
+    if jobs is not None:
+        rows = [{
+            "Job Title": job.get("title", "N/A"),
+            "Company Name": (job.get("advertiser") or {}).get("description", "N/A"),
+            "Location": location,
+            "Content": job.get("teaser") or "N/A",
+            "Link": urljoin(base_url, f"/job/{job['id']}")
+        } for job in jobs if job.get("id")]
+        return rows, -(-total // len(jobs)) if total and jobs else None
+
+    soup = BeautifulSoup(html, "html.parser")
+    rows = []
+    for card in soup.select("article[data-automation='normalJob']"):
+        title = card.select_one("a[data-automation='jobTitle']")
+        company = card.select_one("a[data-automation='jobCompany']")
+        content = card.select_one("[data-automation='jobShortDescription']")
+        rows.append({"Job Title": title.get_text(strip=True) if title else "N/A",
+                     "Company Name": company.get_text(strip=True) if company else "N/A",
+                     "Location": location,
+                     "Content": content.get_text(strip=True) if content else "N/A",
+                     "Link": urljoin(base_url, title.get("href")) if title else "N/A"})
+    numbers = [int(link["data-automation"].split("-")[1]) for link in soup.select("a[data-automation^='page-']")
+               if link["data-automation"].split("-")[1].isdigit()]
+    return rows, max(numbers) if numbers else None
+
+class SeekHttpFetcher:
+    """
+    Fetches Seek search result pages over HTTP, without a browser.
+
+    The first page of every company is requested concurrently; it tells how many result
+    pages there are, and the remaining pages are then requested concurrently too. Requests
+    to the same host are spaced `delay` seconds apart.
+
+    Parameters:
+        search_url (str): Result page URL template with {keywords} and {page}.
+        workers (int): Pages requested at the same time.
+        max_pages (int): Result pages read per company at most.
+        delay (float): Seconds between requests to the same host.
+        location (str): Location recorded with each job.
+    """
+
+    def __init__(self, search_url=None, workers=8, max_pages=10, delay=0.5, location="Australia"):
+        self.search_url = search_url or os.getenv("SEEK_SEARCH_URL", SEEK_SEARCH_URL)
+        self.workers = workers
+        self.max_pages = max_pages
+        self.location = location
+        self.throttle = DomainThrottle(delay)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+
+    def fetch_page(self, company, number):
+        """
+        Returns:
+            tuple: (job dicts, number of result pages or None); no jobs if the page failed.
+        """
+        url = self.search_url.format(keywords=quote_plus(company), page=number)
+        self.throttle.wait(urlparse(url).netloc)
+        try:
+            with timer("fetch_seconds", scraper="seek"):
+                page = fetch_html(url, session=self.session, timeout=15, scraper="seek")
+            inc("pages_fetched", scraper="seek")
+        except requests.RequestException as e:
+            print(f"Error fetching {url}: {e}")
+            inc("fetch_errors", scraper="seek")
+            return [], None
+        if page.status_code != 200 or page.text is None:
+            print(f"Failed to fetch {url} (Status Code: {page.status_code})")
+            inc("fetch_errors", scraper="seek")
+            return [], None
+        with timer("parse_seconds", scraper="seek"):
+            rows, pages = parse_seek_page(page.text, page.response.url, self.location)
+        inc("rows_extracted", len(rows), scraper="seek")
+        return rows, pages
+
+    def fetch(self, companies):
+        """
+        Collects the listings of every company.
+
+        Returns:
+            dict: Company -> list of job dicts (empty when the HTTP path found nothing).
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            first_pages = dict(zip(companies, executor.map(lambda company: self.fetch_page(company, 1), companies)))
+            # Without a page count, every page up to max_pages is requested
+            rest = [(company, page) for company, (rows, pages) in first_pages.items() if rows
+                    for page in range(2, min(pages or self.max_pages, self.max_pages) + 1)]
+            pages = executor.map(lambda task: self.fetch_page(*task)[0], rest)
+            jobs = {company: rows for company, (rows, _) in first_pages.items()}
+            for (company, _), rows in zip(rest, pages):
+                jobs[company].extend(rows)
+        return jobs
+
+def scrape_with_selenium(companies, location="Australia"):
+    """
+    Searches Seek in a Chrome browser, typing each company into the search box and following "Next".
+
+    Returns:
+        list: Job dicts of all companies.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from webdriver_manager.chrome import ChromeDriverManager
+
     # Configure Selenium WebDriver
     chrome_options = Options()
     chrome_options.add_argument("--start-maximized")
@@ -17,22 +168,15 @@ def scrape_seek_jobs(output_file="data/jobs_data.csv"):
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=chrome_options)
 
-    # Seek job search URL
-    seek_url = "https://www.seek.com.au/"
-
-    # Locations and Companies
-    location = "Australia"
-    companies = ["Tata Consultancy Services", "Infosys", "Tech Mahindra", "HCLTech", "Wipro", "LTIMindtree", "Cognizant"]
-
     # Data storage
     job_data = []
 
-    driver.get(seek_url)
+    driver.get(SEEK_URL)
     time.sleep(3)
 
     for company in companies:
         print(f"Searching for {company} jobs in {location}...")
-        
+
         # Find the search box and enter query
         try:
             search_box = driver.find_element(By.NAME, "keywords")
@@ -44,12 +188,13 @@ def scrape_seek_jobs(output_file="data/jobs_data.csv"):
         except Exception as e:
             print("Error interacting with Seek search box:", e)
             continue
-        
+
         # Extract Job Listings
         while True:
             job_cards = driver.find_elements(By.CSS_SELECTOR, "article[data-automation='normalJob']")
+            inc("selenium_pages", scraper="seek")
             print(f"Found {len(job_cards)} job cards for {company} in {location}.")
-            
+
             for job_card in job_cards:
                 try:
                     title = job_card.find_element(By.CSS_SELECTOR, "a[data-automation='jobTitle']").text
@@ -57,7 +202,8 @@ def scrape_seek_jobs(output_file="data/jobs_data.csv"):
                     # location_text = job_card.find_element(By.CSS_SELECTOR, "[data-automation='jobLocation']").text
                     content = job_card.find_element(By.CSS_SELECTOR, "[data-automation='jobShortDescription']").text if job_card.find_elements(By.CSS_SELECTOR, "[data-automation='jobShortDescription']") else "N/A"
                     apply_link = job_card.find_element(By.CSS_SELECTOR, "a[data-automation='jobTitle']").get_attribute("href")
-                    
+
+                    inc("rows_extracted", scraper="seek")
                     job_data.append({
                         "Job Title": title,
                         "Company Name": company_name,
@@ -67,21 +213,26 @@ def scrape_seek_jobs(output_file="data/jobs_data.csv"):
                     })
                 except Exception as e:
                     print(f"Error extracting job details: {e}")
-            
+                    inc("parse_errors", scraper="seek")
+
             try:
                 next_button = driver.find_element(By.CSS_SELECTOR, "a[data-automation='pageNext']")
                 if "disabled" in next_button.get_attribute("class"):
                     print(f"No more job listings for {company} in {location}.")
                     break
-                next_button.click()
-                time.sleep(5)
+                with timer("page_load_seconds", scraper="seek"):
+                    next_button.click()
+                    time.sleep(5)
             except:
                 print(f"No more job listings for {company} in {location}.")
                 break
 
     # Close driver
     driver.quit()
+    return job_data
 
+def save_jobs(job_data, output_file="data/jobs_data.csv"):
+    """Appends jobs whose titles are not in `output_file` yet"""
     # Load existing data if CSV file exists
     if os.path.exists(output_file):
         existing_df = pd.read_csv(output_file)
@@ -89,10 +240,10 @@ def scrape_seek_jobs(output_file="data/jobs_data.csv"):
     else:
         existing_df = pd.DataFrame()
         existing_titles = set()
-    
+
     # Filter new jobs
     new_jobs = [job for job in job_data if job["Job Title"] not in existing_titles]
-    
+
     # Save updated data
     if new_jobs:
         new_df = pd.DataFrame(new_jobs)
@@ -102,6 +253,49 @@ def scrape_seek_jobs(output_file="data/jobs_data.csv"):
     else:
         print("No new job listings found. CSV file remains unchanged.")
 
+def scrape_seek_jobs(output_file="data/jobs_data.csv", search_url=None, workers=8, max_pages=10, delay=0.5,
+                     selenium_fallback=True):
+    """
+    Collects Seek job listings of the tracked companies, over HTTP first. Companies for which
+    the HTTP path finds nothing (blocked, or the page layout changed) are searched in Chrome.
+
+    Parameters:
+        output_file (str): CSV file the new jobs are appended to.
+        search_url (str): Result page URL template with {keywords} and {page}.
+        workers (int): Result pages requested at the same time.
+        max_pages (int): Result pages read per company at most.
+        delay (float): Seconds between requests to Seek.
+        selenium_fallback (bool): Search companies without HTTP results in a browser.
+    """
+    # Locations and Companies
+    location = "Australia"
+    companies = ["Tata Consultancy Services", "Infosys", "Tech Mahindra", "HCLTech", "Wipro", "LTIMindtree", "Cognizant"]
+
+    fetcher = SeekHttpFetcher(search_url, workers=workers, max_pages=max_pages, delay=delay, location=location)
+    jobs = fetcher.fetch(companies)
+    job_data = []
+    for company in companies:
+        print(f"Found {len(jobs[company])} job listings for {company} in {location} over HTTP.")
+        job_data.extend(jobs[company])
+
+    missing = [company for company in companies if not jobs[company]]
+    if missing and selenium_fallback:
+        print(f"Falling back to the browser for {', '.join(missing)}")
+        inc("selenium_fallbacks", len(missing), scraper="seek")
+        job_data.extend(scrape_with_selenium(missing, location))
+
+    save_jobs(job_data, output_file)
+
 if __name__ == "__main__":
-    scrape_seek_jobs()
-    
+    parser = argparse.ArgumentParser(description="Scrape Seek job listings of IT companies.")
+    parser.add_argument("--search-url", default=None, help="Result page URL template with {keywords} and {page}")
+    parser.add_argument("--workers", type=int, default=8, help="Result pages requested at the same time")
+    parser.add_argument("--max-pages", type=int, default=10, help="Result pages per company at most")
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds between requests to Seek")
+    parser.add_argument("--no-selenium", action="store_true", help="Do not fall back to a browser")
+    args = parser.parse_args()
+
+    with run("seek_jobs_scraper"):
+        scrape_seek_jobs(search_url=args.search_url, workers=args.workers, max_pages=args.max_pages,
+                         delay=args.delay, selenium_fallback=not args.no_selenium)
+
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from metrics import inc, timer
+
+SERPAPI_URL = "https://serpapi.com/search.json"
+
+
+class QuotaExceeded(Exception):
+    """Raised when a live search would go over the configured search budget."""
+
+
+class SerpApiClient:
+    """
+    Concurrent SerpAPI client with pagination, an on-disk response cache and quota accounting.
+
+    Identical queries (same parameters, API key excluded) are answered from the cache
+    while younger than `cache_ttl` seconds, so repeated runs do not spend paid searches.
+    Live searches are counted, and once `max_searches` is reached further live searches
+    raise QuotaExceeded. The endpoint can be pointed at a local stub server through
+    `base_url` or the SERPAPI_BASE_URL environment variable.
+    """
+
+    def __init__(self, api_key, base_url=None, cache_dir="data/.serpapi_cache", cache_ttl=24 * 3600,
+                 max_workers=4, max_pages=3, max_searches=None, timeout=30):
+        self.api_key = api_key
+        self.base_url = base_url or os.getenv("SERPAPI_BASE_URL", SERPAPI_URL)
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.max_searches = max_searches
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.usage = {"searches": 0, "cache_hits": 0, "errors": 0}
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, params):
+        """Cache file for a set of query parameters (the API key is not part of the key)."""
+        key = json.dumps({k: v for k, v in params.items() if k != "api_key"}, sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_cache(self, params):
+        if not self.cache_dir:
+            return None
+        path = self.cache_path(params)
+        try:
+            if time.time() - os.path.getmtime(path) > self.cache_ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, params, results):
+        if not self.cache_dir:
+            return
+        path = self.cache_path(params)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        os.replace(tmp_path, path)  # Atomic, so concurrent readers never see half a file
+
+    def search(self, params):
+        """
+        Runs one search, from the cache when possible.
+
+        Parameters:
+            params (dict): SerpAPI query parameters (engine, q, next_page_token, ...).
+
+        Returns:
+            dict: The SerpAPI JSON response.
+        """
+        cached = self._read_cache(params)
+        if cached is not None:
+            with self._lock:
+                self.usage["cache_hits"] += 1
+            inc("cache_hits", scraper="google_jobs")
+            return cached
+
+        with self._lock:
+            if self.max_searches is not None and self.usage["searches"] >= self.max_searches:
+                raise QuotaExceeded(f"Search budget of {self.max_searches} live searches used up")
+            self.usage["searches"] += 1
+
+        try:
+            with timer("fetch_seconds", scraper="google_jobs"):
+                response = self.session.get(self.base_url, params={**params, "api_key": self.api_key}, timeout=self.timeout)
+        except requests.RequestException as e:
+            # A network failure ends this query's pagination, not the other queries of the run
+            with self._lock:
+                self.usage["errors"] += 1
+            inc("fetch_errors", scraper="google_jobs")
+            # The message holds the request URL; keep the API key out of logs
+            error = str(e).replace(self.api_key, "***") if self.api_key else str(e)
+            print(f"SerpAPI request failed for '{params.get('q')}': {error}")
+            return {"error": error}
+        inc("pages_fetched", scraper="google_jobs")
+        inc("bytes_fetched", len(response.content), scraper="google_jobs")
+        try:
+            results = response.json()
+        except ValueError:
+            results = {"error": f"Status {response.status_code}: {response.text[:200]}"}
+
+        # "No results" answers are worth caching; failures (bad key, rate limit, outage) are not
+        if response.status_code != 200:
+            with self._lock:
+                self.usage["errors"] += 1
+            inc("fetch_errors", scraper="google_jobs")
+            print(f"SerpAPI error for '{params.get('q')}': {results.get('error', response.status_code)}")
+            return results
+
+        self._write_cache(params, results)
+        return results
+
+    def search_pages(self, params, results_key="jobs_results"):
+        """
+        Collects results across pages by following `next_page_token`, up to `max_pages` pages.
+
+        Parameters:
+            params (dict): Query parameters of the first page.
+            results_key (str): Key of the result list in each response.
+
+        Returns:
+            list: Results of all fetched pages, in page order.
+        """
+        collected = []
+        page_params = dict(params)
+        for _ in range(self.max_pages):
+            try:
+                results = self.search(page_params)
+            except QuotaExceeded as e:
+                print(f"Stopping pagination for '{params.get('q')}': {e}")
+                break
+
+            collected.extend(results.get(results_key, []))
+            token = results.get("serpapi_pagination", {}).get("next_page_token")
+            if not token:
+                break
+            page_params = {**params, "next_page_token": token}
+
+        return collected
+
+    def search_many(self, params_list, results_key="jobs_results"):
+        """
+        Runs `search_pages` for several queries on a bounded thread pool.
+
+        Returns:
+            list: One result list per query, in the order of `params_list`.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda params: self.search_pages(params, results_key), params_list))
+
+    def report(self):
+        """Prints how many live searches were spent and how many were served from the cache."""
+        budget = f" of {self.max_searches}" if self.max_searches is not None else ""
+        print(f"SerpAPI usage: {self.usage['searches']}{budget} live searches, "
+              f"{self.usage['cache_hits']} cache hits, {self.usage['errors']} errors")
@@ -0,0 +1,305 @@
+"""
+Sitemap-driven URL discovery for company and startup websites.
+
+For every site, robots.txt is read for its `Sitemap:` lines and crawl rules, and the
+sitemaps (and sitemap indexes, plain or gzipped) are streamed and parsed concurrently.
+URLs whose path matches the GenAI keyword patterns are scheduled for fetching only when
+they are new, when their `<lastmod>` changed since they were last fetched, or, without a
+lastmod, when they were fetched more than `revisit_days` ago. Child sitemaps whose
+lastmod in the index did not change are not downloaded again, so a routine run reads a
+few sitemaps and schedules a few pages however large the sites grow.
+
+    discovery = UrlDiscovery()
+    due = discovery.discover({"Infosys": "https://www.infosys.com"})   # company -> [URL, ...]
+    ...fetch them...
+    discovery.mark_fetched(fetched_urls)
+    discovery.save()
+
+    python url_discovery.py --site https://www.infosys.com --output data/discovered.txt
+"""
+import os
+import re
+import json
+import zlib
+import time
+import argparse
+import threading
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+from xml.etree.ElementTree import XMLPullParser, ParseError
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import inc, timer
+
+STATE_PATH = "data/.crawl/url_discovery.json"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+# Matched against URL paths, case-insensitively
+GENAI_PATTERNS = [r"gen[-_]?ai", r"generative", r"\bllms?\b", r"large[-_]language", r"copilot", r"agentic",
+                  r"artificial[-_]intelligence", r"(^|[/_-])ai([/_-]|$)", r"machine[-_]learning"]
+CHUNK_SIZE = 64 * 1024
+
+
+def local_name(tag):
+    """Tag without its XML namespace"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def gunzip_chunks(chunks):
+    """Passes chunks through, decompressing them if the stream is gzipped (.xml.gz sitemaps)"""
+    decompressor = None
+    for chunk in chunks:
+        if decompressor is None:
+            gzipped = chunk[:2] == b"\x1f\x8b"
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else False
+        yield decompressor.decompress(chunk) if decompressor else chunk
+    if decompressor:
+        yield decompressor.flush()
+
+
+def parse_sitemap(chunks):
+    """
+    Parses a sitemap or sitemap index incrementally.
+
+    Parameters:
+        chunks (iterable): Bytes of the sitemap, plain or gzipped.
+
+    Yields:
+        tuple: (kind, loc, lastmod) with kind "sitemap" for index entries and "url" for pages;
+        lastmod is None when missing.
+    """
+    parser = XMLPullParser(events=("end",))
+    for chunk in gunzip_chunks(chunks):
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            kind = local_name(element.tag)
+            if kind not in ("url", "sitemap"):
+                continue
+            fields = {local_name(child.tag): (child.text or "").strip() for child in element}
+            if fields.get("loc"):
+                yield kind, fields["loc"], fields.get("lastmod") or None
+            element.clear()
+    parser.close()
+
+
+def keyword_filter(patterns=GENAI_PATTERNS):
+    """Predicate telling whether a URL's path matches any of the regular expressions"""
+    combined = re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    return lambda url: bool(combined.search(urlparse(url).path))
+
+
+class UrlDiscovery:
+    """
+    Discovers the pages of websites from their sitemaps and decides which ones to fetch.
+
+    The state file keeps, per URL, the lastmod it had when it was fetched, and per child
+    sitemap, its lastmod in the index when it was last read. URLs scheduled by `discover`
+    stay pending until `mark_fetched`, so pages a run did not get to are offered again.
+
+    Parameters:
+        state_path (str): JSON file of the discovery state.
+        patterns (list): Regular expressions a URL path must match; None accepts every URL.
+        workers (int): Sitemaps fetched at the same time.
+        revisit_days (float): Age after which pages without a lastmod are fetched again.
+        max_sitemaps (int): Sitemaps read per site at most.
+        max_depth (int): Levels of nested sitemap indexes followed.
+    """
+
+    def __init__(self, state_path=STATE_PATH, patterns=GENAI_PATTERNS, workers=8, revisit_days=30,
+                 max_sitemaps=200, max_depth=3, timeout=20):
+        self.state_path = state_path
+        self.matches = keyword_filter(patterns) if patterns else (lambda url: True)
+        self.workers = workers
+        self.revisit_seconds = revisit_days * 86400
+        self.max_sitemaps = max_sitemaps
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.state = {"urls": {}, "pending": {}, "sitemaps": {}}
+        if os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                self.state.update(json.load(f))
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+
+    def robots(self, site):
+        """
+        Reads a site's robots.txt.
+
+        Returns:
+            tuple: (RobotFileParser, list of sitemap URLs, /sitemap.xml if robots.txt names none)
+        """
+        rules = RobotFileParser()
+        try:
+            response = self.session.get(urljoin(site, "/robots.txt"), timeout=self.timeout)
+            inc("pages_fetched", scraper="discovery")
+            lines = response.text.splitlines() if response.status_code == 200 else []
+        except requests.RequestException as e:
+            print(f"Error reading robots.txt of {site}: {e}")
+            inc("fetch_errors", scraper="discovery")
+            lines = []
+        rules.parse(lines)
+        sitemaps = [urljoin(site, url) for url in rules.site_maps() or []]
+        return rules, sitemaps or [urljoin(site, "/sitemap.xml")]
+
+    def read_sitemap(self, url):
+        """
+        Streams one sitemap.
+
+        Returns:
+            list: Its (kind, loc, lastmod) entries, or None if it could not be read.
+        """
+        try:
+            with timer("fetch_seconds", scraper="discovery"):
+                with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                    if response.status_code != 200:
+                        inc("fetch_errors", scraper="discovery")
+                        return None
+                    entries = [(kind, urljoin(url, loc), lastmod)
+                               for kind, loc, lastmod in parse_sitemap(response.iter_content(CHUNK_SIZE))]
+        except (requests.RequestException, ParseError, zlib.error) as e:
+            print(f"Error reading sitemap {url}: {e}")
+            inc("fetch_errors", scraper="discovery")
+            return None
+        inc("sitemaps_fetched", scraper="discovery")
+        return entries
+
+    def is_due(self, url, lastmod, now):
+        known = self.state["urls"].get(url)
+        if known is None or url in self.state["pending"]:
+            return True
+        if lastmod is not None or known["lastmod"] is not None:
+            return lastmod != known["lastmod"]
+        return now - known["fetched"] > self.revisit_seconds
+
+    def discover(self, sites, seeds=None):
+        """
+        Lists the pages to fetch now.
+
+        Parameters:
+            sites (dict): Owner (company, list name...) -> site root URL or list of root URLs.
+            seeds (dict): Owner -> URLs known without a sitemap (e.g. hand-picked articles);
+                they skip the keyword filter and are scheduled like URLs without a lastmod.
+
+        Returns:
+            dict: Owner -> list of URLs that are new, changed or pending.
+        """
+        now = time.time()
+        roots = [(owner, root) for owner, value in sites.items()
+                 for root in ([value] if isinstance(value, str) else value)]
+        found = {owner: {} for owner in list(sites) + list(seeds or {})}
+        seeded = set()
+        for owner, urls in (seeds or {}).items():
+            for url in urls:
+                found[owner].setdefault(url, None)
+                seeded.add(url)
+        # Pages that were scheduled but not fetched, possibly listed in sitemaps skipped below
+        for url, pending in self.state["pending"].items():
+            if pending["owner"] in found:
+                found[pending["owner"]].setdefault(url, pending["lastmod"])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            robots = list(executor.map(lambda item: self.robots(item[1]), roots))
+            rules = {urlparse(root).netloc: rule for (_, root), (rule, _) in zip(roots, robots)}
+            level = [(owner, root, sitemap, None) for (owner, root), (_, sitemaps) in zip(roots, robots)
+                     for sitemap in sitemaps]
+            read = {}
+            for depth in range(self.max_depth + 1):
+                if not level:
+                    break
+                entries = executor.map(lambda task: self.read_sitemap(task[2]), level)
+                next_level = []
+                for (owner, root, sitemap, lastmod), items in zip(level, entries):
+                    if items is None:
+                        continue
+                    if lastmod is not None:
+                        self.state["sitemaps"][sitemap] = lastmod
+                    for kind, loc, item_lastmod in items:
+                        if kind == "url":
+                            found[owner][loc] = item_lastmod
+                        elif depth < self.max_depth and read.get(root, 0) < self.max_sitemaps:
+                            # An index entry with an unchanged lastmod lists no new or updated pages
+                            if item_lastmod is not None and self.state["sitemaps"].get(loc) == item_lastmod:
+                                inc("sitemaps_unchanged", scraper="discovery")
+                                continue
+                            read[root] = read.get(root, 0) + 1
+                            next_level.append((owner, root, loc, item_lastmod))
+                level = next_level
+
+        due = {}
+        for owner, urls in found.items():
+            due[owner] = []
+            for url, lastmod in urls.items():
+                rule = rules.get(urlparse(url).netloc)
+                if url not in seeded and not self.matches(url):
+                    continue
+                if rule is not None and not rule.can_fetch(USER_AGENT, url):
+                    inc("robots_disallowed", scraper="discovery")
+                    continue
+                if self.is_due(url, lastmod, now):
+                    due[owner].append(url)
+                    with self._lock:
+                        self.state["pending"][url] = {"owner": owner, "lastmod": lastmod}
+            inc("urls_discovered", len(urls), scraper="discovery")
+            inc("urls_scheduled", len(due[owner]), scraper="discovery")
+        return due
+
+    def mark_fetched(self, urls):
+        """Records pages as fetched with the lastmod they were scheduled with"""
+        now = time.time()
+        with self._lock:
+            for url in urls:
+                if url in self.state["pending"]:
+                    self.state["urls"][url] = {"lastmod": self.state["pending"].pop(url)["lastmod"], "fetched": now}
+
+    def save(self):
+        """Writes the state atomically"""
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with self._lock:
+            data = json.dumps(self.state)
+        with open(self.state_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+
+def sites_from_url_list(file_path):
+    """Site roots of the URLs in a URL list file (one URL per line), e.g. Project_2/data/*.txt"""
+    roots = {}
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            url = line.strip()
+            if not url:
+                continue
+            if not url.startswith(("http://", "https://")):
+                url = f"https://{url}"
+            parsed = urlparse(url)
+            roots.setdefault(f"{parsed.scheme}://{parsed.netloc}", None)
+    return list(roots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Discover new and updated GenAI pages from website sitemaps.")
+    parser.add_argument("--site", action="append", default=[], help="Site root URL (repeatable)")
+    parser.add_argument("--sites-from", default=None, help="URL list file whose sites are explored")
+    parser.add_argument("--pattern", action="append", default=None, help="Path regex replacing the GenAI patterns (repeatable)")
+    parser.add_argument("--output", required=True, help="File the URLs to fetch are written to, one per line")
+    parser.add_argument("--state", default=STATE_PATH, help="Discovery state file")
+    parser.add_argument("--workers", type=int, default=8, help="Sitemaps fetched at the same time")
+    parser.add_argument("--revisit-days", type=float, default=30, help="Refetch pages without lastmod after this many days")
+    args = parser.parse_args()
+
+    sites = args.site + (sites_from_url_list(args.sites_from) if args.sites_from else [])
+    discovery = UrlDiscovery(args.state, patterns=args.pattern or GENAI_PATTERNS, workers=args.workers,
+                             revisit_days=args.revisit_days)
+    due = discovery.discover({"sites": sites})["sites"]
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.writelines(url + "\n" for url in due)
+    # The list is handed to a scraper with its own journal and resume; count it as fetched
+    discovery.mark_fetched(due)
+    discovery.save()
+    print(f"{len(due)} new or updated pages from {len(sites)} sites written to {args.output}")
@@ -1,11 +1,9 @@
 # Importing libraries
 import pandas as pd
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
 import re
 import json
+from functools import lru_cache
+from metrics import inc, timer
 
 
 # Function to check company name
@@ -28,8 +26,15 @@ def clean_company_name(df):
     return df
 
 
-# Function to perform text preprocessing on the descriptions
-def preprocess_text(df, column_name):
+# Function returning the text cleaner used for documents and search queries
+@lru_cache(maxsize=None)
+def get_text_cleaner():
+    # NLTK is imported on first use; it is slow to import and only needed here
+    import nltk
+    from nltk.corpus import stopwords
+    from nltk.tokenize import word_tokenize
+    from nltk.stem import WordNetLemmatizer
+
     nltk.download('stopwords')
     nltk.download('punkt')
     nltk.download('wordnet')
@@ -49,7 +54,40 @@ def preprocess_text(df, column_name):
 
         return ' '.join(words)
     
-    df['column_name'] =  df[column_name].apply(clean_text)
+    return clean_text
+
+
+# Function to perform text preprocessing on the descriptions; the cleaned text goes to "Cleaned <column>"
+def preprocess_text(df, column_name):
+    clean_text = get_text_cleaner()
+    with timer("preprocess_seconds", column=column_name):
+        df[f'Cleaned {column_name}'] =  df[column_name].apply(clean_text)
+    inc("rows_preprocessed", len(df))
+
+    return df
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORY_RATIO = 0.5
+
+# Function to shrink a DataFrame's in-memory footprint: low-cardinality text columns (company,
+# location, source) become categoricals, other text columns Arrow-backed strings (with pyarrow)
+def compact_dataframe(df, category_ratio=CATEGORY_RATIO):
+    try:
+        import pyarrow  # noqa: F401
+        string_dtype = "string[pyarrow]"
+    except ImportError:
+        string_dtype = None
+
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        if series.nunique(dropna=True) <= category_ratio * len(series):
+            df[column] = series.astype("category")
+        elif string_dtype:
+            df[column] = series.astype(string_dtype)
 
     return df
 
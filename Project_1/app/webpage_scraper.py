@@ -1,10 +1,27 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 import re
 import logging
+import argparse
 from concurrent.futures import ThreadPoolExecutor
+from dedup import NearDuplicateIndex
+from crawl_state import CrawlJournal
+from record_sink import open_sink
+from metrics import inc, timer, run
+from http_fetch import fetch_html
+from url_discovery import UrlDiscovery
+
+# Sites whose sitemaps are searched for GenAI pages with --discover
+COMPANY_SITES = {
+    "Tata Consultancy Services": "https://www.tcs.com",
+    "Infosys": "https://www.infosys.com",
+    "HCLTech": "https://www.hcltech.com",
+    "Wipro": "https://www.wipro.com",
+    "Cognizant": "https://www.cognizant.com",
+    "TechMahindra": "https://www.techmahindra.com",
+    "LTIMindtree": "https://www.ltimindtree.com",
+    "Dell": "https://www.dell.com",
+}
 
 # Configure logging
 logging.basicConfig(filename="scraper.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -15,14 +32,21 @@ def scrape_article_content(url):
     """
     try:
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.encoding = response.apparent_encoding  # Ensure correct encoding
+        # Streamed: non-HTML responses are skipped, big pages cut at a byte cap, encoding sniffed early
+        with timer("fetch_seconds", scraper="webpage"):
+            page = fetch_html(url, headers=headers, timeout=10, scraper="webpage")
+        inc("pages_fetched", scraper="webpage")
 
-        if response.status_code != 200:
-            logging.warning(f"Failed to fetch {url} (Status Code: {response.status_code})")
+        if page.status_code != 200:
+            logging.warning(f"Failed to fetch {url} (Status Code: {page.status_code})")
+            inc("fetch_errors", scraper="webpage")
+            return None, None
+        if page.text is None:
+            logging.info(f"Skipping {url}: not an HTML page ({page.content_type})")
             return None, None
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        with timer("parse_seconds", scraper="webpage"):
+            soup = BeautifulSoup(page.text, "html.parser")
         
         # Extract the title
         title = soup.title.text.strip() if soup.title else "No Title Found"
@@ -39,20 +63,32 @@ def scrape_article_content(url):
     
     except Exception as e:
         logging.error(f"Error scraping content from {url}: {e}")
+        inc("fetch_errors", scraper="webpage")
         return None, None
 
-def scrape_ai_articles(company, urls):
+def scrape_ai_articles(company, urls, journal=None, refetch=False):
     """
     Scrapes AI-related articles from a list of URLs for a given company using multi-threading.
+    When a journal is given, URLs it already holds are skipped (unless `refetch`, for pages
+    known to have changed) and every URL tried is journaled as it completes. Failed, non-HTML
+    and empty pages are journaled with a "failed" status and no records, so a resumed run skips
+    them and a failed refetch keeps the article scraped earlier.
     """
     articles = []
 
     def process_url(url):
+        if journal and journal.is_done(url) and not refetch:
+            logging.info(f"Skipping {url}, already scraped")
+            inc("cache_hits", scraper="webpage")
+            return None
         logging.info(f"Scraping {url} for {company}...")
         title, content = scrape_article_content(url)
+        result = None
         if title and content:
-            return {"Company": company, "Title": title, "Content": content, "Link": url}
-        return None
+            result = {"Company": company, "Title": title, "Content": content, "Link": url}
+        if journal:
+            journal.mark_done(url, [result] if result else [], status=None if result else "failed")
+        return result
 
     with ThreadPoolExecutor(max_workers=5) as executor:  # Adjust number of threads as needed
         results = executor.map(process_url, urls)
@@ -63,9 +99,20 @@ def scrape_ai_articles(company, urls):
 
     return articles
 
-def get_ai_articles():
+def get_ai_articles(output_file="data/genai_company_articles.csv", resume=False, journal_path="data/.crawl/genai_company_articles.jsonl",
+                    discover=False):
     """
-    Collects AI-related articles from various IT companies.
+    Collects AI-related articles from various IT companies and streams them into `output_file`
+    (.csv, .jsonl or .parquet) without holding the whole crawl in memory.
+    Scraped articles are journaled to disk, so `resume=True` only fetches URLs not scraped yet.
+    
+    With `discover=True`, GenAI pages are also found in the company sitemaps (url_discovery.py),
+    and only new or updated pages, the hand-picked URLs included, are fetched. Articles of
+    earlier runs stay in the journal, so the output keeps them.
+    
+    Returns:
+        int: Number of articles written. This used to be a DataFrame of the articles; read
+        `output_file` (e.g. `pd.read_csv(output_file)`) for it.
     """
     company_websites = {
         "Tata Consultancy Services": [
@@ -465,18 +512,49 @@ def get_ai_articles():
         ]
     }
     
-    all_articles = []
+    discovery = None
+    if discover:
+        discovery = UrlDiscovery()
+        company_websites = discovery.discover(COMPANY_SITES, seeds=company_websites)
+        resume = True
+    
+    with CrawlJournal(journal_path, resume=resume) as journal:
+        for company, urls in company_websites.items():
+            urls = list(dict.fromkeys(urls))  # Drop repeated URLs, keeping the original order
+            scrape_ai_articles(company, urls, journal, refetch=discover)
+            if discovery:
+                # Failed and non-HTML pages count as fetched too, so they are tried again only when
+                # their lastmod changes or after revisit_days, not on every run
+                discovery.mark_fetched(urls)
+                discovery.save()
     
-    for company, urls in company_websites.items():
-        articles = scrape_ai_articles(company, urls)
-        all_articles.extend(articles)
+    # Stream articles from this run and any earlier, resumed run into the output file,
+    # collapsing syndicated / copy-pasted articles before they reach the vector store
+    index = NearDuplicateIndex()
+    links = []
+    with open_sink(output_file, ["Company", "Title", "Content", "Link"]) as sink:
+        for article in journal.latest_records():
+            _, duplicate_of = index.match(article["Content"])
+            links.append(article["Link"])
+            if duplicate_of is None:
+                sink.write(article)
+                inc("rows_written", scraper="webpage")
+            else:
+                inc("near_duplicates", scraper="webpage")
+                logging.info(f"Near-duplicate article collapsed: {article['Link']} duplicates {links[duplicate_of]}")
     
-    return pd.DataFrame(all_articles)
+    return sink.count
 
 if __name__ == "__main__":
-    df = get_ai_articles()
-    if not df.empty:
-        df.to_csv("data/genai_company_articles.csv", index=False)
-        print("Scraped data saved to genai_company_articles.csv")
+    parser = argparse.ArgumentParser(description="Scrape GenAI articles from IT company websites.")
+    parser.add_argument("--resume", action="store_true", help="Skip URLs scraped by a previous run")
+    parser.add_argument("--discover", action="store_true",
+                        help="Find GenAI pages in the company sitemaps and fetch only new or updated pages")
+    args = parser.parse_args()
+
+    with run("webpage_scraper"):
+        count = get_ai_articles(resume=args.resume, discover=args.discover)
+    if count:
+        print(f"Scraped {count} articles, saved to genai_company_articles.csv")
     else:
         print("No articles found. Check the website structures or try different keywords.")
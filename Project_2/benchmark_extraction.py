@@ -0,0 +1,72 @@
+"""
+Compares the serial and concurrent paths of `data_extraction` on a local fixture server.
+
+Each input file lists pages spread over several fake domains (127.0.0.x hosts all reach
+the local server), so per-domain politeness can be exercised without touching real sites.
+
+    python benchmark_extraction.py --files 3 --domains 4 --pages 8 --workers 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+from data_extraction import process_urls, process_urls_concurrent
+from fixture_server import FixtureServer  # On the path once data_extraction is imported
+
+
+def write_url_files(server, directory, files, domains, pages):
+    """Write one URL list per simulated input file and return their paths"""
+    paths = []
+    for f in range(files):
+        urls = [server.url(f"/pages/site{f}{d}/{p}", host=f"127.0.0.{d + 2}")
+                for d in range(domains) for p in range(pages)]
+        path = os.path.join(directory, f"startups_{f}.txt")
+        with open(path, 'w', encoding='utf-8') as out:
+            out.write("\n".join(urls))
+        paths.append(path)
+    return paths
+
+
+def read_all(paths):
+    contents = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            contents.append(f.read())
+    return contents
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark serial vs concurrent URL processing.")
+    parser.add_argument("--files", type=int, default=3, help="Input files processed as one job")
+    parser.add_argument("--domains", type=int, default=4, help="Distinct domains per file")
+    parser.add_argument("--pages", type=int, default=8, help="Pages per domain")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.2, help="Politeness delay in seconds")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server response latency in seconds")
+    args = parser.parse_args()
+
+    with FixtureServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        inputs = write_url_files(server, tmp, args.files, args.domains, args.pages)
+        total = args.files * args.domains * args.pages
+
+        serial_outputs = [path.replace('.txt', '_serial.csv') for path in inputs]
+        start = time.perf_counter()
+        for path, output in zip(inputs, serial_outputs):
+            process_urls(path, output, delay=args.delay)
+        serial_time = time.perf_counter() - start
+
+        concurrent_outputs = [path.replace('.txt', '_concurrent.csv') for path in inputs]
+        start = time.perf_counter()
+        process_urls_concurrent(list(zip(inputs, concurrent_outputs)), workers=args.workers, delay=args.delay)
+        concurrent_time = time.perf_counter() - start
+
+        identical = read_all(serial_outputs) == read_all(concurrent_outputs)
+
+    print(f"\n📊 {total} URLs, {args.files} files x {args.domains} domains x {args.pages} pages")
+    print(f"   Serial:     {serial_time:7.2f} s  ({total / serial_time:6.1f} URLs/s)")
+    print(f"   Concurrent: {concurrent_time:7.2f} s  ({total / concurrent_time:6.1f} URLs/s, {args.workers} workers)")
+    print(f"   Speedup:    {serial_time / concurrent_time:7.2f}x")
+    print(f"   Identical grouped output: {'yes' if identical else 'NO'}")
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,73 @@
+"""
+Zero-shot tagging throughput on the scraped startups, in documents per minute.
+
+Compares the original approach (one pipeline call per document and label family)
+with BatchedZeroShot, using the same premises for both. The batched engine is called once
+per `--mine-batch` documents, as LandscapeMiner.mine does, and model loading (in every
+worker process with `--cores`) happens before the timed region:
+
+    python benchmark_zero_shot.py --docs 128 --batch-size 64 --threads 8 --cores 2
+"""
+import time
+import argparse
+import pandas as pd
+
+from landscape_mining import LABEL_SETS
+from zero_shot_batch import BatchedZeroShot
+
+
+def load_premises(paths, docs, words):
+    """First `words` words of the content of up to `docs` startups from the given CSV files"""
+    frames = [pd.read_csv(path, encoding="ISO-8859-1") for path in paths]
+    content = pd.concat(frames)['content'].dropna().astype(str)
+    return [' '.join(text.split()[:words]) for text in content.head(docs)]
+
+
+def run_pipeline(premises, model_name):
+    from transformers import pipeline
+    zero_shot = pipeline("zero-shot-classification", model=model_name)
+    zero_shot(premises[0], candidate_labels=LABEL_SETS["industry"])  # Warm-up
+
+    start = time.perf_counter()
+    for premise in premises:
+        for labels in LABEL_SETS.values():
+            zero_shot(premise, candidate_labels=labels)
+    return time.perf_counter() - start
+
+
+def run_batched(premises, model_name, batch_size, threads, cores, mine_batch):
+    with BatchedZeroShot(model_name, batch_size=batch_size, num_threads=threads, cores=cores) as engine:
+        # Warm-up: one premise per worker starts the processes and loads the model in each
+        engine.classify_families(premises[:max(cores, 1)], LABEL_SETS)
+
+        start = time.perf_counter()
+        for offset in range(0, len(premises), mine_batch):
+            engine.classify_families(premises[offset:offset + mine_batch], LABEL_SETS)
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark zero-shot startup tagging throughput.")
+    parser.add_argument("--docs", type=int, default=128, help="Number of startups to tag")
+    parser.add_argument("--words", type=int, default=60, help="Words of content used as the premise")
+    parser.add_argument("--model", default="facebook/bart-large-mnli")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=None, help="Torch threads per process")
+    parser.add_argument("--cores", type=int, default=1, help="Worker processes for the batched engine")
+    parser.add_argument("--mine-batch", type=int, default=32, help="Documents per call, as in LandscapeMiner.mine")
+    parser.add_argument("--skip-pipeline", action="store_true", help="Only time the batched engine")
+    args = parser.parse_args()
+
+    premises = load_premises(["data/indian_startups.csv", "data/australian_startups.csv"], args.docs, args.words)
+    pairs = len(premises) * sum(len(labels) for labels in LABEL_SETS.values())
+    print(f"Tagging {len(premises)} startups ({pairs} premise/label pairs)")
+
+    batched_time = run_batched(premises, args.model, args.batch_size, args.threads, args.cores, args.mine_batch)
+    print(f"Batched engine: {batched_time:8.1f} s  {len(premises) / batched_time * 60:8.1f} docs/min "
+          f"(batch size {args.batch_size}, threads {args.threads or 'default'}, cores {args.cores}, "
+          f"{-(-len(premises) // args.mine_batch)} calls)")
+
+    if not args.skip_pipeline:
+        pipeline_time = run_pipeline(premises, args.model)
+        print(f"Pipeline loop:  {pipeline_time:8.1f} s  {len(premises) / pipeline_time * 60:8.1f} docs/min")
+        print(f"Speedup:        {pipeline_time / batched_time:8.2f}x")
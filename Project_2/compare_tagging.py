@@ -0,0 +1,85 @@
+"""
+Agreement and speed of embedding-similarity tagging against the existing NLI tags
+in data/genai_ind.csv and data/genai_aus.csv.
+
+    python compare_tagging.py                      # embedding mode only
+    python compare_tagging.py --hybrid --margin 0.1
+"""
+import ast
+import time
+import argparse
+import pandas as pd
+
+from landscape_mining import LABEL_SETS, LandscapeMiner
+from embedding_tagger import EmbeddingTagger, classify_with_nli
+
+
+def parse_tags(value):
+    """Tag columns are saved as list reprs, e.g. "['B2B', 'SaaS', 'Consulting']" """
+    try:
+        tags = ast.literal_eval(value) if isinstance(value, str) else value
+    except (ValueError, SyntaxError):
+        return [value]
+    return tags if isinstance(tags, list) else [tags]
+
+
+def agreement(df, results):
+    """Per family: share of identical top labels and mean overlap of the top-3 label sets"""
+    rows = []
+    for family in LABEL_SETS:
+        reference = df[f'{family}_tag'].apply(parse_tags)
+        predicted = [result[family][0] for result in results]
+        top1 = sum(ref[:1] == pred[:1] for ref, pred in zip(reference, predicted)) / len(df)
+        top3 = sum(len(set(ref) & set(pred)) / 3 for ref, pred in zip(reference, predicted)) / len(df)
+        rows.append({'family': family, 'top1_agreement': round(top1, 3), 'top3_overlap': round(top3, 3)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare embedding tagging with the saved NLI tags.")
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2", help="Sentence embedding model")
+    parser.add_argument("--premise", choices=["keywords", "content"], default="keywords",
+                        help="Embed the KeyBERT keywords (as the NLI tags did) or the raw content")
+    parser.add_argument("--hybrid", action="store_true", help="Escalate uncertain cases to bart-large-mnli")
+    parser.add_argument("--margin", type=float, default=0.05, help="Uncertainty margin for the hybrid mode")
+    parser.add_argument("--nli-sample", type=int, default=5, help="Documents timed with NLI to estimate the speedup")
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+    from transformers import pipeline
+
+    df = pd.concat([pd.read_csv(path, encoding="ISO-8859-1") for path in
+                    ["data/genai_ind.csv", "data/genai_aus.csv"]], ignore_index=True)
+    texts = df['content'].astype(str).tolist()
+
+    encoder = SentenceTransformer(args.model)
+    if args.premise == "keywords":
+        from keybert import KeyBERT
+        miner = LandscapeMiner(KeyBERT(model=encoder), None, cache_path=None)
+        premises = [". ".join(kws) if kws else text for kws, text in zip(miner.extract_keywords(texts), texts)]
+    else:
+        premises = [' '.join(text.split()[:256]) for text in texts]
+
+    zero_shot = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+    tagger = EmbeddingTagger(encoder, nli_classifier=zero_shot if args.hybrid else None, margin=args.margin)
+    tagger.classify_families(premises[:1])  # Warm-up, also embeds the label descriptions
+    tagger.escalated = 0
+
+    start = time.perf_counter()
+    results = tagger.classify_families(premises)
+    tagger_time = (time.perf_counter() - start) / len(premises)
+
+    sample = premises[:args.nli_sample]
+    start = time.perf_counter()
+    classify_with_nli(zero_shot, sample, LABEL_SETS)
+    nli_time = (time.perf_counter() - start) / len(sample)
+
+    mode = f"hybrid (margin {args.margin})" if args.hybrid else "embedding"
+    print(f"\n{len(df)} GenAI startups, {mode} tagging on {args.premise} premises")
+    print(agreement(df, results).to_string(index=False))
+    if args.hybrid:
+        total = len(premises) * len(LABEL_SETS)
+        print(f"\nEscalated to NLI: {tagger.escalated} of {total} document/family cases ({tagger.escalated / total:.0%})")
+    print(f"\nNLI:       {nli_time * 1000:9.1f} ms/doc (measured on {len(sample)} docs)")
+    print(f"{mode.capitalize()}: {tagger_time * 1000:9.1f} ms/doc")
+    print(f"Speedup:   {nli_time / tagger_time:9.1f}x")
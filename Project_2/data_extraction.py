@@ -1,9 +1,13 @@
-import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import time
 import os
+import sys
+import argparse
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from fake_useragent import UserAgent
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -13,6 +17,14 @@ from selenium.common.exceptions import WebDriverException, TimeoutException
 import warnings
 import urllib3
 
+# Shared crawling helpers live with the Project 1 scrapers
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Project_1', 'app'))
+from crawl_state import CrawlJournal
+from record_sink import DomainAggregator
+from politeness import DomainThrottle
+from metrics import inc, timer, run as metrics_run
+from http_fetch import fetch_html
+
 # Disable warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -57,17 +69,24 @@ def fetch_page_static(url):
     """Fetch webpage with retries and random user-agent"""
     headers = {'User-Agent': ua.random}
     try:
-        response = requests.get(
-            url,
-            headers=headers,
-            timeout=10,
-            allow_redirects=True,
-            verify=False  # Bypass SSL verification
-        )
-        response.raise_for_status()
-        return response.text
+        # Streamed: non-HTML responses are skipped, big pages cut at a byte cap
+        with timer("fetch_seconds", scraper="startups"):
+            page = fetch_html(
+                url,
+                headers=headers,
+                timeout=10,
+                allow_redirects=True,
+                verify=False,  # Bypass SSL verification
+                scraper="startups"
+            )
+        inc("pages_fetched", scraper="startups")
+        page.response.raise_for_status()
+        if page.text is None:
+            print(f"⏭️ Skipping {url}: not an HTML page ({page.content_type})")
+        return page.text
     except requests.exceptions.RequestException as e:
         print(f"🚨 Static fetch failed for {url}: {str(e)}")
+        inc("fetch_errors", scraper="startups")
         return None
 
 def extract_content_static(html, url):
@@ -145,100 +164,273 @@ def extract_content_dynamic(driver, url):
         print(f"⚠️ Dynamic extraction failed for {url}: {str(e)}")
         return None, None
 
-def process_urls(file_path, delay=2, max_retries=3):
-    """Process URLs from file with proper path handling"""
+class SeleniumPool:
+    """Shared pool of headless Chrome drivers for the Selenium fallback, created on first use"""
+    
+    def __init__(self, size=1):
+        self.size = size
+        self._idle = []
+        self._created = 0
+        # Waiters are woken when a driver is released and when a slot frees up (discard, failed start)
+        self._available = threading.Condition()
+        self._all = []
+    
+    def acquire(self):
+        """Take an idle driver, starting a new one if the pool is not full yet (otherwise wait)"""
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            driver = setup_selenium()
+        except Exception:
+            self._free_slot()
+            raise
+        with self._available:
+            self._all.append(driver)
+        return driver
+    
+    def release(self, driver):
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+    
+    def _free_slot(self, driver=None):
+        with self._available:
+            self._created -= 1
+            if driver in self._all:
+                self._all.remove(driver)
+            self._available.notify()
+    
+    def discard(self, driver):
+        """Quit a broken driver so the pool starts a fresh one next time"""
+        self._free_slot(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def close(self):
+        with self._available:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+def read_urls(file_path):
+    """Read non-empty lines of a URL list file, or None if the file cannot be read"""
     # Fix path formatting
     try:
         file_path = os.path.normpath(file_path)
         with open(file_path, 'r', encoding='utf-8') as f:
-            urls = [line.strip() for line in f if line.strip()]
+            return [line.strip() for line in f if line.strip()]
     except Exception as e:
         print(f"❌ File error: {str(e)}")
-        return pd.DataFrame()
-    
-    results = []
-    selenium_driver = None
+        return None
+
+def normalize_url(url):
+    """Add a missing scheme; returns None for URLs that cannot be scraped"""
+    if not url.startswith(('http://', 'https://')):
+        url = f'https://{url}'
     
-    for i, url in enumerate(urls, 1):
-        if not url.startswith(('http://', 'https://')):
-            url = f'https://{url}'
-        
-        print(f"🌐 Processing ({i}/{len(urls)}): {url}")
-        
-        # Skip problematic URLs
-        if any(domain in url for domain in ['drive.google.com', 'youtube.com']):
-            print("⏩ Skipping unsupported URL")
-            continue
-            
-        # Try static first
-        company_name, content = None, None
-        html = fetch_page_static(url)
-        if html:
+    # Skip problematic URLs
+    if any(domain in url for domain in ['drive.google.com', 'youtube.com']):
+        return None
+    return url
+
+def journal_for(file_path, resume=False):
+    """Journal of processed URLs, kept next to the input file"""
+    file_path = os.path.normpath(file_path)
+    journal_path = os.path.join(os.path.dirname(file_path), '.crawl', os.path.splitext(os.path.basename(file_path))[0] + '.jsonl')
+    return CrawlJournal(journal_path, resume=resume)
+
+def scrape_page(url, selenium_pool, max_retries=3):
+    """Scrape one page, static first with a Selenium fallback. Returns a record dict or None"""
+    # Try static first
+    company_name, content = None, None
+    html = fetch_page_static(url)
+    if html:
+        with timer("parse_seconds", scraper="startups"):
             company_name, content = extract_content_static(html, url)
-        
-        # Fallback to Selenium if static failed
-        if not content:
-            for attempt in range(max_retries):
-                try:
-                    if selenium_driver is None:
-                        selenium_driver = setup_selenium()
-                    company_name, content = extract_content_dynamic(selenium_driver, url)
-                    if content:
-                        break
-                except Exception as e:
-                    print(f"⚠️ Attempt {attempt + 1} failed: {str(e)}")
-                    if selenium_driver:
-                        selenium_driver.quit()
-                        selenium_driver = None
-                    time.sleep(5)
-        
-        if content:
-            results.append({
-                'domain_name': get_domain_name(url),
-                'company_name': company_name,
-                'url': url,
-                'content': content
-            })
-        
-        time.sleep(delay)
     
-    if selenium_driver:
-        selenium_driver.quit()
+    # Fallback to Selenium if static failed
+    if not content:
+        inc("selenium_fallbacks", scraper="startups")
+        for attempt in range(max_retries):
+            driver = None
+            if attempt:
+                inc("retries", scraper="startups")
+            try:
+                driver = selenium_pool.acquire()
+                with timer("selenium_seconds", scraper="startups"):
+                    company_name, content = extract_content_dynamic(driver, url)
+                selenium_pool.release(driver)
+                if content:
+                    break
+            except Exception as e:
+                print(f"⚠️ Attempt {attempt + 1} failed: {str(e)}")
+                if driver:
+                    selenium_pool.discard(driver)
+                time.sleep(5)
     
-    df = pd.DataFrame(results)
-    grouped_df = df.groupby(['domain_name', 'company_name']).agg({
-    'url': list,
-    'content': lambda x: "\n\n".join(x) # Separate the grouped content by 2 newline characters
-    }).reset_index()
+    if not content:
+        inc("pages_failed", scraper="startups")
+        return None
+    return {
+        'domain_name': get_domain_name(url),
+        'company_name': company_name,
+        'url': url,
+        'content': content
+    }
+
+def group_results(journal, urls, output_file=None):
+    """
+    Group the journaled pages per (domain, company) and stream them into `output_file`.
+    Pages are ordered as in the input file, so the output does not depend on completion order.
+    Returns the number of grouped records.
+    """
+    order = {normalize_url(url): i for i, url in reversed(list(enumerate(urls)))}
+    aggregator = DomainAggregator(journal.path)
+    for offset, _, records in journal.entries():
+        for position, record in enumerate(records):
+            aggregator.add(record, offset, position, order.get(record['url'], len(order)))
+    
+    if output_file and aggregator.groups:
+        return aggregator.write(output_file)
+    return len(aggregator.groups)
 
-    return grouped_df
+def process_urls(file_path, output_file=None, delay=2, max_retries=3, resume=False):
+    """
+    Process URLs from file with proper path handling, journaling each URL so runs can be resumed.
+    Pages are grouped per (domain, company) straight from the journal and streamed into `output_file`,
+    so the scraped text is never all held in memory. Returns the number of grouped records; it used to
+    return the grouped DataFrame, which is now read back from `output_file` (e.g. `pd.read_csv(output_file)`).
+    """
+    urls = read_urls(file_path)
+    if urls is None:
+        return 0
+    
+    journal = journal_for(file_path, resume)
+    selenium_pool = SeleniumPool(size=1)
+    try:
+        for i, url in enumerate(urls, 1):
+            url = normalize_url(url)
+            if url is None:
+                print(f"⏩ Skipping unsupported URL ({i}/{len(urls)})")
+                continue
+            
+            if journal.is_done(url):
+                print(f"⏭️ Already processed ({i}/{len(urls)}): {url}")
+                continue
+            
+            print(f"🌐 Processing ({i}/{len(urls)}): {url}")
+            record = scrape_page(url, selenium_pool, max_retries)
+            journal.mark_done(url, [record] if record else [])
+            
+            time.sleep(delay)
+    finally:
+        selenium_pool.close()
+        journal.close()
+    
+    return group_results(journal, urls, output_file)
+
+def process_urls_concurrent(jobs, workers=8, delay=2, max_retries=3, resume=False, selenium_pool_size=2):
+    """
+    Process several URL files as one job with a pool of worker threads.
+    
+    Requests to the same domain are spaced at least `delay` seconds apart, while different
+    domains are fetched in parallel. Pages that need the Selenium fallback share a pool of
+    `selenium_pool_size` browsers.
+    
+    Parameters:
+        jobs (list): (input_file, output_file) pairs; output_file may be None.
+        workers (int): Number of worker threads.
+        delay (float): Minimum seconds between two requests to the same domain.
+        max_retries (int): Selenium attempts per page.
+        resume (bool): Skip URLs processed by a previous run.
+        selenium_pool_size (int): Maximum number of concurrent browsers.
+    
+    Returns:
+        list: Number of grouped records written for each job.
+    """
+    throttle = DomainThrottle(delay)
+    selenium_pool = SeleniumPool(size=selenium_pool_size)
+    
+    plans = []
+    tasks = []
+    for file_path, output_file in jobs:
+        urls = read_urls(file_path) or []
+        journal = journal_for(file_path, resume)
+        plans.append((journal, urls, output_file))
+        for url in urls:
+            url = normalize_url(url)
+            if url and not journal.is_done(url):
+                tasks.append((journal, url))
+    
+    print(f"🚀 {len(tasks)} URLs to process with {workers} workers")
+    progress = itertools.count(1)
+    
+    def run(task):
+        journal, url = task
+        throttle.wait(get_domain_name(url))
+        record = scrape_page(url, selenium_pool, max_retries)
+        journal.mark_done(url, [record] if record else [])
+        print(f"🌐 Processed ({next(progress)}/{len(tasks)}): {url}")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(run, tasks):
+                pass
+    finally:
+        selenium_pool.close()
+        for journal, _, _ in plans:
+            journal.close()
+    
+    return [group_results(journal, urls, output_file) for journal, urls, output_file in plans]
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape startup and Dell websites listed in the data folder.")
+    parser.add_argument("--resume", action="store_true", help="Skip URLs processed by a previous run")
+    parser.add_argument("--workers", type=int, default=1, help="Worker threads; above 1 all three files are processed as one concurrent job")
+    parser.add_argument("--delay", type=float, default=2, help="Seconds between requests (per domain in concurrent mode)")
+    parser.add_argument("--selenium-pool", type=int, default=2, help="Maximum browsers shared by the workers for the Selenium fallback")
+    args = parser.parse_args()
+    
     # Get absolute paths
     base_dir = os.path.dirname(os.path.abspath(__file__))
     indian_path = os.path.join(base_dir, 'data', 'indian_startups.txt')
     australian_path = os.path.join(base_dir, 'data', 'australian_startups.txt')
     dell_path = os.path.join(base_dir, 'data', 'dell.txt')
+    indian_output = os.path.join(base_dir, 'data', 'indian_startups.csv')
+    australian_output = os.path.join(base_dir, 'data', 'australian_startups.csv')
     
-    print("🚀 Processing Indian startups...")
-    df_ind = process_urls(indian_path)
-    
-    print("\n🚀 Processing Australian startups...")
-    df_aus = process_urls(australian_path)
+    with metrics_run("data_extraction"):
+        # Results are streamed into their CSV files as they are grouped
+        if args.workers > 1:
+            print("🚀 Processing Indian startups, Australian startups and Dell concurrently...")
+            n_ind, n_aus, n_dell = process_urls_concurrent(
+                [(indian_path, indian_output), (australian_path, australian_output), (dell_path, None)],
+                workers=args.workers, delay=args.delay, resume=args.resume, selenium_pool_size=args.selenium_pool
+            )
+        else:
+            print("🚀 Processing Indian startups...")
+            n_ind = process_urls(indian_path, indian_output, delay=args.delay, resume=args.resume)
+        
+            print("\n🚀 Processing Australian startups...")
+            n_aus = process_urls(australian_path, australian_output, delay=args.delay, resume=args.resume)
 
-    print("🚀 Processing Dell...")
-    df_dell = process_urls(dell_path)
+            print("🚀 Processing Dell...")
+            n_dell = process_urls(dell_path, delay=args.delay, resume=args.resume)
     
-    # Save results separately
-    if not df_ind.empty:
-        indian_output = os.path.join(base_dir, 'data', 'indian_startups.csv')
-        df_ind.to_csv(indian_output, index=False)
-        print(f"\n✅ Saved {len(df_ind)} Indian records to {indian_output}")
+    if n_ind:
+        print(f"\n✅ Saved {n_ind} Indian records to {indian_output}")
     
-    if not df_aus.empty:
-        australian_output = os.path.join(base_dir, 'data', 'australian_startups.csv')
-        df_aus.to_csv(australian_output, index=False)
-        print(f"✅ Saved {len(df_aus)} Australian records to {australian_output}")
+    if n_aus:
+        print(f"✅ Saved {n_aus} Australian records to {australian_output}")
     
-    if df_ind.empty and df_aus.empty:
+    if not n_ind and not n_aus:
         print("❌ No data collected from either file")
\ No newline at end of file
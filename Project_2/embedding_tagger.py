@@ -0,0 +1,156 @@
+import numpy as np
+
+from landscape_mining import LABEL_SETS, model_name, classifier_settings
+
+# Short descriptions embedded in place of the bare label names, which are often too terse to embed well
+LABEL_DESCRIPTIONS = {
+    "Healthcare": "healthcare, hospitals, patients, clinical care and medical diagnosis",
+    "Finance": "finance, banking, insurance, payments, lending and investment",
+    "Retail": "retail, e-commerce, shopping, consumer brands and stores",
+    "Manufacturing": "manufacturing, factories, industrial production and quality control",
+    "Transportation": "transportation, logistics, mobility, fleets and vehicles",
+    "Education": "education, schools, students, teaching and online learning",
+    "Legal": "legal services, law firms, contracts, compliance and regulation",
+    "Agriculture": "agriculture, farming, crops, agritech and food production",
+    "Media & Entertainment": "media, entertainment, video, music, gaming and publishing",
+    "Energy": "energy, utilities, power, oil and gas, renewables and sustainability",
+    "Real Estate": "real estate, property, construction and buildings",
+    "HR & Recruitment": "human resources, recruitment, hiring, talent and employees",
+    "Cybersecurity": "cybersecurity, threat detection, fraud prevention and data protection",
+    "Natural Language Processing": "natural language processing, text understanding and language models",
+    "Computer Vision": "computer vision, image recognition, video analytics and object detection",
+    "Generative AI": "generative AI, large language models, LLMs, GPT, text and image generation",
+    "Machine Learning": "machine learning models, training data and AI algorithms",
+    "Reinforcement Learning": "reinforcement learning, agents, rewards and simulation",
+    "Speech Recognition": "speech recognition, voice assistants, audio and speech to text",
+    "Predictive Analytics": "predictive analytics, forecasting, business intelligence and data analytics",
+    "Robotics": "robotics, robots, drones and autonomous machines",
+    "Edge AI": "edge AI, IoT devices, on-device inference and embedded hardware",
+    "Synthetic Data": "synthetic data generation, data augmentation and simulated datasets",
+    "Federated Learning": "federated learning, privacy-preserving and decentralized model training",
+    "Chatbots": "chatbots, conversational AI, virtual assistants and customer support bots",
+    "Fraud Detection": "fraud detection, anomaly detection, risk scoring and anti money laundering",
+    "Recommendation Systems": "recommendation systems, personalization and product recommendations",
+    "Medical Imaging": "medical imaging, radiology, scans and x-ray analysis",
+    "Process Automation": "process automation, workflow automation, RPA and document processing",
+    "Predictive Maintenance": "predictive maintenance, equipment monitoring and failure prediction",
+    "Content Creation": "content creation, copywriting, marketing content, images and video generation",
+    "Sentiment Analysis": "sentiment analysis, opinion mining, reviews and social listening",
+    "Supply Chain Optimization": "supply chain optimization, inventory, procurement and demand planning",
+    "Personalized Learning": "personalized learning, adaptive tutoring and learning paths",
+    "B2B": "business to business, selling to enterprises and companies",
+    "B2C": "business to consumer, apps and services for individual consumers",
+    "B2G": "business to government, public sector and government agencies",
+    "SaaS": "software as a service, cloud subscription platform",
+    "API-as-a-Service": "API as a service, developer APIs, SDKs and model endpoints",
+    "Consulting": "consulting, advisory, implementation services and custom solutions",
+    "Product and Services": "products and services, solutions offered to customers",
+}
+
+
+def classify_with_nli(classifier, premises, label_sets):
+    """Classifies premises with a BatchedZeroShot engine or a plain zero-shot pipeline"""
+    if hasattr(classifier, 'classify_families'):
+        return classifier.classify_families(premises, label_sets)
+
+    results = []
+    for premise in premises:
+        result = {}
+        for family, labels in label_sets.items():
+            output = classifier(premise, candidate_labels=labels)
+            result[family] = [output['labels'][:3], dict(zip(output['labels'], output['scores']))]
+        results.append(result)
+    return results
+
+
+class EmbeddingTagger:
+    """
+    Fast tagging by embedding similarity, usable wherever LandscapeMiner expects a zero-shot classifier.
+
+    Label descriptions are embedded once; each premise (a document or its joined KeyBERT
+    keywords) is embedded once and scored against every label of every family with one
+    matrix product. Scores are a softmax over the cosine similarities of a family's labels.
+
+    In hybrid mode, families where the top two labels are closer than `margin` are
+    re-classified by the NLI classifier, so only uncertain cases pay for the slow model.
+
+    Args:
+        model: Sentence embedding model with an `encode(texts)` method (e.g. SentenceTransformer)
+        label_descriptions: Dict of label -> text to embed for it (defaults to LABEL_DESCRIPTIONS)
+        nli_classifier: Optional zero-shot pipeline or BatchedZeroShot for the hybrid mode
+        margin: Top-1 minus top-2 score below which a result counts as uncertain
+        temperature: Softmax temperature applied to cosine similarities
+    """
+
+    def __init__(self, model, label_descriptions=None, nli_classifier=None, margin=0.05, temperature=0.05):
+        self.model = model
+        self.label_descriptions = LABEL_DESCRIPTIONS if label_descriptions is None else label_descriptions
+        self.nli_classifier = nli_classifier
+        self.margin = margin
+        self.temperature = temperature
+        self.escalated = 0
+        self._label_cache = {}
+
+    def cache_settings(self):
+        """Settings that change the results, for LandscapeMiner's cache key"""
+        return {"class": type(self).__name__, "model": model_name(self.model),
+                "label_descriptions": self.label_descriptions, "margin": self.margin,
+                "temperature": self.temperature, "nli_classifier": classifier_settings(self.nli_classifier)}
+
+    def embed(self, texts):
+        """Unit-normalised embeddings of a list of texts"""
+        vectors = np.asarray(self.model.encode(list(texts)), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def label_embeddings(self, labels):
+        """Embeddings of a label list, computed once per label"""
+        missing = [label for label in labels if label not in self._label_cache]
+        if missing:
+            vectors = self.embed([self.label_descriptions.get(label, label) for label in missing])
+            self._label_cache.update(zip(missing, vectors))
+        return np.stack([self._label_cache[label] for label in labels])
+
+    def classify_families(self, premises, label_sets=LABEL_SETS):
+        """
+        Tags premises against several label families.
+
+        Args:
+            premises: List of premise strings
+            label_sets: Dict of label family -> candidate labels
+
+        Returns:
+            List of {family: [top 3 labels, label -> score dict]}, one per premise
+        """
+        if not premises:
+            return []
+
+        families = list(label_sets.items())
+        all_labels = [label for _, labels in families for label in labels]
+        similarities = self.embed(premises) @ self.label_embeddings(all_labels).T
+
+        results = [{} for _ in premises]
+        uncertain = {}
+        offset = 0
+        for family, labels in families:
+            logits = similarities[:, offset:offset + len(labels)] / self.temperature
+            offset += len(labels)
+            scores = np.exp(logits - logits.max(axis=1, keepdims=True))
+            scores /= scores.sum(axis=1, keepdims=True)
+
+            for i, row in enumerate(scores):
+                order = np.argsort(-row)
+                results[i][family] = [[labels[j] for j in order[:3]], {labels[j]: float(row[j]) for j in order}]
+                if len(order) > 1 and row[order[0]] - row[order[1]] < self.margin:
+                    uncertain.setdefault(family, []).append(i)
+
+        # Hybrid mode: only uncertain (document, family) cases go to the NLI model
+        if self.nli_classifier is not None:
+            for family, indices in uncertain.items():
+                nli_results = classify_with_nli(self.nli_classifier, [premises[i] for i in indices],
+                                                {family: label_sets[family]})
+                for i, nli_result in zip(indices, nli_results):
+                    results[i][family] = nli_result[family]
+                self.escalated += len(indices)
+
+        return results
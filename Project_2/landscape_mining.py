@@ -0,0 +1,226 @@
+import os
+import json
+import hashlib
+
+# Candidate labels
+industry_labels = [
+    "Healthcare", "Finance", "Retail", "Manufacturing", "Transportation",
+    "Education", "Legal", "Agriculture", "Media & Entertainment", "Energy",
+    "Real Estate", "HR & Recruitment", "Cybersecurity"
+]
+
+tech_labels = [
+    "Natural Language Processing", "Computer Vision", "Generative AI",
+    "Machine Learning", "Reinforcement Learning", "Speech Recognition",
+    "Predictive Analytics", "Robotics", "Edge AI", "Synthetic Data",
+    "Federated Learning"
+]
+
+use_case_labels = [
+    "Chatbots", "Fraud Detection", "Recommendation Systems", "Medical Imaging",
+    "Process Automation", "Predictive Maintenance", "Content Creation",
+    "Sentiment Analysis", "Supply Chain Optimization", "Personalized Learning"
+]
+
+business_model_labels = [
+    "B2B", "B2C", "B2G", "SaaS", "API-as-a-Service", "Consulting",
+    "Product and Services"
+]
+
+# Label family -> candidate labels; results land in "<family>_tag" and "<family>_scores" columns
+LABEL_SETS = {
+    "industry": industry_labels,
+    "tech_stack": tech_labels,
+    "use_case": use_case_labels,
+    "business_model": business_model_labels,
+}
+
+
+def load_models(keyword_model='sentence-transformers/all-mpnet-base-v2', nli_model="facebook/bart-large-mnli"):
+    """Loads the KeyBERT keyword model and the zero-shot classification pipeline"""
+    from keybert import KeyBERT
+    from transformers import pipeline
+
+    kw_model = KeyBERT(model=keyword_model)
+    zero_shot = pipeline("zero-shot-classification", model=nli_model)
+    return kw_model, zero_shot
+
+
+def model_name(model):
+    """Name or path a model was loaded from, or its class name when it does not tell"""
+    name = (getattr(model, 'model_name', None)
+            or getattr(getattr(model, 'config', None), 'name_or_path', None)
+            or getattr(getattr(model, 'model_card_data', None), 'base_model', None))
+    return name or type(model).__name__
+
+
+def classifier_settings(classifier):
+    """
+    Identity and settings of a zero-shot classifier (class, model, thresholds), so cached
+    results of one classifier are never served for another.
+
+    Args:
+        classifier: transformers pipeline, BatchedZeroShot, EmbeddingTagger or None
+
+    Returns:
+        JSON-serialisable dict, or None without a classifier
+    """
+    if classifier is None:
+        return None
+    if hasattr(classifier, 'cache_settings'):
+        return classifier.cache_settings()
+    return {"class": type(classifier).__name__, "model": model_name(getattr(classifier, 'model', classifier))}
+
+
+class LandscapeMiner:
+    """
+    Tags startups with industry, tech stack, use case and business model labels.
+
+    KeyBERT keywords are extracted once per document (in batches, with the document and
+    candidate phrase embeddings computed a single time) and the same keyword premise is
+    classified against every label family. Results are cached by a hash of the document
+    text, so re-running on unchanged startups skips the models entirely.
+    """
+
+    def __init__(self, kw_model, zero_shot, label_sets=LABEL_SETS, top_n=5,
+                 cache_path="data/.landscape_cache.json", batch_size=32):
+        self.kw_model = kw_model
+        self.zero_shot = zero_shot
+        self.label_sets = label_sets
+        self.top_n = top_n
+        self.cache_path = cache_path
+        self.batch_size = batch_size
+        self.cache = self._load_cache()
+
+        # Changing the labels, keyword count or classifier invalidates cached results
+        settings = json.dumps({"labels": label_sets, "top_n": top_n, "classifier": classifier_settings(zero_shot)},
+                              sort_keys=True)
+        self._settings_hash = hashlib.sha1(settings.encode('utf-8')).hexdigest()[:12]
+
+    def _load_cache(self):
+        if self.cache_path and os.path.exists(self.cache_path):
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def content_key(self, text):
+        """Cache key of a document: hash of its text plus the labelling settings"""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest() + ":" + self._settings_hash
+
+    def extract_keywords(self, texts):
+        """
+        Extracts the top KeyBERT keywords of several documents in one pass.
+
+        Args:
+            texts: List of document texts
+
+        Returns:
+            List of keyword lists, one per document
+        """
+        doc_embeddings, word_embeddings = self.kw_model.extract_embeddings(texts)
+        keywords = self.kw_model.extract_keywords(
+            texts, top_n=self.top_n, doc_embeddings=doc_embeddings, word_embeddings=word_embeddings
+        )
+        # KeyBERT returns a flat list for a single document
+        if len(texts) == 1:
+            keywords = [keywords]
+        return [[kw for kw, _ in doc_keywords] for doc_keywords in keywords]
+
+    def classify(self, premise, labels):
+        """Zero-shot classifies a premise; returns the top 3 labels and a label -> score dict"""
+        try:
+            result = self.zero_shot(premise, candidate_labels=labels)
+            return result['labels'][:3], dict(zip(result['labels'], result['scores']))
+        except Exception:
+            return "Unknown", {}
+
+    def classify_families(self, premises):
+        """
+        Classifies keyword premises against every label family. A batched engine
+        (see zero_shot_batch.BatchedZeroShot) handles all premises and families in shared batches;
+        a plain transformers pipeline is called once per premise and family.
+
+        Args:
+            premises: List of premise strings (joined keywords)
+
+        Returns:
+            List of {family: [tags, scores]} dicts, one per premise
+        """
+        if hasattr(self.zero_shot, 'classify_families'):
+            return self.zero_shot.classify_families(premises, self.label_sets)
+        return [{family: list(self.classify(premise, labels)) for family, labels in self.label_sets.items()}
+                for premise in premises]
+
+    def mine(self, texts):
+        """
+        Tags a list of documents, using cached results where possible.
+
+        Args:
+            texts: List of document texts
+
+        Returns:
+            List of {family: [tags, scores]} dicts, one per document
+        """
+        texts = [str(text) for text in texts]
+        keys = [self.content_key(text) for text in texts]
+        pending = list(dict.fromkeys(key for key in keys if key not in self.cache))
+        pending_texts = {key: text for key, text in zip(keys, texts) if key in pending}
+        # Results of failed model calls are returned but not cached, so the next run retries them
+        failed = {}
+
+        if pending:
+            print(f"Landscape mining: {len(pending)} new documents, {len(set(keys)) - len(pending)} cached")
+
+        for start in range(0, len(pending), self.batch_size):
+            batch_keys = pending[start:start + self.batch_size]
+            batch_texts = [pending_texts[key] for key in batch_keys]
+            try:
+                keywords = self.extract_keywords(batch_texts)
+                keywords_failed = False
+            except Exception:
+                keywords = [[] for _ in batch_texts]
+                keywords_failed = True
+
+            # Keywords are computed once and the same premise serves all four label families
+            premises = [". ".join(kws) if kws else text for kws, text in zip(keywords, batch_texts)]
+            for key, kws, result in zip(batch_keys, keywords, self.classify_families(premises)):
+                entry = {"keywords": kws, **result}
+                # A family whose classification failed has no scores ("Unknown", {})
+                if keywords_failed or not all(scores for _, scores in result.values()):
+                    failed[key] = entry
+                else:
+                    self.cache[key] = entry
+            self.save_cache()
+
+        return [self.cache[key] if key in self.cache else failed[key] for key in keys]
+
+    def apply(self, df, column='content'):
+        """
+        Adds "<family>_tag" and "<family>_scores" columns for every label family.
+
+        Args:
+            df: DataFrame of startups
+            column: Text column to mine
+
+        Returns:
+            The DataFrame with the tag and score columns added
+        """
+        results = self.mine(df[column].tolist())
+        for family in self.label_sets:
+            df[f'{family}_tag'] = [result[family][0] for result in results]
+            df[f'{family}_scores'] = [result[family][1] for result in results]
+        return df
+
+
+def apply_landscape_mining(df, miner, column='content'):
+    """Tags startups in `df` with the given LandscapeMiner (see LandscapeMiner.apply)"""
+    return miner.apply(df, column)
@@ -0,0 +1,167 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+class BatchedZeroShot:
+    """
+    Batched NLI zero-shot classifier, a drop-in for the transformers zero-shot pipeline
+    when tagging many documents against several label families.
+
+    Every (premise, hypothesis) pair of every document and label family goes into one pool.
+    Premises and hypotheses are tokenized once each, pairs are sorted by length so batches
+    carry little padding, and the model runs on full batches of `batch_size` pairs.
+    Scores match the pipeline's single-label mode: a softmax over the entailment logits
+    of each family's labels.
+
+    With `cores > 1` the worker processes are started on the first call and reused by every
+    later one, so each loads the model once; `close()` (or a `with` block) shuts them down.
+
+    Args:
+        model_name: NLI model to load
+        batch_size: Premise/hypothesis pairs per forward pass
+        num_threads: Torch intra-op threads per process (None keeps the torch default)
+        cores: Worker processes, each with its own model copy; documents are split between them
+        hypothesis_template: Template turning a label into a hypothesis
+        max_length: Token limit of a premise/hypothesis pair
+    """
+
+    def __init__(self, model_name="facebook/bart-large-mnli", batch_size=64, num_threads=None, cores=1,
+                 hypothesis_template="This example is {}.", max_length=512):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.cores = cores
+        self.hypothesis_template = hypothesis_template
+        self.max_length = max_length
+        self._model = None
+        self._tokenizer = None
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shuts down the worker processes, if any were started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self):
+        """Worker processes of the `cores > 1` mode, started once and kept for later calls"""
+        if self._executor is None:
+            settings = (self.model_name, self.batch_size, self.num_threads, self.hypothesis_template, self.max_length)
+            self._executor = ProcessPoolExecutor(max_workers=self.cores, initializer=_init_worker, initargs=settings)
+        return self._executor
+
+    def cache_settings(self):
+        """Settings that change the results, for LandscapeMiner's cache key"""
+        return {"class": type(self).__name__, "model": self.model_name,
+                "hypothesis_template": self.hypothesis_template, "max_length": self.max_length}
+
+    def _load(self):
+        if self._model is not None:
+            return
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self._model = AutoModelForSequenceClassification.from_pretrained(self.model_name).eval()
+
+        label2id = {label.lower(): i for label, i in self._model.config.label2id.items()}
+        self.entailment_id = next(i for label, i in label2id.items() if label.startswith("entail"))
+
+    def entailment_logits(self, premises, hypotheses):
+        """
+        Scores every premise against every hypothesis.
+
+        Args:
+            premises: List of premise strings
+            hypotheses: List of hypothesis strings
+
+        Returns:
+            Array of shape (len(premises), len(hypotheses)) with entailment logits
+        """
+        import torch
+        self._load()
+        tokenizer = self._tokenizer
+
+        # Tokenize each premise and hypothesis once instead of once per pair
+        premise_ids = tokenizer(premises, add_special_tokens=False)["input_ids"]
+        hypothesis_ids = tokenizer(hypotheses, add_special_tokens=False)["input_ids"]
+        special = tokenizer.num_special_tokens_to_add(pair=True)
+
+        pairs = []
+        for p, p_ids in enumerate(premise_ids):
+            for h, h_ids in enumerate(hypothesis_ids):
+                room = max(self.max_length - special - len(h_ids), 1)
+                pairs.append((p, h, tokenizer.build_inputs_with_special_tokens(p_ids[:room], h_ids)))
+
+        # Group by length so each batch is padded to a similar size
+        pairs.sort(key=lambda pair: len(pair[2]))
+
+        logits = np.zeros((len(premises), len(hypotheses)), dtype=np.float32)
+        with torch.inference_mode():
+            for start in range(0, len(pairs), self.batch_size):
+                batch = pairs[start:start + self.batch_size]
+                encoded = tokenizer.pad({"input_ids": [ids for _, _, ids in batch]}, return_tensors="pt")
+                output = self._model(**encoded).logits[:, self.entailment_id].float().numpy()
+                for (p, h, _), value in zip(batch, output):
+                    logits[p, h] = value
+
+        return logits
+
+    def classify_families(self, premises, label_sets):
+        """
+        Classifies premises against several label families in shared batches.
+
+        Args:
+            premises: List of premise strings
+            label_sets: Dict of label family -> candidate labels
+
+        Returns:
+            List of {family: [top 3 labels, label -> score dict]}, one per premise
+        """
+        if not premises:
+            return []
+        if self.cores > 1 and len(premises) > 1:
+            shards = [shard for shard in (premises[i::self.cores] for i in range(self.cores)) if shard]
+            shard_results = list(self._pool().map(_classify_shard, shards, [label_sets] * len(shards)))
+            # Undo the round-robin split
+            results = [None] * len(premises)
+            for i, shard in enumerate(shard_results):
+                results[i::self.cores] = shard
+            return results
+
+        families = list(label_sets.items())
+        hypotheses = [self.hypothesis_template.format(label) for _, labels in families for label in labels]
+        logits = self.entailment_logits(premises, hypotheses)
+
+        results = [{} for _ in premises]
+        offset = 0
+        for family, labels in families:
+            family_logits = logits[:, offset:offset + len(labels)]
+            offset += len(labels)
+            scores = np.exp(family_logits - family_logits.max(axis=1, keepdims=True))
+            scores /= scores.sum(axis=1, keepdims=True)
+            for result, row in zip(results, scores):
+                order = np.argsort(-row)
+                ranked = [labels[i] for i in order]
+                result[family] = [ranked[:3], {labels[i]: float(row[i]) for i in order}]
+        return results
+
+
+_worker = None
+
+
+def _init_worker(model_name, batch_size, num_threads, hypothesis_template, max_length):
+    global _worker
+    _worker = BatchedZeroShot(model_name, batch_size, num_threads, 1, hypothesis_template, max_length)
+
+
+def _classify_shard(premises, label_sets):
+    return _worker.classify_families(premises, label_sets)